@@ -19,6 +19,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     
     'rest_framework',
+    'rest_framework.authtoken',
     'corsheaders',
     'drf_spectacular',
     'django_filters',
@@ -27,10 +28,13 @@ INSTALLED_APPS = [
     'users',
     'gear_items',
     'gear_lists',
+    'sync',
+    'jobs',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.PerformanceMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -40,6 +44,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Render hot read-only endpoints from .values() rows instead of DRF serializers.
+COMPILED_SERIALIZERS = os.getenv('COMPILED_SERIALIZERS', 'True') == 'True'
+
+NPLUSONE_DETECTION = os.getenv('NPLUSONE_DETECTION', str(DEBUG)) == 'True'
+NPLUSONE_THRESHOLD = int(os.getenv('NPLUSONE_THRESHOLD', '3'))
+if NPLUSONE_DETECTION:
+    MIDDLEWARE.insert(2, 'core.middleware.NPlusOneMiddleware')
+
 ROOT_URLCONF = 'backpack_planner.urls'
 
 TEMPLATES = [
@@ -86,6 +98,24 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+AUTHENTICATION_BACKENDS = [
+    'users.backends.EmailBackend',
+]
+
+PASSWORD_HASHERS = [
+    'users.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# 0 keeps Django's default PBKDF2 cost; stored hashes follow changes on next login.
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', '0'))
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', '2'))
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv('PASSWORD_HASHING_MAX_PENDING', '8'))
+PASSWORD_HASHING_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASHING_QUEUE_TIMEOUT', '5'))
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -96,6 +126,19 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Unreferenced images saved again within this many seconds are kept until
+# the next manage.py collect_images run.
+IMAGE_COLLECT_GRACE = int(os.getenv('IMAGE_COLLECT_GRACE', '300'))
+# Sizes rendered for every uploaded image by the job workers; 'crop' fills
+# the box exactly, otherwise the image is scaled down to fit inside it.
+IMAGE_VARIANTS = {
+    'thumbnail': {'size': (160, 160), 'crop': True},
+    'card': {'size': (480, 480), 'crop': False},
+    'full': {'size': (1600, 1600), 'crop': False},
+}
+IMAGE_VARIANT_QUALITY = int(os.getenv('IMAGE_VARIANT_QUALITY', '80'))
+# Seconds each process caches whether an image's variants could be rendered.
+IMAGE_STATUS_CACHE_TIMEOUT = int(os.getenv('IMAGE_STATUS_CACHE_TIMEOUT', '300'))
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -103,12 +146,26 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'users.authentication.CachedTokenAuthentication',
+        'users.authentication.SignedAccessTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'core.renderers.MessagePackRenderer',
+        'core.renderers.CBORRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'core.parsers.MessagePackParser',
+        'core.parsers.CBORParser',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -120,6 +177,97 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'core.exceptions.custom_exception_handler',
 }
 
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', '300'))
+ACCESS_TOKEN_ENABLED = os.getenv('ACCESS_TOKEN_ENABLED', 'False') == 'True'
+ACCESS_TOKEN_LIFETIME = int(os.getenv('ACCESS_TOKEN_LIFETIME', '300'))
+REFRESH_TOKEN_LIFETIME = int(os.getenv('REFRESH_TOKEN_LIFETIME', str(60 * 60 * 24 * 30)))
+
+PERFORMANCE_INSTRUMENTATION = os.getenv('PERFORMANCE_INSTRUMENTATION', 'True') == 'True'
+# X-Profile is ignored unless REQUEST_PROFILING is set; dumps go to staff only.
+REQUEST_PROFILING = os.getenv('REQUEST_PROFILING', 'False') == 'True'
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+# X-Trace is ignored unless REQUEST_TRACING is set; TRACE_REQUESTS traces all.
+REQUEST_TRACING = os.getenv('REQUEST_TRACING', 'False') == 'True'
+TRACE_DIR = os.getenv('TRACE_DIR', os.path.join(BASE_DIR, 'traces'))
+TRACE_REQUESTS = os.getenv('TRACE_REQUESTS', 'False') == 'True'
+BENCHMARK_DIR = os.getenv('BENCHMARK_DIR', os.path.join(BASE_DIR, 'benchmarks'))
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '1000'))
+
+# Days a deletion stays in the sync change log; clients that last synced
+# before it was pruned get a full snapshot (manage.py compact_sync_changes).
+SYNC_TOMBSTONE_RETENTION = int(os.getenv('SYNC_TOMBSTONE_RETENTION', '90'))
+
+# 'postgres' sends published events with NOTIFY so every worker process
+# receives them; 'local' only delivers them inside one process. Live list
+# events and the invalidation of per-process caches (e.g. the auth token
+# cache) need 'postgres' as soon as more than one process serves requests,
+# so 'local' is only the default on databases without NOTIFY.
+PUBSUB_BACKEND = os.getenv(
+    'PUBSUB_BACKEND',
+    'postgres' if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql' else 'local',
+)
+PUBSUB_RECONNECT_DELAY = float(os.getenv('PUBSUB_RECONNECT_DELAY', '1'))
+SSE_KEEPALIVE = float(os.getenv('SSE_KEEPALIVE', '15'))
+SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', '3000'))
+SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', '100'))
+
+# Expired keys are ignored; run clear_idempotency_keys to delete them.
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', str(60 * 60 * 24)))
+IDEMPOTENCY_PENDING_TIMEOUT = int(os.getenv('IDEMPOTENCY_PENDING_TIMEOUT', '300'))
+
+# Workers (manage.py run_jobs) poll every JOBS_POLL_INTERVAL seconds, or
+# sooner when woken through the pubsub broker. Failed jobs are retried after
+# JOBS_RETRY_DELAY seconds, doubled on every further attempt. A running job
+# gets a heartbeat every JOBS_HEARTBEAT_INTERVAL seconds and is queued again
+# once it has had none for JOBS_STALE_AFTER.
+JOBS_POLL_INTERVAL = float(os.getenv('JOBS_POLL_INTERVAL', '1'))
+JOBS_RETRY_DELAY = float(os.getenv('JOBS_RETRY_DELAY', '10'))
+JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', '3'))
+JOBS_STALE_AFTER = int(os.getenv('JOBS_STALE_AFTER', '300'))
+JOBS_HEARTBEAT_INTERVAL = float(os.getenv('JOBS_HEARTBEAT_INTERVAL', '30'))
+
+# One snapshot file per worker process; clear this directory on deploy.
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(BASE_DIR, 'metrics'))
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '5'))
+# Bearer token for scraping /metrics; without one only staff sessions may read it.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '200'))
+SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'True') == 'True'
+SLOW_QUERY_MAX_PENDING = int(os.getenv('SLOW_QUERY_MAX_PENDING', '20'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.performance': {
+            'handlers': ['console'],
+            'level': os.getenv('PERFORMANCE_LOG_LEVEL', 'INFO'),
+        },
+        'core.slow_queries': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'core.nplusone': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+        'core.pubsub': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'jobs': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:3000',
     'http://127.0.0.1:3000',
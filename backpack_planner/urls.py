@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from core.views import metrics
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -10,6 +11,7 @@ from drf_spectacular.views import (
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics, name="metrics"),
     
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
@@ -27,6 +29,9 @@ urlpatterns = [
     path("api/v1/users/", include("users.urls")),
     path("api/v1/gear-items/", include("gear_items.urls")),
     path("api/v1/gear-lists/", include("gear_lists.urls")),
+    path("api/v1/core/", include("core.urls")),
+    path("api/v1/sync/", include("sync.urls")),
+    path("api/v1/jobs/", include("jobs.urls")),
 ]
 
 if settings.DEBUG:
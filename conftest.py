@@ -0,0 +1,9 @@
+import pytest
+
+pytest_plugins = ["core.pytest_plugin"]
+
+
+@pytest.fixture(autouse=True)
+def local_pubsub(settings):
+    # A test run is one process; tests of the postgres broker opt in.
+    settings.PUBSUB_BACKEND = "local"
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ("view", "action", "calls", "total_time", "max_time", "updated_at")
+    search_fields = ("sql", "view", "action")
+    readonly_fields = ("fingerprint", "sql", "plan", "created_at", "updated_at")
@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+    
+    def ready(self):
+        from . import metrics  # noqa: F401 -- registers the connection counters
+        from .instrumentation import install, register_query_wrapper
+        from .nplusone import track_query
+        from .slow_queries import record_slow_query
+        from .tracing import install as install_tracing
+        from .tracing import trace_query
+        
+        install()
+        install_tracing()
+        register_query_wrapper(record_slow_query)
+        register_query_wrapper(track_query)
+        register_query_wrapper(trace_query)
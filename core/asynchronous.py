@@ -0,0 +1,102 @@
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status_code,
+        content_type="application/json",
+    )
+
+
+def error_response(detail, status_code):
+    return json_response({"detail": detail, "status_code": status_code}, status_code)
+
+
+def async_api_view(methods):
+    """
+    Wrap a coroutine view with the API's authentication and error format.
+
+    The wrapped view receives ``request.user`` already resolved; DRF-style
+    ``APIException`` errors are rendered as they are by the sync API.
+    """
+    from users.authentication import aauthenticate
+
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return error_response(
+                    f'Method "{request.method}" not allowed.',
+                    status.HTTP_405_METHOD_NOT_ALLOWED,
+                )
+
+            try:
+                user = await aauthenticate(request)
+                if user is None:
+                    return error_response(
+                        "Authentication credentials were not provided.",
+                        status.HTTP_401_UNAUTHORIZED,
+                    )
+
+                request.user = user
+                return await view(request, *args, **kwargs)
+            except APIException as exc:
+                if isinstance(exc.detail, dict):
+                    return json_response(
+                        {**exc.detail, "status_code": exc.status_code}, exc.status_code
+                    )
+                return error_response(exc.detail, exc.status_code)
+
+        return wrapper
+
+    return decorator
+
+
+async def apaginate(request, queryset, serializer_class, context):
+    """
+    Async counterpart of ``PageNumberPagination`` producing the same envelope.
+    """
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    count = await queryset.acount()
+
+    try:
+        page_number = int(request.GET.get("page", 1))
+    except ValueError:
+        page_number = 0
+
+    last_page = max(1, -(-count // page_size))
+    if page_number < 1 or page_number > last_page:
+        return error_response("Invalid page.", status.HTTP_404_NOT_FOUND)
+
+    offset = (page_number - 1) * page_size
+    results = [obj async for obj in queryset[offset:offset + page_size]]
+
+    url = request.build_absolute_uri()
+    next_link = None
+    if page_number < last_page:
+        next_link = replace_query_param(url, "page", page_number + 1)
+
+    previous_link = None
+    if page_number == 2:
+        previous_link = remove_query_param(url, "page")
+    elif page_number > 2:
+        previous_link = replace_query_param(url, "page", page_number - 1)
+
+    return json_response(
+        {
+            "count": count,
+            "next": next_link,
+            "previous": previous_link,
+            "results": serializer_class(results, many=True, context=context).data,
+        }
+    )
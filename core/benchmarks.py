@@ -0,0 +1,299 @@
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import nullcontext
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from gear_items.models import Category, Item
+from gear_lists.models import GearList
+
+from .datagen import BENCHMARK_USER_PREFIX
+
+
+class Endpoint:
+    """
+    One hot endpoint to measure.
+
+    ``path`` and ``data`` are callables taking the :class:`BenchmarkFixtures`.
+    Writes run inside a transaction that is rolled back after every call, so
+    each iteration sees the same data.
+    """
+
+    def __init__(self, name, method, path, data=None, write=False):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.write = write
+
+
+class BenchmarkFixtures:
+    """
+    Objects from the generated dataset that the endpoints operate on: the
+    first benchmark user, their largest list and one public list of another
+    benchmark user.
+    """
+
+    def __init__(self):
+        User = get_user_model()
+        self.user = (
+            User.objects.filter(username__startswith=BENCHMARK_USER_PREFIX).order_by("id").first()
+        )
+        if self.user is None:
+            raise LookupError("No benchmark data found, run generate_benchmark_data first.")
+
+        self.gear_list = (
+            GearList.objects.filter(owner=self.user)
+            .annotate(size=Count("list_items"))
+            .order_by("-size", "id")
+            .first()
+        )
+        self.public_list = (
+            GearList.objects.filter(
+                is_public=True, owner__username__startswith=BENCHMARK_USER_PREFIX
+            )
+            .exclude(owner=self.user)
+            .order_by("id")
+            .first()
+        ) or self.gear_list
+        self.category = Category.objects.filter(owner=self.user).order_by("id").first()
+        self.item = Item.objects.filter(owner=self.user).order_by("id").first()
+        self.list_items = list(
+            self.gear_list.list_items.order_by("order").values_list("id", flat=True)
+        )
+        self.spare_item = (
+            Item.objects.filter(owner=self.user)
+            .exclude(in_lists__gear_list=self.gear_list)
+            .order_by("id")
+            .first()
+        )
+
+
+ENDPOINTS = [
+    Endpoint("items.list", "get", lambda f: reverse("gear_items:item-list")),
+    Endpoint(
+        "items.list_filtered",
+        "get",
+        lambda f: reverse("gear_items:item-list"),
+        lambda f: {"category": f.category.id, "ordering": "-weight"},
+    ),
+    Endpoint(
+        "items.list_sparse",
+        "get",
+        lambda f: reverse("gear_items:item-list"),
+        lambda f: {"fields": "id,name,weight,weight_unit"},
+    ),
+    Endpoint(
+        "items.search",
+        "get",
+        lambda f: reverse("gear_items:item-search"),
+        lambda f: {"q": "tent"},
+    ),
+    Endpoint("items.no_category", "get", lambda f: reverse("gear_items:item-no-category")),
+    Endpoint(
+        "items.retrieve",
+        "get",
+        lambda f: reverse("gear_items:item-detail", args=[f.item.id]),
+    ),
+    Endpoint(
+        "items.duplicate",
+        "post",
+        lambda f: reverse("gear_items:item-duplicate", args=[f.item.id]),
+        write=True,
+    ),
+    Endpoint("categories.list", "get", lambda f: reverse("gear_items:category-list")),
+    Endpoint(
+        "categories.items",
+        "get",
+        lambda f: reverse("gear_items:category-items", args=[f.category.id]),
+    ),
+    Endpoint("lists.list", "get", lambda f: reverse("gear_lists:gear_list-list")),
+    Endpoint(
+        "lists.retrieve",
+        "get",
+        lambda f: reverse("gear_lists:gear_list-detail", args=[f.gear_list.id]),
+    ),
+    Endpoint(
+        "lists.retrieve_normalized",
+        "get",
+        lambda f: reverse("gear_lists:gear_list-detail", args=[f.gear_list.id]),
+        lambda f: {"normalized": "true"},
+    ),
+    Endpoint(
+        "lists.items",
+        "get",
+        lambda f: reverse("gear_lists:gear_list-items", args=[f.gear_list.id]),
+    ),
+    Endpoint(
+        "lists.shared",
+        "post",
+        lambda f: reverse("gear_lists:gear_list-shared"),
+        lambda f: {"share_code": str(f.public_list.share_code)},
+    ),
+    Endpoint(
+        "lists.add_item",
+        "post",
+        lambda f: reverse("gear_lists:gear_list-items", args=[f.gear_list.id]),
+        lambda f: {"item": f.spare_item.id, "quantity": 1},
+        write=True,
+    ),
+    Endpoint(
+        "lists.copy",
+        "post",
+        lambda f: reverse("gear_lists:gear_list-copy", args=[f.gear_list.id]),
+        lambda f: {"name": "Benchmark copy"},
+        write=True,
+    ),
+    Endpoint("sync.snapshot", "get", lambda f: reverse("sync:sync")),
+    Endpoint("sync.bootstrap", "get", lambda f: reverse("sync:bootstrap")),
+    Endpoint(
+        "list_items.reorder",
+        "post",
+        lambda f: reverse("gear_lists:list_item-reorder"),
+        lambda f: {"items_order": f.list_items[::-1]},
+        write=True,
+    ),
+    Endpoint(
+        "list_items.toggle_packed",
+        "post",
+        lambda f: reverse("gear_lists:list_item-toggle-packed", args=[f.list_items[0]]),
+        write=True,
+    ),
+]
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _request(client, endpoint, fixtures):
+    data = endpoint.data(fixtures) if endpoint.data else None
+    if endpoint.method == "get":
+        return client.get(endpoint.path(fixtures), data)
+    return getattr(client, endpoint.method)(endpoint.path(fixtures), data, format="json")
+
+
+def measure(client, endpoint, fixtures, iterations, warmup):
+    latencies = []
+    queries = []
+    statuses = set()
+    size = 0
+
+    for run in range(warmup + iterations):
+        with transaction.atomic() if endpoint.write else nullcontext():
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = _request(client, endpoint, fixtures)
+                elapsed = time.perf_counter() - start
+            if endpoint.write:
+                transaction.set_rollback(True)
+
+        if run < warmup:
+            continue
+        latencies.append(elapsed * 1000)
+        queries.append(len(captured))
+        statuses.add(response.status_code)
+        size = len(response.content)
+
+    return {
+        "method": endpoint.method.upper(),
+        "iterations": iterations,
+        "latency_ms": {
+            "min": round(min(latencies), 3),
+            "mean": round(statistics.fmean(latencies), 3),
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "max": round(max(latencies), 3),
+        },
+        "queries": max(queries),
+        "status": sorted(statuses),
+        "response_bytes": size,
+    }
+
+
+def run_benchmarks(iterations=20, warmup=2, only=None, log=None):
+    """
+    Measure every endpoint in :data:`ENDPOINTS` against the generated dataset.
+
+    Requests go through the full middleware stack as the first benchmark
+    user, authenticated with a DRF token. Returns a JSON-serialisable dict.
+    """
+    log = log or (lambda message: None)
+    fixtures = BenchmarkFixtures()
+    token, _ = Token.objects.get_or_create(user=fixtures.user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    results = {}
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for endpoint in ENDPOINTS:
+            if only and not any(endpoint.name.startswith(prefix) for prefix in only):
+                continue
+            results[endpoint.name] = measure(client, endpoint, fixtures, iterations, warmup)
+            latency = results[endpoint.name]["latency_ms"]
+            log(
+                f"{endpoint.name:<28} p50 {latency['p50']:>9.2f} ms  "
+                f"p95 {latency['p95']:>9.2f} ms  {results[endpoint.name]['queries']:>4} queries"
+            )
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "iterations": iterations,
+            "warmup": warmup,
+            "dataset": {
+                "user": fixtures.user.username,
+                "items": Item.objects.filter(owner=fixtures.user).count(),
+                "list_items": len(fixtures.list_items),
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current):
+    """
+    Per-endpoint p50/p95 and query-count deltas between two result files.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        row = {"endpoint": name, "queries": result["queries"] - before["queries"]}
+        for key in ("p50", "p95"):
+            old = before["latency_ms"][key]
+            new = result["latency_ms"][key]
+            row[key] = round((new - old) / old * 100, 1) if old else None
+        rows.append(row)
+    return rows
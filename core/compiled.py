@@ -0,0 +1,191 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+
+from .instrumentation import time_serialization
+from .sparse import SparseFieldsViewMixin, declared_fields, join_path
+from .tracing import span
+
+
+class CompiledSerializer:
+    """
+    Read-only renderer producing the same output as ``serializer_class``
+    from ``.values()`` rows instead of model instances.
+
+    The field plan is derived from the serializer's own fields: plain model
+    fields map to one column and reuse the DRF field's ``to_representation``,
+    primary key relations are copied as-is, file fields are turned into
+    absolute URLs. Everything else (method fields, dotted sources, custom
+    ``to_representation`` logic) has to be supplied by ``computed_fields``,
+    and nested serializers by ``nested_fields``. ``prefix`` is the lookup
+    path from the queried model, e.g. ``"item__"`` for a nested item, and
+    ``path`` the dotted field path used by ``?fields=``, e.g.
+    ``"item_details"``. Fields left out by the request's field selection are
+    not compiled, so their columns and joins are never queried.
+    """
+
+    serializer_class = None
+
+    def __init__(self, context=None, prefix="", path=""):
+        self.context = context or {}
+        self.prefix = prefix
+        self.path = path
+        self.request = self.context.get("request")
+        self.selection = self.context.get("field_selection")
+        self.columns = []
+        self.plan = self._compile()
+
+    def computed_fields(self):
+        """
+        Return ``{field_name: (columns, render)}``, ``render`` taking a row.
+        """
+        return {}
+
+    def nested_fields(self):
+        """
+        Return ``{field_name: CompiledSerializer}`` for nested serializers.
+        """
+        return {}
+
+    def child_path(self, name):
+        return join_path(self.path, name)
+
+    def includes(self, name, nested=False):
+        return self.selection is None or self.selection.includes(self.path, name, nested)
+
+    def _compile(self):
+        computed = self.computed_fields()
+        nested = self.nested_fields()
+        plan = []
+
+        for name, field in declared_fields(self.serializer_class).items():
+            if field.write_only or not self.includes(name, name in nested):
+                continue
+
+            if name in computed:
+                columns, render = computed[name]
+                self._add_columns(columns)
+                plan.append((name, None, render))
+            elif name in nested:
+                compiled = nested[name]
+                self._add_columns(compiled.columns)
+                plan.append((name, None, compiled.render_nested))
+            elif (
+                isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField))
+                or "." in field.source
+            ):
+                raise ImproperlyConfigured(
+                    f"{type(self).__name__} has no compiled plan for "
+                    f"{self.serializer_class.__name__}.{name}."
+                )
+            else:
+                column = self.prefix + field.source
+                self._add_columns([column])
+                if isinstance(field, relations.PrimaryKeyRelatedField):
+                    plan.append((name, column, None))
+                elif isinstance(field, serializers.FileField):
+                    model_field = self.serializer_class.Meta.model._meta.get_field(field.source)
+                    plan.append((name, column, self._file_url(model_field.storage)))
+                else:
+                    plan.append((name, column, field.to_representation))
+
+        if self.prefix:
+            # ``render_nested`` tells a missing relation by its primary key.
+            self._add_columns([self.prefix + "id"])
+        return plan
+
+    def _add_columns(self, columns):
+        for column in columns:
+            if column not in self.columns:
+                self.columns.append(column)
+
+    def _file_url(self, storage):
+        # Mirrors ``serializers.FileField.to_representation`` for a stored name.
+        request = self.request
+
+        def convert(name):
+            if not name:
+                return None
+            url = storage.url(name)
+            if request is not None:
+                return request.build_absolute_uri(url)
+            return url
+
+        return convert
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def render(self, row):
+        data = {}
+        for name, column, convert in self.plan:
+            if column is None:
+                data[name] = convert(row)
+                continue
+            value = row[column]
+            data[name] = value if value is None or convert is None else convert(value)
+        return data
+
+    def render_nested(self, row):
+        if row[self.prefix + "id"] is None:
+            return None
+        return self.render(row)
+
+    def render_many(self, rows):
+        render = self.render
+        with time_serialization(), span(f"{type(self).__name__}[]", "serializer"):
+            return [render(row) for row in rows]
+
+    def instance_row(self, instance, **extra):
+        """
+        Build a row from a model instance for single-object rendering.
+        """
+        row = dict(extra)
+        opts = instance._meta
+        for column in self.columns:
+            if column not in row:
+                row[column] = getattr(instance, opts.get_field(column).attname)
+        return row
+
+
+class CompiledListMixin(SparseFieldsViewMixin):
+    """
+    Serve ``list`` (and other read-only collection actions) through a
+    ``CompiledSerializer`` when ``COMPILED_SERIALIZERS`` is enabled. Field
+    selection is inherited from ``SparseFieldsViewMixin``.
+    """
+
+    compiled_serializer_class = None
+
+    def get_compiled_serializer(self, compiled_class=None):
+        compiled_class = compiled_class or self.compiled_serializer_class
+        if not settings.COMPILED_SERIALIZERS or compiled_class is None:
+            return None
+        return compiled_class(context=self.get_serializer_context())
+
+    def list(self, request, *args, **kwargs):
+        return self.compiled_list_response(self.filter_queryset(self.get_queryset()))
+
+    def compiled_list_response(self, queryset, paginate=True, compiled_class=None):
+        compiled = self.get_compiled_serializer(compiled_class)
+        if compiled is not None:
+            queryset = compiled.values(queryset)
+        else:
+            compiled_class = compiled_class or self.compiled_serializer_class
+            serializer_class = (
+                compiled_class.serializer_class if compiled_class else self.get_serializer_class()
+            )
+            queryset = self.sparse_queryset(queryset, serializer_class)
+
+        page = self.paginate_queryset(queryset) if paginate else None
+        data = page if page is not None else queryset
+
+        if compiled is not None:
+            data = compiled.render_many(data)
+        else:
+            data = serializer_class(data, many=True, context=self.get_serializer_context()).data
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
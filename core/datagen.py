@@ -0,0 +1,171 @@
+import random
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from gear_items.models import Category, Item
+from gear_lists.models import GearList, ListItem
+
+BENCHMARK_USER_PREFIX = "bench_user_"
+BENCHMARK_PASSWORD = "benchmark-password"
+
+CATEGORY_NAMES = [
+    "Shelter", "Sleep System", "Pack", "Kitchen", "Water", "Clothing", "Worn Clothing",
+    "Electronics", "First Aid", "Navigation", "Hygiene", "Food", "Tools", "Repair",
+    "Photography", "Climbing", "Snow", "Rain Gear", "Lighting", "Miscellaneous",
+]
+CATEGORY_COLORS = ["#3498db", "#e74c3c", "#2ecc71", "#f1c40f", "#9b59b6", "#1abc9c", "#e67e22"]
+ITEM_BRANDS = [
+    "Zpacks", "Big Agnes", "Nemo", "Sea to Summit", "Therm-a-Rest", "Enlightened Equipment",
+    "Gossamer Gear", "Hyperlite", "Black Diamond", "Petzl", "MSR", "Jetboil", "Sawyer",
+    "Patagonia", "Arc'teryx", "Outdoor Research", "Darn Tough", "Salomon", "Garmin", "Anker",
+]
+ITEM_KINDS = [
+    "Tent", "Tarp", "Quilt", "Sleeping Bag", "Sleeping Pad", "Pillow", "Backpack", "Stove",
+    "Pot", "Spork", "Water Filter", "Bottle", "Rain Jacket", "Wind Shirt", "Fleece",
+    "Puffy", "Base Layer", "Socks", "Headlamp", "Power Bank", "Cable", "Knife", "Map",
+    "Compass", "First Aid Kit", "Sunscreen", "Toothbrush", "Trowel", "Trekking Poles",
+    "Stakes", "Fuel Canister", "Bear Canister", "Dinner", "Snacks", "Gloves", "Beanie",
+]
+LIST_NAMES = [
+    "PCT Section", "JMT Thru-hike", "Weekend Overnighter", "Winter Camp", "Desert Loop",
+    "Alpine Traverse", "Fastpacking", "Family Trip", "Bikepacking", "Packrafting",
+]
+
+
+class DatasetGenerator:
+    """
+    Bulk-create a synthetic but realistic dataset for benchmarks.
+
+    Every generated user is named ``bench_user_<n>`` and owns categories,
+    items and lists; a share of the lists is public. Rows are inserted with
+    ``bulk_create`` in batches and list totals are computed in Python, so
+    ``ListItem.save`` and ``calculate_total_weight`` never run. The same
+    ``seed`` always produces the same dataset.
+    """
+
+    def __init__(self, users=2, items_per_user=10000, categories_per_user=12,
+                 lists_per_user=10, min_list_items=50, max_list_items=1000,
+                 public_ratio=0.3, seed=0, batch_size=2000, log=None):
+        self.users = users
+        self.items_per_user = items_per_user
+        self.categories_per_user = min(categories_per_user, len(CATEGORY_NAMES))
+        self.lists_per_user = lists_per_user
+        self.min_list_items = min_list_items
+        self.max_list_items = max_list_items
+        self.public_ratio = public_ratio
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.log = log or (lambda message: None)
+
+    def generate(self):
+        User = get_user_model()
+        start = User.objects.filter(username__startswith=BENCHMARK_USER_PREFIX).count()
+        password = make_password(BENCHMARK_PASSWORD)
+        totals = {"users": 0, "categories": 0, "items": 0, "lists": 0, "list_items": 0}
+
+        for index in range(start, start + self.users):
+            with transaction.atomic():
+                counts = self._generate_user(User, index, password)
+            for key, value in counts.items():
+                totals[key] += value
+            self.log(
+                f"Created {BENCHMARK_USER_PREFIX}{index}: {counts['items']} items, "
+                f"{counts['lists']} lists, {counts['list_items']} list items"
+            )
+        return totals
+
+    def _generate_user(self, User, index, password):
+        username = f"{BENCHMARK_USER_PREFIX}{index}"
+        (user,) = User.objects.bulk_create(
+            [
+                User(
+                    username=username,
+                    email=f"{username}@example.com",
+                    password=password,
+                    weight_unit=self.random.choice(["g", "g", "g", "oz"]),
+                )
+            ]
+        )
+
+        categories = Category.objects.bulk_create(
+            [
+                Category(
+                    name=name,
+                    color=self.random.choice(CATEGORY_COLORS),
+                    owner=user,
+                )
+                for name in self.random.sample(CATEGORY_NAMES, self.categories_per_user)
+            ]
+        )
+
+        items = Item.objects.bulk_create(
+            (self._item(user, categories, number) for number in range(self.items_per_user)),
+            batch_size=self.batch_size,
+        )
+
+        gear_lists = []
+        entries = []
+        for number in range(self.lists_per_user):
+            size = self.random.randint(self.min_list_items, self.max_list_items)
+            weight_unit = user.weight_unit
+            selection = []
+            total = 0
+            for item in self.random.sample(items, min(size, len(items))):
+                quantity = 1 if self.random.random() < 0.85 else self.random.randint(2, 4)
+                total += item.get_normalized_weight(weight_unit) * quantity
+                selection.append((item, quantity))
+
+            gear_lists.append(
+                GearList(
+                    name=f"{self.random.choice(LIST_NAMES)} {number + 1}",
+                    owner=user,
+                    is_public=self.random.random() < self.public_ratio,
+                    weight_unit=weight_unit,
+                    total_weight=Decimal(total).quantize(Decimal("0.01")),
+                )
+            )
+            entries.append(selection)
+        gear_lists = GearList.objects.bulk_create(gear_lists, batch_size=self.batch_size)
+
+        list_items = [
+            ListItem(
+                gear_list=gear_list,
+                item=item,
+                quantity=quantity,
+                is_worn=self.random.random() < 0.1,
+                is_packed=self.random.random() < 0.5,
+                order=order,
+            )
+            for gear_list, selection in zip(gear_lists, entries)
+            for order, (item, quantity) in enumerate(selection)
+        ]
+        ListItem.objects.bulk_create(list_items, batch_size=self.batch_size)
+
+        return {
+            "users": 1,
+            "categories": len(categories),
+            "items": len(items),
+            "lists": len(gear_lists),
+            "list_items": len(list_items),
+        }
+
+    def _item(self, user, categories, number):
+        kind = self.random.choice(ITEM_KINDS)
+        return Item(
+            name=f"{self.random.choice(ITEM_BRANDS)} {kind} {number}",
+            description=f"{kind} used on {self.random.choice(LIST_NAMES).lower()} trips.",
+            weight=Decimal(self.random.randint(5, 250000)) / 100,
+            weight_unit="oz" if self.random.random() < 0.2 else "g",
+            category=self.random.choice(categories) if self.random.random() < 0.9 else None,
+            owner=user,
+            is_consumable=kind in ("Dinner", "Snacks", "Fuel Canister", "Sunscreen"),
+            price=Decimal(self.random.randint(500, 60000)) / 100,
+        )
+
+
+def delete_dataset():
+    User = get_user_model()
+    return User.objects.filter(username__startswith=BENCHMARK_USER_PREFIX).delete()
@@ -51,4 +51,22 @@ class ResourceConflictError(APIException):
 class InvalidOperationError(APIException):
     status_code = status.HTTP_400_BAD_REQUEST
     default_detail = "This operation cannot be performed in the current state."
-    default_code = "invalid_operation"
\ No newline at end of file
+    default_code = "invalid_operation"
+
+
+class ServiceBusyError(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The service is busy. Please retry shortly."
+    default_code = "service_busy"
+
+
+class PreconditionFailedError(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The resource was modified since it was fetched. Reload it and retry."
+    default_code = "precondition_failed"
+
+
+class IdempotencyKeyReusedError(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This idempotency key was already used for a different request."
+    default_code = "idempotency_key_reused"
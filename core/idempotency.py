@@ -0,0 +1,113 @@
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .exceptions import IdempotencyKeyReusedError, ResourceConflictError
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+# Response headers stored with the body and sent again on replay.
+STORED_HEADERS = ("Location", "ETag")
+
+
+def request_fingerprint(request):
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def expired_keys():
+    cutoff = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    return IdempotencyKey.objects.filter(created_at__lt=cutoff)
+
+
+def _claim(user, key, fingerprint):
+    """
+    Return ``(record, None)`` when this request should run, after storing a
+    pending record for the key, or ``(None, response)`` to replay.
+    """
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(
+                    user=user, key=key, fingerprint=fingerprint
+                ), None
+        except IntegrityError:
+            pass
+
+        record = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if record is None:
+            continue
+        age = (timezone.now() - record.created_at).total_seconds()
+        # An expired record, or a pending one whose request died, frees the key.
+        if age > settings.IDEMPOTENCY_KEY_TTL or (
+            record.status_code is None and age > settings.IDEMPOTENCY_PENDING_TIMEOUT
+        ):
+            IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at).delete()
+            continue
+        if record.fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError()
+        if record.status_code is None:
+            raise ResourceConflictError(
+                _("A request with this idempotency key is still being processed.")
+            )
+        response = Response(record.response, status=record.status_code, headers=record.headers)
+        response[REPLAYED_HEADER] = "true"
+        return None, response
+
+    raise ResourceConflictError(
+        _("A request with this idempotency key is still being processed.")
+    )
+
+
+def idempotent(view_method):
+    """
+    Make a POST viewset method safe to retry with an ``Idempotency-Key``.
+
+    The first request with a key runs and its response is stored for
+    ``IDEMPOTENCY_KEY_TTL`` seconds; retries with the same key and body get
+    that response, with its ``STORED_HEADERS``, back instead of repeating the
+    work. A key reused for a
+    different request is refused with 422, and a retry arriving while the
+    first request still runs with 409. Server errors and requests that raise
+    are not stored, so those can be retried.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key or request.method != "POST" or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field("key").max_length:
+            raise ValidationError({IDEMPOTENCY_HEADER: [_("The key is too long.")]})
+
+        record, replay = _claim(request.user, key, request_fingerprint(request))
+        if replay is not None:
+            return replay
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+
+        if response.status_code >= 500:
+            record.delete()
+        else:
+            record.status_code = response.status_code
+            record.response = response.data
+            record.headers = {
+                header: response[header] for header in STORED_HEADERS if header in response
+            }
+            record.save(update_fields=["status_code", "response", "headers"])
+        return response
+
+    return wrapper
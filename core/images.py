@@ -0,0 +1,366 @@
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from io import BytesIO
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.fields.files import ImageFieldFile
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils.deconstruct import deconstructible
+from PIL import Image, ImageOps
+
+from jobs.registry import enqueue
+from .models import ImageBlob
+
+logger = logging.getLogger("core.images")
+
+BLOB_DIR = "images"
+VARIANT_DIR = "variants"
+VARIANT_FORMAT = "WEBP"
+STATUS_CACHE_PREFIX = "images:rendered:"
+
+# (model, attname) of every field whose files are counted in ImageBlob.
+image_fields = []
+
+
+def blob_name(digest, extension=""):
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def variant_name(name, variant):
+    return f"{VARIANT_DIR}/{variant}/{os.path.splitext(name)[0]}.webp"
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after the SHA-256 of its
+    content, so identical uploads share one file whatever they were called.
+    Saving content that is already stored writes nothing and returns the
+    name of the existing file.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        extension = os.path.splitext(name)[1].lower()
+
+        # Hash while spooling to a temporary file next to the blobs, so the
+        # upload is read once and renamed into place atomically.
+        directory = self.path(BLOB_DIR)
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as output:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    output.write(chunk)
+            name = blob_name(digest.hexdigest(), extension)
+            path = self.path(name)
+            if os.path.exists(path):
+                # A fresh mtime keeps collect_image from deleting the file
+                # before the row referencing it again is saved.
+                os.utime(path)
+            else:
+                self._replace(temporary, path)
+                temporary = None
+        finally:
+            if temporary is not None:
+                os.unlink(temporary)
+        return name
+
+    def write(self, name, data):
+        """Store ``data`` as ``name`` exactly, replacing any file of that name."""
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as output:
+                output.write(data)
+            self._replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def _replace(self, temporary, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(temporary, self.file_permissions_mode)
+        os.replace(temporary, path)
+
+
+image_storage = ContentAddressedStorage()
+
+
+def retain(name):
+    """
+    Count one more reference to the blob ``name``. The variants of a new
+    blob are rendered by a background job.
+    """
+    if ImageBlob.objects.filter(name=name).update(references=F("references") + 1):
+        return
+    try:
+        with transaction.atomic():
+            ImageBlob.objects.create(name=name, references=1)
+    except IntegrityError:
+        ImageBlob.objects.filter(name=name).update(references=F("references") + 1)
+    else:
+        enqueue("core.generate_image_variants", name=name)
+
+
+def release(name):
+    """
+    Count one reference less to the blob ``name`` and delete it once the
+    transaction commits if that was the last one.
+    """
+    ImageBlob.objects.filter(name=name).update(references=F("references") - 1)
+    transaction.on_commit(lambda: collect_image(name))
+
+
+def count_references(name):
+    return sum(
+        model._default_manager.filter(**{attname: name}).count()
+        for model, attname in image_fields
+    )
+
+
+def collect_image(name):
+    """
+    Delete the blob ``name`` and its file if nothing references it; returns
+    whether it did.
+
+    The count is checked against the image columns before anything is
+    deleted, so a count that drifted low never loses a file. Files saved
+    again in the last ``IMAGE_COLLECT_GRACE`` seconds are kept too, since a
+    row referencing them may be about to commit; ``manage.py
+    collect_images`` picks them up later.
+    """
+    with transaction.atomic():
+        blob = (
+            ImageBlob.objects.select_for_update()
+            .filter(name=name, references__lte=0)
+            .first()
+        )
+        if blob is None:
+            return False
+
+        references = count_references(name)
+        if references:
+            logger.warning("Corrected the reference count of %s to %d", name, references)
+            blob.references = references
+            blob.save(update_fields=["references"])
+            return False
+
+        try:
+            age = time.time() - os.path.getmtime(image_storage.path(name))
+        except FileNotFoundError:
+            age = None
+        if age is not None and age < settings.IMAGE_COLLECT_GRACE:
+            return False
+
+        blob.delete()
+        image_storage.delete(name)
+        for variant in settings.IMAGE_VARIANTS:
+            image_storage.delete(variant_name(name, variant))
+    return True
+
+
+def variants_rendered(name):
+    """
+    Whether the variants of the image ``name`` were rendered. Known outcomes
+    are cached for ``IMAGE_STATUS_CACHE_TIMEOUT`` seconds, so serializing
+    rendered images costs no query.
+    """
+    key = f"{STATUS_CACHE_PREFIX}{name}"
+    rendered = cache.get(key)
+    if rendered is None:
+        rendered = (
+            ImageBlob.objects.filter(name=name)
+            .values_list("variants_rendered", flat=True)
+            .first()
+        )
+        if rendered is not None:
+            cache.set(key, rendered, settings.IMAGE_STATUS_CACHE_TIMEOUT)
+    return bool(rendered)
+
+
+def record_render(name, rendered):
+    ImageBlob.objects.filter(name=name).update(variants_rendered=rendered)
+    cache.delete(f"{STATUS_CACHE_PREFIX}{name}")
+
+
+def variant_urls(name, request=None):
+    """
+    URLs of the ``IMAGE_VARIANTS`` of the image ``name``. Until its job has
+    rendered them, or when the image could not be rendered, every variant
+    points to the original instead.
+    """
+    if not name:
+        return None
+    rendered = variants_rendered(name)
+    urls = {}
+    for variant in settings.IMAGE_VARIANTS:
+        url = image_storage.url(variant_name(name, variant) if rendered else name)
+        urls[variant] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+
+def missing_variants(name):
+    return [
+        variant for variant in settings.IMAGE_VARIANTS
+        if not image_storage.exists(variant_name(name, variant))
+    ]
+
+
+def render_variant(image, size, crop=False):
+    if crop:
+        return ImageOps.fit(image, size, Image.LANCZOS)
+    image = image.copy()
+    # Only ever scales down.
+    image.thumbnail(size, Image.LANCZOS)
+    return image
+
+
+def generate_variants(name, variants=None):
+    """
+    Render ``variants`` of the image ``name``, all ``IMAGE_VARIANTS`` by
+    default, and return the names of the files written.
+    """
+    variants = list(settings.IMAGE_VARIANTS) if variants is None else variants
+    if not variants:
+        return []
+
+    with image_storage.open(name) as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    written = []
+    for variant in variants:
+        options = settings.IMAGE_VARIANTS[variant]
+        output = BytesIO()
+        render_variant(image, tuple(options["size"]), options.get("crop", False)).save(
+            output, VARIANT_FORMAT, quality=settings.IMAGE_VARIANT_QUALITY
+        )
+        written.append(variant_name(name, variant))
+        image_storage.write(written[-1], output.getvalue())
+    return written
+
+
+class SharedImageFieldFile(ImageFieldFile):
+
+    def delete(self, save=True):
+        # Other rows may share the file; collect_image deletes it once the
+        # last reference is gone.
+        if not self:
+            return
+        if hasattr(self, "_file"):
+            self.close()
+            del self.file
+        if hasattr(self, "_dimensions_cache"):
+            del self._dimensions_cache
+
+        self.name = None
+        setattr(self.instance, self.field.attname, self.name)
+        self._committed = False
+
+        if save:
+            self.instance.save()
+
+    delete.alters_data = True
+
+
+class ContentAddressedImageField(models.ImageField):
+    """
+    ``ImageField`` kept in :class:`ContentAddressedStorage`, with the rows
+    referencing every file counted in :class:`~core.models.ImageBlob`.
+    Assigning the name of a stored image to another row shares the file
+    instead of copying it.
+
+    Counts are kept by model signals, so ``QuerySet.update()`` and
+    ``bulk_create()`` do not count the rows they write.
+    """
+
+    attr_class = SharedImageFieldFile
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("storage", image_storage)
+        kwargs.setdefault("db_index", True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if kwargs.get("storage") is image_storage:
+            del kwargs["storage"]
+        if self.db_index:
+            del kwargs["db_index"]
+        else:
+            kwargs["db_index"] = False
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        # Historical models of migrations keep no counts.
+        if cls._meta.abstract or cls._meta.apps is not global_apps:
+            return
+        image_fields.append((cls, self.attname))
+        post_init.connect(self.remember_stored, sender=cls, weak=False)
+        post_save.connect(self.count_saved, sender=cls, weak=False)
+        post_delete.connect(self.count_deleted, sender=cls, weak=False)
+
+    @property
+    def stored_attname(self):
+        return f"_{self.attname}_stored"
+
+    def value_name(self, value):
+        name = getattr(value, "name", value)
+        return name or None
+
+    def remember_stored(self, instance, **kwargs):
+        # Deferred fields are not loaded, so their stored name is unknown.
+        if self.attname in instance.__dict__:
+            instance.__dict__[self.stored_attname] = self.value_name(
+                instance.__dict__[self.attname]
+            )
+
+    def count_saved(self, instance, created, update_fields=None, **kwargs):
+        if update_fields is not None and self.attname not in update_fields:
+            return
+        if self.attname not in instance.__dict__:
+            return
+        name = self.value_name(instance.__dict__[self.attname])
+        if created:
+            stored = None
+        elif self.stored_attname in instance.__dict__:
+            stored = instance.__dict__[self.stored_attname]
+        else:
+            # Unknown previous file: leave the counts alone, collect_image
+            # checks the columns before deleting anything.
+            instance.__dict__[self.stored_attname] = name
+            return
+
+        if name != stored:
+            if name:
+                retain(name)
+            if stored:
+                release(stored)
+        instance.__dict__[self.stored_attname] = name
+
+    def count_deleted(self, instance, **kwargs):
+        stored = instance.__dict__.get(self.stored_attname)
+        if stored:
+            release(stored)
@@ -0,0 +1,122 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import serializers
+
+_metrics = contextvars.ContextVar("core_request_metrics", default=None)
+_query_wrappers = []
+
+
+class RequestMetrics:
+    """
+    Timings collected while one request is being handled.
+
+    Times are in seconds. ``serializer_time`` only counts the outermost
+    ``serializer.data`` call, so nested serializers are not counted twice.
+    """
+
+    def __init__(self):
+        self.view = None
+        self.action = None
+        self.query_count = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.started = time.perf_counter()
+        self._serializer_depth = 0
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def current_metrics():
+    return _metrics.get()
+
+
+@contextmanager
+def collect_metrics():
+    metrics = RequestMetrics()
+    token = _metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _metrics.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.query_count += 1
+        metrics.query_time += time.perf_counter() - start
+
+
+def _install_query_wrappers(sender=None, connection=None, **kwargs):
+    for wrapper in _query_wrappers:
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+
+
+def register_query_wrapper(wrapper):
+    """
+    Attach ``wrapper`` to every current and future database connection.
+    """
+    if wrapper not in _query_wrappers:
+        _query_wrappers.append(wrapper)
+
+    connection_created.connect(_install_query_wrappers, dispatch_uid="core.instrumentation")
+    for connection in connections.all(initialized_only=True):
+        _install_query_wrappers(connection=connection)
+
+
+@contextmanager
+def time_serialization():
+    """
+    Count the enclosed block as serializer time, unless an outer block is
+    already being counted.
+    """
+    metrics = _metrics.get()
+    if metrics is None or metrics._serializer_depth:
+        yield
+        return
+
+    metrics._serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._serializer_depth -= 1
+        metrics.serializer_time += time.perf_counter() - start
+
+
+def _timed_data(fget):
+    @wraps(fget)
+    def data(self):
+        with time_serialization():
+            return fget(self)
+
+    data._core_instrumented = True
+    return data
+
+
+def install():
+    """
+    Hook query and serializer timing into every connection and serializer.
+
+    Called once from ``CoreConfig.ready``; the hooks are no-ops outside of
+    ``collect_metrics()``.
+    """
+    data = serializers.BaseSerializer.data
+    if not getattr(data.fget, "_core_instrumented", False):
+        serializers.BaseSerializer.data = property(_timed_data(data.fget))
+
+    register_query_wrapper(record_query)
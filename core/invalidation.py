@@ -0,0 +1,73 @@
+import threading
+
+from django.db import transaction
+
+from core.pubsub import broker
+
+INVALIDATION_CHANNEL = "invalidate"
+
+USER = "user"
+LIST = "list"
+ITEM = "item"
+
+
+def change_key(kind, pk):
+    return f"{kind}:{pk}"
+
+
+def parse_keys(keys, kind):
+    """Ids of the ``kind`` keys among ``keys``."""
+    prefix = f"{kind}:"
+    return [int(key[len(prefix):]) for key in keys if key.startswith(prefix)]
+
+
+class InvalidationBus:
+    """
+    Announce changed rows to the per-process caches of every worker.
+
+    Writes publish change keys such as ``list:12`` once their transaction
+    commits; every process that has started the bus passes them to its
+    handlers, which evict what they cached for those keys. Messages travel
+    through :data:`core.pubsub.broker`, so with ``PUBSUB_BACKEND =
+    "postgres"`` they reach all workers through ``NOTIFY``.
+    """
+
+    def __init__(self):
+        self._handlers = []
+        self._unsubscribe = None
+        self._lock = threading.Lock()
+
+    def connect(self, handler):
+        """Call ``handler(keys)`` with the change keys of every message."""
+        self._handlers.append(handler)
+
+    def start(self):
+        """
+        Subscribe this process to the bus. Caches call it before storing
+        anything, so processes that cache nothing never listen.
+        """
+        if self._unsubscribe is not None:
+            return
+        with self._lock:
+            if self._unsubscribe is None:
+                self._unsubscribe = broker.subscribe(INVALIDATION_CHANNEL, self.dispatch)
+
+    def stop(self):
+        with self._lock:
+            if self._unsubscribe is not None:
+                self._unsubscribe()
+                self._unsubscribe = None
+
+    def publish(self, *keys):
+        keys = sorted(set(keys))
+        if keys:
+            transaction.on_commit(
+                lambda: broker.publish(INVALIDATION_CHANNEL, {"keys": keys})
+            )
+
+    def dispatch(self, message):
+        for handler in self._handlers:
+            handler(message["keys"])
+
+
+bus = InvalidationBus()
@@ -0,0 +1,485 @@
+import asyncio
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from gear_lists.models import GearList, ListItem
+
+from .benchmarks import percentile
+from .datagen import BENCHMARK_USER_PREFIX
+
+DEFAULT_MIX = {"browse": 5, "shared": 2, "toggle_packed": 2, "reorder": 1, "add_item": 1}
+
+
+class WSGITransport:
+    """
+    Call the project's WSGI application directly, without a socket.
+    """
+
+    def __init__(self):
+        self.app = get_wsgi_application()
+        self.factory = RequestFactory()
+
+    def request(self, method, path, data=None, headers=None):
+        body = json.dumps(data) if data is not None and method != "GET" else ""
+        environ = self.factory.generic(
+            method,
+            path if method != "GET" or not data else f"{path}?{urlencode(data)}",
+            body,
+            content_type="application/json",
+            headers=headers,
+        ).environ
+        captured = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            captured["status"] = int(status.split(" ", 1)[0])
+
+        result = self.app(environ, start_response)
+        try:
+            content = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return captured["status"], content
+
+
+class ASGITransport:
+    """
+    Drive the project's ASGI application from the event loop, without a socket.
+    """
+
+    def __init__(self):
+        self.app = get_asgi_application()
+
+    async def request(self, method, path, data=None, headers=None):
+        query_string = ""
+        body = b""
+        if data is not None:
+            if method == "GET":
+                query_string = urlencode(data)
+            else:
+                body = json.dumps(data).encode()
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query_string.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *(
+                    (name.lower().encode(), value.encode())
+                    for name, value in (headers or {}).items()
+                ),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        finished = asyncio.Event()
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        response = {"status": None, "body": []}
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            # Django listens for a disconnect while the view runs; only
+            # report one once the response has been sent.
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    finished.set()
+
+        await self.app(scope, receive, send)
+        finished.set()
+        return response["status"], b"".join(response["body"])
+
+
+class HTTPTransport:
+    """
+    Send requests to a running server, e.g. ``runserver`` or gunicorn.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method, path, data=None, headers=None):
+        url = f"{self.base_url}{path}"
+        body = None
+        if data is not None:
+            if method == "GET":
+                url = f"{url}?{urlencode(data)}"
+            else:
+                body = json.dumps(data).encode()
+
+        request = urllib.request.Request(url, data=body, method=method)
+        request.add_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            request.add_header(name, value)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+
+class UserState:
+    """
+    What one benchmark user's virtual clients act on.
+
+    Writes are concentrated on the first ``hot_lists`` lists of each user,
+    so concurrent clients update the same ``GearList`` rows.
+    """
+
+    def __init__(self, user, hot_lists, item_sample):
+        token, _ = Token.objects.get_or_create(user=user)
+        self.headers = {"Authorization": f"Token {token.key}"}
+        self.list_ids = list(
+            GearList.objects.filter(owner=user).order_by("id").values_list("id", flat=True)
+        )
+        self.hot_lists = {
+            list_id: list(
+                ListItem.objects.filter(gear_list_id=list_id)
+                .order_by("order")
+                .values_list("id", flat=True)
+            )
+            for list_id in self.list_ids[:hot_lists]
+        }
+        self.item_ids = list(
+            user.items.order_by("?").values_list("id", flat=True)[:item_sample]
+        )
+
+
+class LoadTestData:
+
+    def __init__(self, users=None, hot_lists=1, item_sample=500):
+        User = get_user_model()
+        queryset = User.objects.filter(username__startswith=BENCHMARK_USER_PREFIX).order_by("id")
+        if users:
+            queryset = queryset[:users]
+        self.users = [UserState(user, hot_lists, item_sample) for user in queryset]
+        if not self.users:
+            raise LookupError("No benchmark data found, run generate_benchmark_data first.")
+        self.share_codes = [
+            str(code)
+            for code in GearList.objects.filter(
+                is_public=True, owner__username__startswith=BENCHMARK_USER_PREFIX
+            ).values_list("share_code", flat=True)
+        ]
+
+
+def browse(state, data, rng):
+    if rng.random() < 0.5:
+        return "GET", reverse("gear_lists:gear_list-list"), None
+    list_id = rng.choice(state.list_ids)
+    return "GET", reverse("gear_lists:gear_list-detail", args=[list_id]), None
+
+
+def open_shared_list(state, data, rng):
+    if not data.share_codes:
+        return browse(state, data, rng)
+    return (
+        "POST",
+        reverse("gear_lists:gear_list-shared"),
+        {"share_code": rng.choice(data.share_codes)},
+    )
+
+
+def toggle_packed(state, data, rng):
+    list_items = state.hot_lists[rng.choice(list(state.hot_lists))]
+    return (
+        "POST",
+        reverse("gear_lists:list_item-toggle-packed", args=[rng.choice(list_items)]),
+        {},
+    )
+
+
+def reorder(state, data, rng):
+    list_items = list(state.hot_lists[rng.choice(list(state.hot_lists))])
+    rng.shuffle(list_items)
+    return "POST", reverse("gear_lists:list_item-reorder"), {"items_order": list_items}
+
+
+def add_item(state, data, rng):
+    list_id = rng.choice(list(state.hot_lists))
+    return (
+        "POST",
+        reverse("gear_lists:gear_list-items", args=[list_id]),
+        {"item": rng.choice(state.item_ids), "quantity": rng.randint(1, 3)},
+    )
+
+
+SCENARIOS = {
+    "browse": browse,
+    "shared": open_shared_list,
+    "toggle_packed": toggle_packed,
+    "reorder": reorder,
+    "add_item": add_item,
+}
+
+
+def parse_mix(value):
+    """
+    Parse ``"browse=5,reorder=1"`` into a scenario weight mapping.
+    """
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}, choose from {', '.join(SCENARIOS)}.")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class LockMonitor(threading.Thread):
+    """
+    Sample PostgreSQL backends waiting on locks while the load test runs.
+    """
+
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.samples = 0
+        self.max_waiting = 0
+        self.queries = Counter()
+
+    def run(self):
+        try:
+            while not self.stop_event.wait(self.interval):
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT query FROM pg_stat_activity "
+                        "WHERE wait_event_type = 'Lock' AND datname = current_database()"
+                    )
+                    waiting = [row[0] for row in cursor.fetchall()]
+                self.samples += 1
+                self.max_waiting = max(self.max_waiting, len(waiting))
+                self.queries.update(" ".join(query.split())[:200] for query in waiting)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+    def report(self):
+        return {
+            "samples": self.samples,
+            "max_waiting": self.max_waiting,
+            "queries": [
+                {"query": query, "samples": count} for query, count in self.queries.most_common(10)
+            ],
+        }
+
+
+class Recorder:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def add(self, scenario, status, elapsed):
+        with self.lock:
+            self.latencies[scenario].append(elapsed * 1000)
+            self.statuses[scenario][status] += 1
+
+
+class LoadTest:
+    """
+    Run a weighted scenario mix with ``concurrency`` virtual clients.
+
+    ``mode`` is ``"threads"`` (in-process WSGI, one thread per client),
+    ``"asyncio"`` (in-process ASGI, one task per client) or ``"http"``
+    (threads against ``base_url``). The run stops after ``duration``
+    seconds or once ``requests`` requests have been sent.
+    """
+
+    def __init__(self, mode="threads", concurrency=8, duration=10, requests=None,
+                 mix=None, base_url=None, users=None, hot_lists=1, seed=0,
+                 monitor_locks=True):
+        self.mode = mode
+        self.concurrency = concurrency
+        self.duration = duration
+        self.requests = requests
+        self.mix = mix or DEFAULT_MIX
+        self.base_url = base_url
+        self.users = users
+        self.hot_lists = hot_lists
+        self.seed = seed
+        self.monitor_locks = monitor_locks and connection.vendor == "postgresql"
+        self.recorder = Recorder()
+        self._sent = 0
+        self._sent_lock = threading.Lock()
+
+    def _claim(self, deadline):
+        if time.perf_counter() >= deadline:
+            return False
+        with self._sent_lock:
+            if self.requests is not None and self._sent >= self.requests:
+                return False
+            self._sent += 1
+            return True
+
+    def _next_request(self, data, rng, worker):
+        state = data.users[worker % len(data.users)]
+        scenario = rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        method, path, payload = SCENARIOS[scenario](state, data, rng)
+        return scenario, method, path, payload, state.headers
+
+    def _thread_worker(self, transport, data, worker, deadline):
+        rng = random.Random(self.seed + worker)
+        try:
+            while self._claim(deadline):
+                scenario, method, path, payload, headers = self._next_request(data, rng, worker)
+                start = time.perf_counter()
+                try:
+                    status, _ = transport.request(method, path, payload, headers)
+                except Exception as exc:
+                    status = type(exc).__name__
+                self.recorder.add(scenario, status, time.perf_counter() - start)
+        finally:
+            connections.close_all()
+
+    async def _async_worker(self, transport, data, worker, deadline):
+        rng = random.Random(self.seed + worker)
+        while self._claim(deadline):
+            scenario, method, path, payload, headers = self._next_request(data, rng, worker)
+            start = time.perf_counter()
+            try:
+                status, _ = await transport.request(method, path, payload, headers)
+            except Exception as exc:
+                status = type(exc).__name__
+            self.recorder.add(scenario, status, time.perf_counter() - start)
+
+    def _run_threads(self, transport, data, deadline):
+        workers = [
+            threading.Thread(target=self._thread_worker, args=(transport, data, worker, deadline))
+            for worker in range(self.concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    async def _run_asyncio(self, transport, data, deadline):
+        await asyncio.gather(
+            *(
+                self._async_worker(transport, data, worker, deadline)
+                for worker in range(self.concurrency)
+            )
+        )
+
+    def run(self):
+        data = LoadTestData(users=self.users, hot_lists=self.hot_lists)
+        monitor = LockMonitor() if self.monitor_locks else None
+
+        allowed_hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+        with override_settings(ALLOWED_HOSTS=allowed_hosts):
+            if monitor is not None:
+                monitor.start()
+            started = time.perf_counter()
+            deadline = started + self.duration
+            try:
+                if self.mode == "asyncio":
+                    asyncio.run(self._run_asyncio(ASGITransport(), data, deadline))
+                elif self.mode == "http":
+                    self._run_threads(HTTPTransport(self.base_url), data, deadline)
+                else:
+                    self._run_threads(WSGITransport(), data, deadline)
+            finally:
+                elapsed = time.perf_counter() - started
+                if monitor is not None:
+                    monitor.stop()
+
+        return self.report(elapsed, monitor)
+
+    def report(self, elapsed, monitor=None):
+        scenarios = {}
+        all_latencies = []
+        total_errors = 0
+        for scenario, latencies in sorted(self.recorder.latencies.items()):
+            statuses = self.recorder.statuses[scenario]
+            errors = sum(
+                count for status, count in statuses.items()
+                if not isinstance(status, int) or status >= 400
+            )
+            total_errors += errors
+            all_latencies.extend(latencies)
+            scenarios[scenario] = {
+                "requests": len(latencies),
+                "errors": errors,
+                "error_rate": round(errors / len(latencies), 4),
+                "status": {str(status): count for status, count in statuses.items()},
+                "latency_ms": _latency_summary(latencies),
+            }
+
+        total = len(all_latencies)
+        return {
+            "meta": {
+                "mode": self.mode,
+                "target": self.base_url if self.mode == "http" else "in-process",
+                "concurrency": self.concurrency,
+                "mix": self.mix,
+                "hot_lists": self.hot_lists,
+                "seed": self.seed,
+            },
+            "totals": {
+                "requests": total,
+                "duration_s": round(elapsed, 3),
+                "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+                "errors": total_errors,
+                "error_rate": round(total_errors / total, 4) if total else None,
+                "latency_ms": _latency_summary(all_latencies),
+            },
+            "scenarios": scenarios,
+            "lock_waits": monitor.report() if monitor is not None else None,
+        }
+
+
+def _latency_summary(latencies):
+    if not latencies:
+        return None
+    return {
+        "p50": round(percentile(latencies, 50), 3),
+        "p90": round(percentile(latencies, 90), 3),
+        "p95": round(percentile(latencies, 95), 3),
+        "p99": round(percentile(latencies, 99), 3),
+        "max": round(max(latencies), 3),
+    }
+
+
+def validate_base_url(base_url):
+    parts = urlsplit(base_url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(f"Invalid base URL {base_url!r}.")
+    return base_url
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.images import missing_variants
+from core.models import ImageBlob
+from jobs.registry import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue a job rendering the missing IMAGE_VARIANTS of every stored image, "
+        "or recording that none are missing; run_jobs workers render them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Render every variant again, e.g. after changing IMAGE_VARIANTS.",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        blobs = ImageBlob.objects.filter(references__gt=0).order_by("id").values_list(
+            "name", "variants_rendered"
+        )
+        queued = 0
+        with transaction.atomic():
+            # Blobs stored before render outcomes were recorded get a job too,
+            # which records them.
+            for name, rendered in blobs.iterator():
+                if force or rendered is None or missing_variants(name):
+                    enqueue("core.generate_image_variants", name=name, force=force)
+                    queued += 1
+        self.stdout.write(self.style.SUCCESS(f"Queued {queued} images for variant rendering."))
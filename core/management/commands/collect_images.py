@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.images import collect_image
+from core.models import ImageBlob
+
+
+class Command(BaseCommand):
+    help = "Delete stored images that no row references any more."
+
+    def handle(self, *args, **options):
+        names = ImageBlob.objects.filter(references__lte=0).values_list("name", flat=True)
+        deleted = sum(collect_image(name) for name in list(names))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} unreferenced images."))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from core.datagen import DatasetGenerator, delete_dataset
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic dataset for the benchmark and load-test suites."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=2)
+        parser.add_argument("--items-per-user", type=int, default=10000)
+        parser.add_argument("--categories-per-user", type=int, default=12)
+        parser.add_argument("--lists-per-user", type=int, default=10)
+        parser.add_argument("--min-list-items", type=int, default=50)
+        parser.add_argument("--max-list-items", type=int, default=1000)
+        parser.add_argument(
+            "--public-ratio", type=float, default=0.3, help="Share of lists that are public."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--flush", action="store_true", help="Delete existing benchmark users first."
+        )
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            deleted, _ = delete_dataset()
+            self.stdout.write(f"Deleted {deleted} benchmark rows.")
+
+        generator = DatasetGenerator(
+            users=options["users"],
+            items_per_user=options["items_per_user"],
+            categories_per_user=options["categories_per_user"],
+            lists_per_user=options["lists_per_user"],
+            min_list_items=options["min_list_items"],
+            max_list_items=options["max_list_items"],
+            public_ratio=options["public_ratio"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=self.stdout.write,
+        )
+        totals = generator.generate()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Generated {users} users, {categories} categories, {items} items, "
+                "{lists} lists and {list_items} list items.".format(**totals)
+            )
+        )
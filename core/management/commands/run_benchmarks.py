@@ -0,0 +1,57 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import compare, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Measure latency and query counts of the hot API endpoints and write them as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--only",
+            action="append",
+            help="Only run endpoints whose name starts with this prefix, e.g. lists.",
+        )
+        parser.add_argument(
+            "--output", help="Result file; defaults to BENCHMARK_DIR/<commit>.json."
+        )
+        parser.add_argument("--compare", help="Earlier result file to compare against.")
+
+    def handle(self, *args, **options):
+        try:
+            report = run_benchmarks(
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                only=options["only"],
+                log=self.stdout.write,
+            )
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        output = options["output"]
+        if not output:
+            os.makedirs(settings.BENCHMARK_DIR, exist_ok=True)
+            name = (report["meta"]["commit"] or "unknown")[:12]
+            output = os.path.join(settings.BENCHMARK_DIR, f"{name}.json")
+        with open(output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output}"))
+
+        if options["compare"]:
+            with open(options["compare"]) as fh:
+                baseline = json.load(fh)
+            self.stdout.write(f"Compared with {baseline['meta'].get('commit')}:")
+            for row in compare(baseline, report):
+                p50, p95 = (
+                    "n/a".rjust(8) if row[key] is None else f"{row[key]:+7.1f}%"
+                    for key in ("p50", "p95")
+                )
+                self.stdout.write(
+                    f"{row['endpoint']:<28} p50 {p50}  p95 {p95}  queries {row['queries']:+d}"
+                )
@@ -0,0 +1,83 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loadtest import DEFAULT_MIX, LoadTest, parse_mix, validate_base_url
+
+
+class Command(BaseCommand):
+    help = "Drive concurrent API traffic against the generated dataset and report latencies."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mode",
+            choices=["threads", "asyncio", "http"],
+            default="threads",
+            help="In-process WSGI with threads, in-process ASGI with asyncio, or a live server.",
+        )
+        parser.add_argument("--base-url", help="Server to target in http mode.")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=10, help="Seconds to run.")
+        parser.add_argument("--requests", type=int, help="Stop after this many requests.")
+        parser.add_argument(
+            "--mix",
+            default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+            help="Scenario weights, e.g. browse=5,shared=2,toggle_packed=2,reorder=1,add_item=1.",
+        )
+        parser.add_argument("--users", type=int, help="Benchmark users to spread clients over.")
+        parser.add_argument(
+            "--hot-lists",
+            type=int,
+            default=1,
+            help="Lists per user that all writes target, to provoke row lock contention.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--no-lock-monitor", action="store_true")
+        parser.add_argument("--output", help="Also write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options["mix"])
+            if options["mode"] == "http":
+                validate_base_url(options["base_url"])
+            report = LoadTest(
+                mode=options["mode"],
+                concurrency=options["concurrency"],
+                duration=options["duration"],
+                requests=options["requests"],
+                mix=mix,
+                base_url=options["base_url"],
+                users=options["users"],
+                hot_lists=options["hot_lists"],
+                seed=options["seed"],
+                monitor_locks=not options["no_lock_monitor"],
+            ).run()
+        except (LookupError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        totals = report["totals"]
+        self.stdout.write(
+            f"{totals['requests']} requests in {totals['duration_s']}s: "
+            f"{totals['throughput_rps']} req/s, error rate {totals['error_rate']}"
+        )
+        for name, scenario in report["scenarios"].items():
+            latency = scenario["latency_ms"]
+            self.stdout.write(
+                f"{name:<14} {scenario['requests']:>7} req  p50 {latency['p50']:>8.1f} ms  "
+                f"p95 {latency['p95']:>8.1f} ms  p99 {latency['p99']:>8.1f} ms  "
+                f"errors {scenario['error_rate']:.2%}  status {scenario['status']}"
+            )
+
+        lock_waits = report["lock_waits"]
+        if lock_waits:
+            self.stdout.write(
+                f"Lock waits: up to {lock_waits['max_waiting']} backends waiting "
+                f"over {lock_waits['samples']} samples"
+            )
+            for entry in lock_waits["queries"]:
+                self.stdout.write(f"  {entry['samples']:>5}  {entry['query']}")
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
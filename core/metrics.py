@@ -0,0 +1,298 @@
+import glob
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Registry:
+    """
+    Per-process metric store shared with other workers through files.
+
+    Every process writes its own snapshot to ``METRICS_DIR/<pid>.json`` at
+    most once per ``METRICS_FLUSH_INTERVAL`` seconds; the ``/metrics`` view
+    merges all snapshots, so each WSGI worker's samples are reported
+    together without a separate collector process.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self._last_flush = 0.0
+        self._collect_hooks = []
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def on_collect(self, hook):
+        self._collect_hooks.append(hook)
+        return hook
+
+    def snapshot(self):
+        for hook in self._collect_hooks:
+            hook()
+
+        with self.lock:
+            return {
+                "pid": os.getpid(),
+                "metrics": {name: metric.dump() for name, metric in self.metrics.items()},
+            }
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        path = os.path.join(settings.METRICS_DIR, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(self.snapshot(), fh)
+        os.replace(tmp_path, path)
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        self._values = {}
+        registry.register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def dump(self):
+        return {
+            "type": self.kind,
+            "help": self.documentation,
+            "labelnames": self.labelnames,
+            "samples": [[list(key), value] for key, value in self._values.items()],
+        }
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self.registry.lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS,
+                 registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            sample = self._values.get(key)
+            if sample is None:
+                sample = self._values[key] = {
+                    "buckets": [0] * len(self.buckets), "sum": 0, "count": 0
+                }
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample["buckets"][index] += 1
+                    break
+            sample["sum"] += value
+            sample["count"] += 1
+
+    def dump(self):
+        data = super().dump()
+        data["bucket_bounds"] = self.buckets
+        return data
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by view and action.",
+    ["view", "action"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_queries",
+    "SQL queries issued per request by view and action.",
+    ["view", "action"],
+    buckets=DEFAULT_QUERY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+WEIGHT_RECOMPUTES = Counter(
+    "gear_list_weight_recomputes_total",
+    "Gear list total weights recomputed.",
+)
+DB_CONNECTIONS_OPENED = Counter(
+    "db_connections_opened_total",
+    "Database connections opened by alias.",
+    ["alias"],
+)
+DB_CONNECTIONS_CLOSED = Counter(
+    "db_connections_closed_total",
+    "Database connections closed by alias.",
+    ["alias"],
+)
+DB_CONNECTIONS_OPEN = Gauge(
+    "db_connections_open",
+    "Database connections currently open by alias.",
+    ["alias"],
+)
+
+
+def record_cache_lookup(cache_name, hit):
+    CACHE_REQUESTS.inc(cache=cache_name, result="hit" if hit else "miss")
+
+
+def _count_connection(sender, connection, **kwargs):
+    DB_CONNECTIONS_OPENED.inc(alias=connection.alias)
+    # A wrapper reconnects after a close; wrap its close only the first time.
+    if "_close" in vars(connection):
+        return
+    close = connection._close
+
+    def counted_close():
+        try:
+            close()
+        finally:
+            DB_CONNECTIONS_CLOSED.inc(alias=connection.alias)
+
+    connection._close = counted_close
+
+
+connection_created.connect(_count_connection, dispatch_uid="core.metrics")
+
+
+@REGISTRY.on_collect
+def _collect_open_connections():
+    # Connections are thread-local, so the process-wide count is derived
+    # from the opens and closes of every thread.
+    with REGISTRY.lock:
+        opened = dict(DB_CONNECTIONS_OPENED._values)
+        closed = dict(DB_CONNECTIONS_CLOSED._values)
+    for key, count in opened.items():
+        DB_CONNECTIONS_OPEN.set(count - closed.get(key, 0), alias=key[0])
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _load_snapshots():
+    snapshots = []
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.json")):
+        try:
+            with open(path) as fh:
+                snapshots.append(json.load(fh))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def aggregate():
+    """
+    Merge every worker's snapshot. Counters and histograms are summed over
+    all files; gauges only over processes that are still running.
+    """
+    merged = {}
+    for snapshot in _load_snapshots():
+        alive = _pid_alive(snapshot["pid"])
+        for name, data in snapshot["metrics"].items():
+            if data["type"] == "gauge" and not alive:
+                continue
+
+            target = merged.setdefault(name, {**data, "samples": {}})
+            for key, value in data["samples"]:
+                key = tuple(key)
+                current = target["samples"].get(key)
+                if data["type"] == "histogram":
+                    if current is None:
+                        current = {"buckets": [0] * len(value["buckets"]), "sum": 0, "count": 0}
+                    current = {
+                        "buckets": [a + b for a, b in zip(current["buckets"], value["buckets"])],
+                        "sum": current["sum"] + value["sum"],
+                        "count": current["count"] + value["count"],
+                    }
+                else:
+                    current = (current or 0) + value
+                target["samples"][key] = current
+    return merged
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def render_text(merged):
+    """
+    Render merged samples in the Prometheus text exposition format (0.0.4).
+    """
+    lines = []
+    for name in sorted(merged):
+        data = merged[name]
+        names = data["labelnames"]
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['type']}")
+
+        for key, value in sorted(data["samples"].items()):
+            if data["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, key)} {_number(value)}")
+                continue
+
+            cumulative = 0
+            for bound, count in zip(data["bucket_bounds"], value["buckets"]):
+                cumulative += count
+                labels = _labels(names, key, [("le", _number(bound))])
+                lines.append(f"{name}_bucket{labels} {_number(cumulative)}")
+            labels = _labels(names, key, [("le", "+Inf")])
+            lines.append(f"{name}_bucket{labels} {_number(value['count'])}")
+            lines.append(f"{name}_sum{_labels(names, key)} {_number(value['sum'])}")
+            lines.append(f"{name}_count{_labels(names, key)} {_number(value['count'])}")
+
+    return "\n".join(lines) + "\n"
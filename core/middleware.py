@@ -0,0 +1,231 @@
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .instrumentation import collect_metrics, current_metrics
+from .metrics import REGISTRY, REQUEST_LATENCY, REQUEST_QUERIES
+from .nplusone import detect_nplusone, format_findings
+from .tracing import collect_trace, write_trace
+
+logger = logging.getLogger("core.performance")
+nplusone_logger = logging.getLogger("core.nplusone")
+
+# Only one profiler can be active at a time (Python 3.12 raises ValueError
+# for a second one), so concurrent profiling requests go unprofiled.
+_profiler_lock = threading.Lock()
+
+
+def _view_name(view_func):
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is not None:
+        return view_class.__name__
+    return getattr(view_func, "__name__", view_func.__class__.__name__)
+
+
+class PerformanceMiddleware:
+    """
+    Report where time goes inside each request.
+
+    Adds a ``Server-Timing`` header (db, serialize, app and total phases),
+    logs one JSON line per request to the ``core.performance`` logger and
+    feeds the latency and query-count histograms served at ``/metrics``. With
+    ``REQUEST_PROFILING`` on, staff users sending ``X-Profile: 1`` to a
+    synchronous view also get a cProfile dump written to ``PROFILE_DIR``,
+    named in the ``X-Profile-Id`` response header. Likewise, with
+    ``REQUEST_TRACING`` on, their ``X-Trace: 1`` writes a Chrome trace JSON of
+    the request's spans to ``TRACE_DIR``, named in ``X-Trace-Id``.
+    ``TRACE_REQUESTS`` traces every request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        if not settings.PERFORMANCE_INSTRUMENTATION:
+            return self.get_response(request)
+
+        profiler = self._start_profiler(request)
+        with collect_metrics() as metrics, self._start_trace(request) as trace:
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                    _profiler_lock.release()
+            self._finish(request, response, metrics, profiler, trace)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.PERFORMANCE_INSTRUMENTATION:
+            return await self.get_response(request)
+
+        # A profiler would see every coroutine interleaved on the event loop,
+        # so async requests are never profiled.
+        with collect_metrics() as metrics, self._start_trace(request) as trace:
+            response = await self.get_response(request)
+            self._finish(request, response, metrics, None, trace)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = current_metrics()
+        if metrics is None:
+            return None
+
+        metrics.view = _view_name(view_func)
+        actions = getattr(view_func, "actions", None)
+        if actions:
+            metrics.action = actions.get(request.method.lower())
+        return None
+
+    def _start_profiler(self, request):
+        if not settings.REQUEST_PROFILING or request.headers.get("X-Profile") != "1":
+            return None
+        if not _profiler_lock.acquire(blocking=False):
+            return None
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler, outside this middleware, is already active.
+            _profiler_lock.release()
+            return None
+        return profiler
+
+    def _start_trace(self, request):
+        if settings.TRACE_REQUESTS or (
+            settings.REQUEST_TRACING and request.headers.get("X-Trace") == "1"
+        ):
+            return collect_trace()
+        return nullcontext()
+
+    def _finish(self, request, response, metrics, profiler, trace):
+        total = metrics.elapsed
+        app = max(total - metrics.query_time - metrics.serializer_time, 0.0)
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={metrics.query_time * 1000:.2f};desc="{metrics.query_count} queries"',
+                f"serialize;dur={metrics.serializer_time * 1000:.2f}",
+                f"app;dur={app * 1000:.2f}",
+                f"total;dur={total * 1000:.2f}",
+            ]
+        )
+
+        labels = {"view": metrics.view or "unresolved", "action": metrics.action or ""}
+        REQUEST_LATENCY.observe(total, **labels)
+        REQUEST_QUERIES.observe(metrics.query_count, **labels)
+        REGISTRY.flush()
+
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "view": metrics.view,
+                    "action": metrics.action,
+                    "queries": metrics.query_count,
+                    "db_ms": round(metrics.query_time * 1000, 2),
+                    "serialize_ms": round(metrics.serializer_time * 1000, 2),
+                    "total_ms": round(total * 1000, 2),
+                }
+            )
+        )
+
+        # DRF copies the authenticated user back onto the Django request,
+        # so token-authenticated staff are recognised here as well.
+        user = getattr(request, "user", None)
+        if profiler is not None and getattr(user, "is_staff", False):
+            response["X-Profile-Id"] = self._dump_profile(profiler, metrics)
+        if trace is not None and (settings.TRACE_REQUESTS or getattr(user, "is_staff", False)):
+            response["X-Trace-Id"] = self._dump_trace(request, response, trace, metrics)
+
+    def _dump_name(self, metrics, extension):
+        return "{}-{}-{}.{}".format(
+            time.strftime("%Y%m%dT%H%M%S"),
+            metrics.view or "unknown",
+            uuid.uuid4().hex[:8],
+            extension,
+        )
+
+    def _dump_profile(self, profiler, metrics):
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        name = self._dump_name(metrics, "prof")
+        profiler.dump_stats(os.path.join(settings.PROFILE_DIR, name))
+        return name
+
+    def _dump_trace(self, request, response, trace, metrics):
+        trace.add(
+            f"{request.method} {request.path}",
+            "request",
+            trace.started,
+            time.perf_counter_ns(),
+            {"view": metrics.view, "action": metrics.action, "status": response.status_code},
+        )
+        return write_trace(trace, self._dump_name(metrics, "json"))
+
+
+class NPlusOneMiddleware:
+    """
+    Development aid flagging N+1 query patterns.
+
+    Any query shape repeated more than ``NPLUSONE_THRESHOLD`` times within
+    one request is logged to the ``core.nplusone`` logger together with the
+    serializer field and code location that issued it, and counted in the
+    ``X-NPlusOne-Queries`` response header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with detect_nplusone() as tracker:
+            response = self.get_response(request)
+        self._report(request, response, tracker)
+        return response
+
+    async def __acall__(self, request):
+        with detect_nplusone() as tracker:
+            response = await self.get_response(request)
+        self._report(request, response, tracker)
+        return response
+
+    def _report(self, request, response, tracker):
+        findings = tracker.repeated(settings.NPLUSONE_THRESHOLD)
+        if not findings:
+            return
+
+        response["X-NPlusOne-Queries"] = str(len(findings))
+        nplusone_logger.warning(
+            "Repeated queries in %s %s:\n%s",
+            request.method,
+            request.path,
+            format_findings(findings),
+        )
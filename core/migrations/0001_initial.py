@@ -0,0 +1,42 @@
+# Generated by Django 5.1.7 on 2026-10-19 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="created at")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="updated at")),
+                (
+                    "fingerprint",
+                    models.CharField(max_length=40, unique=True, verbose_name="fingerprint"),
+                ),
+                ("sql", models.TextField(verbose_name="SQL")),
+                ("view", models.CharField(blank=True, max_length=255, verbose_name="view")),
+                ("action", models.CharField(blank=True, max_length=100, verbose_name="action")),
+                ("calls", models.PositiveIntegerField(default=0, verbose_name="calls")),
+                ("total_time", models.FloatField(default=0, verbose_name="total time (ms)")),
+                ("max_time", models.FloatField(default=0, verbose_name="max time (ms)")),
+                ("plan", models.TextField(blank=True, verbose_name="plan")),
+            ],
+            options={
+                "verbose_name": "slow query",
+                "verbose_name_plural": "slow queries",
+                "ordering": ["-total_time"],
+            },
+        ),
+    ]
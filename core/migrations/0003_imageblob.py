@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_idempotencykey"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True, verbose_name="name")),
+                ("references", models.IntegerField(default=0, verbose_name="references")),
+            ],
+            options={
+                "verbose_name": "image blob",
+                "verbose_name_plural": "image blobs",
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_imageblob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="idempotencykey",
+            name="headers",
+            field=models.JSONField(default=dict, verbose_name="response headers"),
+        ),
+    ]
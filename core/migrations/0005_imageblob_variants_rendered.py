@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_idempotencykey_headers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="imageblob",
+            name="variants_rendered",
+            field=models.BooleanField(null=True, verbose_name="variants rendered"),
+        ),
+    ]
@@ -1,5 +1,7 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
+from rest_framework.utils.encoders import JSONEncoder
 
 
 class TimeStampedModel(models.Model):
@@ -8,3 +10,143 @@ class TimeStampedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class SlowQuery(TimeStampedModel):
+    fingerprint = models.CharField(_("fingerprint"), max_length=40, unique=True)
+    sql = models.TextField(_("SQL"))
+    view = models.CharField(_("view"), max_length=255, blank=True)
+    action = models.CharField(_("action"), max_length=100, blank=True)
+    calls = models.PositiveIntegerField(_("calls"), default=0)
+    total_time = models.FloatField(_("total time (ms)"), default=0)
+    max_time = models.FloatField(_("max time (ms)"), default=0)
+    plan = models.TextField(_("plan"), blank=True)
+
+    class Meta:
+        verbose_name = _("slow query")
+        verbose_name_plural = _("slow queries")
+        ordering = ["-total_time"]
+
+    def __str__(self):
+        return self.sql[:80]
+
+
+class IdempotencyKey(models.Model):
+    """
+    Response of a POST made with an ``Idempotency-Key`` header, replayed when
+    the client retries with the same key. ``status_code`` is null while the
+    first request is still running.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    key = models.CharField(_("key"), max_length=255)
+    fingerprint = models.CharField(_("request fingerprint"), max_length=64)
+    status_code = models.PositiveSmallIntegerField(_("status code"), null=True)
+    response = models.JSONField(_("response"), null=True, encoder=JSONEncoder)
+    headers = models.JSONField(_("response headers"), default=dict)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = _("idempotency key")
+        verbose_name_plural = _("idempotency keys")
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="core_idempotency_user_key")
+        ]
+
+    def __str__(self):
+        return self.key
+
+
+class ImageBlob(models.Model):
+    """
+    An image file in :class:`core.images.ContentAddressedStorage`, stored once
+    however many rows reference its content. Blobs nobody references any
+    more are deleted by :func:`core.images.collect_image`.
+    ``variants_rendered`` is null until the variants job has run and false
+    when the file could not be rendered.
+    """
+
+    name = models.CharField(_("name"), max_length=255, unique=True)
+    references = models.IntegerField(_("references"), default=0)
+    variants_rendered = models.BooleanField(_("variants rendered"), null=True)
+
+    class Meta:
+        verbose_name = _("image blob")
+        verbose_name_plural = _("image blobs")
+
+    def __str__(self):
+        return self.name
+
+
+class StaleObjectError(Exception):
+    """Raised when a versioned row changed since the instance was loaded."""
+
+
+class VersionedModel(models.Model):
+    """
+    Optimistic concurrency for rows edited from several clients.
+
+    Every save and delete of a loaded instance only applies while the row
+    still has the instance's ``version``, checked in the ``UPDATE`` itself
+    rather than with a row lock, and bumps it; otherwise
+    :class:`StaleObjectError` is raised. Saves without ``update_fields``
+    leave out the ``derived_fields`` the application maintains itself, so
+    they never overwrite a concurrent recompute.
+    """
+
+    version = models.PositiveIntegerField(_("version"), default=1, editable=False)
+
+    derived_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self._state.adding or kwargs.get("force_insert"):
+            return super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.derived_fields
+                and field.attname not in deferred
+            ]
+        kwargs["update_fields"] = {*update_fields, "version"}
+
+        expected = self.version
+        self.version = expected + 1
+        self._expected_version = expected
+        try:
+            return super().save(*args, **kwargs)
+        except Exception:
+            self.version = expected
+            raise
+        finally:
+            del self._expected_version
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            claimed = type(self)._base_manager.filter(pk=self.pk, version=self.version).update(
+                version=models.F("version") + 1
+            )
+            if not claimed:
+                raise StaleObjectError(self)
+            return super().delete(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = getattr(self, "_expected_version", None)
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+        updated = super()._do_update(
+            base_qs.filter(version=expected), using, pk_val, values, update_fields, forced_update
+        )
+        if not updated and base_qs.filter(pk=pk_val).exists():
+            raise StaleObjectError(self)
+        return updated
@@ -0,0 +1,112 @@
+import contextvars
+import os
+import sys
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework.serializers import Serializer
+
+from .sql import normalize_sql
+
+_tracker = contextvars.ContextVar("core_nplusone_tracker", default=None)
+
+_CORE_DIR = os.path.dirname(__file__)
+_IGNORED_PATHS = (
+    os.path.join(_CORE_DIR, "instrumentation.py"),
+    os.path.join(_CORE_DIR, "middleware.py"),
+    os.path.join(_CORE_DIR, "nplusone.py"),
+    os.path.join(_CORE_DIR, "slow_queries.py"),
+    os.path.join(_CORE_DIR, "tracing.py"),
+    os.sep + "site-packages" + os.sep,
+    os.sep + "dist-packages" + os.sep,
+    os.sep + "lib" + os.sep + "python",
+)
+
+
+def _origin():
+    """
+    Find the serializer field and the first project frame behind a query.
+    """
+    field = None
+    location = None
+    frame = sys._getframe(2)
+
+    while frame is not None and (field is None or location is None):
+        code = frame.f_code
+
+        if field is None and code.co_name == "to_representation":
+            owner = frame.f_locals.get("self")
+            current = frame.f_locals.get("field")
+            if isinstance(owner, Serializer) and current is not None:
+                field = f"{type(owner).__name__}.{current.field_name}"
+
+        if location is None and not any(part in code.co_filename for part in _IGNORED_PATHS):
+            filename = os.path.relpath(code.co_filename, settings.BASE_DIR)
+            location = f"{filename}:{frame.f_lineno} in {code.co_name}"
+
+        frame = frame.f_back
+
+    return field, location
+
+
+class QueryTracker:
+    """
+    Group the queries of one request by shape and remember where they came from.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.origins = defaultdict(Counter)
+
+    def record(self, sql):
+        shape = normalize_sql(sql)
+        self.counts[shape] += 1
+        self.origins[shape][_origin()] += 1
+
+    def repeated(self, threshold):
+        findings = []
+        for shape, count in self.counts.most_common():
+            if count <= threshold:
+                break
+            (field, location), _hits = self.origins[shape].most_common(1)[0]
+            findings.append(
+                {"sql": shape, "count": count, "field": field, "location": location}
+            )
+        return findings
+
+
+def track_query(execute, sql, params, many, context):
+    tracker = _tracker.get()
+    if tracker is not None:
+        tracker.record(sql)
+    return execute(sql, params, many, context)
+
+
+def start_tracking():
+    tracker = QueryTracker()
+    return tracker, _tracker.set(tracker)
+
+
+def stop_tracking(token):
+    _tracker.reset(token)
+
+
+@contextmanager
+def detect_nplusone():
+    tracker, token = start_tracking()
+    try:
+        yield tracker
+    finally:
+        stop_tracking(token)
+
+
+def format_findings(findings):
+    lines = []
+    for finding in findings:
+        lines.append(f"{finding['count']}x {finding['sql']}")
+        if finding["field"]:
+            lines.append(f"    serializer field: {finding['field']}")
+        if finding["location"]:
+            lines.append(f"    triggered at: {finding['location']}")
+    return "\n".join(lines)
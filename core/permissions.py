@@ -1,6 +1,9 @@
 from rest_framework import permissions
 
+from .tracing import traced_permission
 
+
+@traced_permission
 class IsOwner(permissions.BasePermission):
     
     def has_object_permission(self, request, view, obj):
@@ -22,6 +25,7 @@ class IsOwner(permissions.BasePermission):
         return False
 
 
+@traced_permission
 class IsOwnerOrReadOnly(permissions.BasePermission):
     
     def has_object_permission(self, request, view, obj):
@@ -43,6 +47,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         return False
 
 
+@traced_permission
 class IsOwnerOrPublic(permissions.BasePermission):
     
     def has_object_permission(self, request, view, obj):
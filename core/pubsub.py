@@ -0,0 +1,176 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+import psycopg2
+from django.conf import settings
+from django.db import connection
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger("core.pubsub")
+
+# The single PostgreSQL channel all messages travel on; the broker channel
+# is part of the payload, so subscribing needs no extra LISTEN.
+NOTIFY_CHANNEL = "backpack_events"
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more.
+NOTIFY_MAX_PAYLOAD = 7999
+
+
+class Subscription:
+    """
+    Bounded queue of messages for one asyncio consumer.
+
+    Messages may be delivered from any thread. When the consumer falls too
+    far behind, further messages are dropped and ``overflowed`` is set, so
+    it can tell its client to reload instead of applying a partial stream.
+    """
+
+    def __init__(self, maxsize=100):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def put(self, message):
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def reset(self):
+        self.overflowed = False
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class Broker:
+    """
+    Publish/subscribe between the code handling writes and long-lived
+    consumers such as event streams and local caches.
+
+    With ``PUBSUB_BACKEND = "local"`` messages only reach subscribers of
+    this process. With ``"postgres"`` they are sent with ``NOTIFY`` and a
+    listener thread in every process delivers them to its subscribers, so
+    all workers see every message without an external broker. Since
+    ``NOTIFY`` is transactional, callers publish from
+    ``transaction.on_commit`` either way.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(list)
+        self._lock = threading.Lock()
+        self._listener = None
+        self._stopping = threading.Event()
+
+    def subscribe(self, channel, callback):
+        """
+        Call ``callback(message)`` for every message on ``channel``; returns
+        a function that removes the subscription.
+        """
+        with self._lock:
+            self._subscribers[channel].append(callback)
+        if settings.PUBSUB_BACKEND == "postgres":
+            self._start_listener()
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(channel, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    self._subscribers.pop(channel, None)
+
+        return unsubscribe
+
+    @asynccontextmanager
+    async def listen(self, channel, maxsize=100):
+        subscription = Subscription(maxsize)
+        unsubscribe = self.subscribe(channel, subscription.put)
+        try:
+            yield subscription
+        finally:
+            unsubscribe()
+
+    def publish(self, channel, message):
+        if settings.PUBSUB_BACKEND == "postgres":
+            self._notify(channel, message)
+        else:
+            self.deliver(channel, message)
+
+    def deliver(self, channel, message):
+        with self._lock:
+            callbacks = list(self._subscribers.get(channel, ()))
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception:
+                logger.exception("Subscriber of %s failed", channel)
+
+    def _notify(self, channel, message):
+        payload = json.dumps({"channel": channel, "message": message}, cls=JSONEncoder)
+        if len(payload.encode()) > NOTIFY_MAX_PAYLOAD:
+            logger.warning("Dropped a %d byte message on %s", len(payload), channel)
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, payload])
+
+    def close(self):
+        """Stop the listener thread, if one is running."""
+        self._stopping.set()
+        if self._listener is not None:
+            self._listener.join()
+            self._listener = None
+        self._stopping.clear()
+
+    def _start_listener(self):
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name="pubsub-listener", daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self):
+        params = connection.get_connection_params()
+        while not self._stopping.is_set():
+            try:
+                self._listen_once(params)
+            except psycopg2.Error:
+                logger.exception("Lost the %s listener connection", NOTIFY_CHANNEL)
+                # Messages sent while reconnecting are lost; consumers that
+                # cannot afford that resynchronise on their own.
+                self._stopping.wait(settings.PUBSUB_RECONNECT_DELAY)
+
+    def _listen_once(self, params):
+        listener = psycopg2.connect(**params)
+        try:
+            listener.autocommit = True
+            with listener.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            while not self._stopping.is_set():
+                if select.select([listener], [], [], 1) == ([], [], []):
+                    continue
+                listener.poll()
+                while listener.notifies:
+                    notify = listener.notifies.pop(0)
+                    try:
+                        data = json.loads(notify.payload)
+                    except ValueError:
+                        logger.warning("Ignored a malformed %s payload", NOTIFY_CHANNEL)
+                        continue
+                    self.deliver(data["channel"], data["message"])
+        finally:
+            listener.close()
+
+
+broker = Broker()
@@ -0,0 +1,76 @@
+"""
+Pytest plugin failing tests whose requests repeat the same query too often.
+
+Every request made through the Django test client is tracked; when one
+query shape runs more than ``nplusone_budget`` times within a single
+request, the test fails with the offending serializer field and code
+location. Override per test with ``@pytest.mark.nplusone(budget=10)`` or
+switch the check off with ``@pytest.mark.nplusone(budget=None)``.
+"""
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addini(
+        "nplusone_budget",
+        "Identical queries allowed per request before a test fails.",
+        default="3",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "nplusone(budget): override the per-request repeated query budget; None disables it.",
+    )
+
+
+def _budget(item):
+    budget = int(item.config.getini("nplusone_budget"))
+    marker = item.get_closest_marker("nplusone")
+    if marker is not None:
+        budget = marker.kwargs.get("budget", marker.args[0] if marker.args else budget)
+    return budget
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    budget = _budget(item)
+    if budget is None:
+        return (yield)
+
+    from django.core.signals import request_finished, request_started
+
+    from core.nplusone import format_findings, start_tracking, stop_tracking
+
+    active = []
+    findings = []
+
+    def started(**kwargs):
+        active.append(start_tracking())
+
+    def finished(**kwargs):
+        if not active:
+            return
+        tracker, token = active.pop()
+        try:
+            stop_tracking(token)
+        except ValueError:
+            pass
+        findings.extend(tracker.repeated(budget))
+
+    request_started.connect(started, dispatch_uid="core.pytest_plugin.started")
+    request_finished.connect(finished, dispatch_uid="core.pytest_plugin.finished")
+    try:
+        result = yield
+    finally:
+        request_started.disconnect(dispatch_uid="core.pytest_plugin.started")
+        request_finished.disconnect(dispatch_uid="core.pytest_plugin.finished")
+
+    if findings:
+        pytest.fail(
+            f"Repeated queries over the budget of {budget} per request:\n"
+            + format_findings(findings),
+            pytrace=False,
+        )
+    return result
@@ -0,0 +1,58 @@
+import datetime
+import decimal
+import uuid
+
+import cbor2
+import msgpack
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_json_encoder = JSONEncoder()
+
+# Types the binary formats could encode natively (CBOR has tags for most of
+# them) but which are converted exactly like JSONRenderer does instead, so a
+# client sees the same values whichever format it negotiates: decimals as
+# numbers, UUIDs such as ``share_code`` and dates as strings.
+CONVERTED_TYPES = (
+    decimal.Decimal,
+    uuid.UUID,
+    datetime.datetime,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+)
+
+
+def encode_value(value):
+    return _json_encoder.default(value)
+
+
+def _cbor_encode(encoder, value):
+    encoder.encode(encode_value(value))
+
+
+_CBOR_ENCODERS = {cls: _cbor_encode for cls in CONVERTED_TYPES}
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_value, use_bin_type=True)
+
+
+class CBORRenderer(BaseRenderer):
+    media_type = "application/cbor"
+    format = "cbor"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return cbor2.dumps(data, encoders=_CBOR_ENCODERS, default=_cbor_encode)
@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from .images import variant_urls
+from .models import SlowQuery
+from .sparse import SparseFieldsMixin
+
+
+class ImageVariantsField(serializers.Field):
+    """URLs of the resized variants of an image field, by variant name."""
+    
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, value):
+        return variant_urls(getattr(value, 'name', value), self.context.get('request'))
+
+
+class SlowQuerySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    avg_time = serializers.SerializerMethodField()
+    column_dependencies = {'avg_time': ['total_time', 'calls']}
+    
+    class Meta:
+        model = SlowQuery
+        fields = [
+            'id', 'fingerprint', 'sql', 'view', 'action', 'calls', 'total_time',
+            'avg_time', 'max_time', 'plan', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+    
+    def get_avg_time(self, obj):
+        return round(obj.total_time / obj.calls, 2) if obj.calls else 0
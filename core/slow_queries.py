@@ -0,0 +1,146 @@
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .instrumentation import current_metrics
+from .sql import fingerprint_sql
+
+logger = logging.getLogger("core.slow_queries")
+
+# ANALYZE would take the row locks these clauses ask for, so their plans are estimated only.
+LOCKING_CLAUSE = re.compile(r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.I)
+
+_capturing = threading.local()
+_lock = threading.Lock()
+_executor = None
+_pending = 0
+
+
+def _get_executor():
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+    return _executor
+
+
+def submit_capture(alias, sql, params, duration_ms, view, action):
+    """
+    Queue plan capture on the background thread, dropping work when more
+    than ``SLOW_QUERY_MAX_PENDING`` captures are already waiting.
+    """
+    global _pending
+
+    with _lock:
+        if _pending >= settings.SLOW_QUERY_MAX_PENDING:
+            return False
+        _pending += 1
+
+    def run():
+        global _pending
+
+        try:
+            capture_slow_query(alias, sql, params, duration_ms, view, action)
+        finally:
+            with _lock:
+                _pending -= 1
+            close_old_connections()
+
+    _get_executor().submit(run)
+    return True
+
+
+def explain(alias, sql, params):
+    connection = connections[alias]
+    if connection.vendor != "postgresql" or not sql.lstrip().upper().startswith("SELECT"):
+        # ANALYZE executes the statement, so only read queries are replayed.
+        return ""
+
+    options = "" if LOCKING_CLAUSE.search(sql) else "(ANALYZE, BUFFERS) "
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN {options}{sql}", params)
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+def capture_slow_query(alias, sql, params, duration_ms, view, action):
+    from .models import SlowQuery
+
+    _capturing.active = True
+    try:
+        plan = ""
+        if settings.SLOW_QUERY_EXPLAIN:
+            try:
+                plan = explain(alias, sql, params)
+            except Exception:
+                logger.exception("Could not capture plan for slow query")
+
+        fingerprint = fingerprint_sql(sql)
+        slow_query, created = SlowQuery.objects.get_or_create(
+            fingerprint=fingerprint,
+            defaults={
+                "sql": sql,
+                "view": view or "",
+                "action": action or "",
+                "calls": 1,
+                "total_time": duration_ms,
+                "max_time": duration_ms,
+                "plan": plan,
+            },
+        )
+        if not created:
+            updates = {
+                "calls": F("calls") + 1,
+                "total_time": F("total_time") + duration_ms,
+                "max_time": Greatest("max_time", duration_ms),
+                "view": view or slow_query.view,
+                "action": action or slow_query.action,
+            }
+            if plan:
+                updates["plan"] = plan
+            SlowQuery.objects.filter(pk=slow_query.pk).update(**updates)
+
+        if plan:
+            logger.info(json.dumps({"fingerprint": fingerprint, "plan": plan}))
+    finally:
+        _capturing.active = False
+
+
+def record_slow_query(execute, sql, params, many, context):
+    metrics = current_metrics()
+    if metrics is None or getattr(_capturing, "active", False):
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold is not None and duration_ms >= threshold and not many:
+            logger.warning(
+                json.dumps(
+                    {
+                        "sql": sql,
+                        "duration_ms": round(duration_ms, 2),
+                        "view": metrics.view,
+                        "action": metrics.action,
+                    }
+                )
+            )
+            submit_capture(
+                context["connection"].alias,
+                sql,
+                params,
+                duration_ms,
+                metrics.view,
+                metrics.action,
+            )
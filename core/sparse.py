@@ -0,0 +1,228 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import permissions, serializers
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+_declared_fields = {}
+
+
+def declared_fields(serializer_class):
+    # Building ``serializer.fields`` is the expensive part of a DRF
+    # serializer, so it is done once per class and reused for every request.
+    fields = _declared_fields.get(serializer_class)
+    if fields is None:
+        fields = _declared_fields[serializer_class] = serializer_class().fields
+    return fields
+
+
+def join_path(path, name):
+    return f"{path}.{name}" if path else name
+
+
+def _split(values):
+    return [part.strip() for value in values for part in value.split(",") if part.strip()]
+
+
+class FieldSelection:
+    """
+    Fields requested with ``?fields=`` and ``?expand=``.
+
+    ``fields`` is a comma separated list of field names, dotted for nested
+    serializers (``item_details.name``); a nested name without children
+    keeps the whole nested object. ``expand`` names the nested serializers to
+    render: once it is given, nested serializers that are neither expanded
+    nor named in ``fields`` are left out. Without either parameter the
+    selection is ``None`` and responses are unchanged.
+    """
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = None
+        if fields:
+            self.fields = {}
+            for path in fields:
+                node = self.fields
+                for part in path.split("."):
+                    node = node.setdefault(part, {})
+
+        self.expand = None
+        if expand is not None:
+            self.expand = set()
+            for path in expand:
+                parts = path.split(".")
+                for index in range(1, len(parts) + 1):
+                    self.expand.add(".".join(parts[:index]))
+
+    @classmethod
+    def from_request(cls, request):
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return None
+
+        params = request.query_params
+        fields = _split(params.getlist(FIELDS_PARAM))
+        expand = _split(params.getlist(EXPAND_PARAM)) if EXPAND_PARAM in params else None
+        if not fields and expand is None:
+            return None
+        return cls(fields, expand)
+
+    def _subtree(self, path):
+        # ``None`` means every field at ``path`` is selected.
+        node = self.fields
+        for part in path.split(".") if path else ():
+            if not node:
+                return None
+            node = node.get(part)
+        return node or None
+
+    def includes(self, path, name, nested=False):
+        node = self._subtree(path)
+        if node is not None and name not in node:
+            return False
+        if nested and self.expand is not None:
+            return join_path(path, name) in self.expand or node is not None
+        return True
+
+
+class SparseFieldsMixin:
+    """
+    Drop the fields left out by the request's :class:`FieldSelection`.
+
+    ``column_dependencies`` lists the model lookups a method field reads, so
+    that :func:`sparse_queryset` can defer everything else. Method fields
+    missing from it keep the queryset unrestricted.
+    """
+
+    column_dependencies = {}
+
+    @property
+    def field_path(self):
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return ".".join(reversed(names))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.context.get("field_selection")
+        if selection is None:
+            return fields
+
+        path = self.field_path
+        return {
+            name: field
+            for name, field in fields.items()
+            if selection.includes(path, name, isinstance(field, serializers.BaseSerializer))
+        }
+
+
+def _selected_columns(serializer_class, selection, path="", prefix=""):
+    """
+    Return ``(lookups, relations)`` needed to render the selected fields of
+    ``serializer_class``, or ``None`` when a field cannot be resolved.
+    """
+    model = serializer_class.Meta.model
+    dependencies = getattr(serializer_class, "column_dependencies", {})
+    lookups = []
+    relations = set()
+
+    for name, field in declared_fields(serializer_class).items():
+        if field.write_only:
+            continue
+        nested = isinstance(field, serializers.BaseSerializer)
+        if not selection.includes(path, name, nested):
+            continue
+
+        if name in dependencies:
+            lookups.extend(prefix + lookup for lookup in dependencies[name])
+        elif isinstance(field, serializers.ListSerializer):
+            # Reverse relations are loaded by their own query either way.
+            continue
+        elif isinstance(field, serializers.ModelSerializer) and "." not in field.source:
+            resolved = _selected_columns(
+                type(field), selection, join_path(path, name), prefix + field.source + "__"
+            )
+            if resolved is None:
+                return None
+            lookups.extend(resolved[0])
+            relations.update(resolved[1])
+            relations.add(prefix + field.source)
+        elif nested or isinstance(field, serializers.SerializerMethodField) or field.source == "*":
+            return None
+        elif "." in field.source:
+            lookups.append(prefix + field.source.replace(".", "__"))
+        else:
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if getattr(model_field, "column", None) is not None:
+                lookups.append(prefix + field.source)
+
+    for lookup in lookups:
+        if "__" in lookup:
+            relations.add(lookup.rsplit("__", 1)[0])
+    return lookups, relations
+
+
+def sparse_queryset(queryset, serializer_class, selection, required=()):
+    """
+    Restrict ``queryset`` to the columns and joins the selected fields of
+    ``serializer_class`` read, with ``only()`` and ``select_related()``.
+    """
+    if selection is None or not issubclass(serializer_class, SparseFieldsMixin):
+        return queryset
+
+    resolved = _selected_columns(serializer_class, selection)
+    if resolved is None:
+        return queryset
+
+    lookups, relations = resolved
+    for lookup in required:
+        if lookup not in lookups:
+            lookups.append(lookup)
+    queryset = queryset.select_related(None).only(*lookups)
+    # Nested relations are implied by their deepest lookup.
+    deepest = [
+        relation
+        for relation in relations
+        if not any(other.startswith(relation + "__") for other in relations)
+    ]
+    if deepest:
+        queryset = queryset.select_related(*sorted(deepest))
+    return queryset
+
+
+class SparseFieldsViewMixin:
+    """
+    Support ``?fields=`` and ``?expand=`` on safe requests: the selection is
+    passed to serializers through the context and the queryset only loads
+    the columns and joins those fields need. ``required_columns`` lists
+    lookups the view itself reads, e.g. in object permissions.
+    """
+
+    required_columns = []
+
+    def get_field_selection(self):
+        if not hasattr(self, "_field_selection"):
+            self._field_selection = FieldSelection.from_request(self.request)
+        return self._field_selection
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["field_selection"] = self.get_field_selection()
+        return context
+
+    def sparse_queryset(self, queryset, serializer_class=None):
+        return sparse_queryset(
+            queryset,
+            serializer_class or self.get_serializer_class(),
+            self.get_field_selection(),
+            self.required_columns,
+        )
+
+    def filter_queryset(self, queryset):
+        return self.sparse_queryset(super().filter_queryset(queryset))
@@ -0,0 +1,27 @@
+import logging
+
+from PIL import Image, UnidentifiedImageError
+
+from jobs.registry import task
+from .images import generate_variants, missing_variants, record_render
+
+logger = logging.getLogger("core.images")
+
+
+@task("core.generate_image_variants")
+def generate_image_variants(job, name, force=False):
+    try:
+        written = generate_variants(name, None if force else missing_variants(name))
+    except FileNotFoundError:
+        # Collected since the job was queued.
+        return {"variants": []}
+    except UnidentifiedImageError:
+        logger.warning("%s is not an image Pillow can read", name)
+        record_render(name, False)
+        return {"variants": []}
+    except Image.DecompressionBombError:
+        logger.warning("%s has too many pixels to render", name)
+        record_render(name, False)
+        return {"variants": []}
+    record_render(name, True)
+    return {"variants": written}
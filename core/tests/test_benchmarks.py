@@ -0,0 +1,101 @@
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from core.benchmarks import ENDPOINTS, compare
+from core.datagen import BENCHMARK_USER_PREFIX
+from gear_items.models import Item
+from gear_lists.models import GearList, ListItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def dataset():
+    call_command(
+        "generate_benchmark_data",
+        users=2,
+        items_per_user=60,
+        categories_per_user=4,
+        lists_per_user=3,
+        min_list_items=5,
+        max_list_items=20,
+        public_ratio=1,
+        stdout=StringIO(),
+    )
+
+
+@pytest.mark.django_db
+class TestBenchmarkData:
+
+    def test_generates_dataset(self, dataset):
+        users = User.objects.filter(username__startswith=BENCHMARK_USER_PREFIX)
+        assert users.count() == 2
+        assert Item.objects.filter(owner__in=users).count() == 120
+        assert GearList.objects.filter(owner__in=users, is_public=True).count() == 6
+
+        for gear_list in GearList.objects.filter(owner__in=users):
+            assert 5 <= gear_list.list_items.count() <= 20
+            stored = gear_list.total_weight
+            assert float(stored) == pytest.approx(gear_list.calculate_total_weight(), abs=0.01)
+
+    def test_flush_replaces_dataset(self, dataset):
+        call_command(
+            "generate_benchmark_data",
+            users=1,
+            items_per_user=10,
+            lists_per_user=1,
+            min_list_items=5,
+            max_list_items=5,
+            flush=True,
+            stdout=StringIO(),
+        )
+
+        assert User.objects.filter(username__startswith=BENCHMARK_USER_PREFIX).count() == 1
+        assert ListItem.objects.count() == 5
+
+
+@pytest.mark.django_db
+@pytest.mark.nplusone(budget=None)
+def test_run_benchmarks_writes_json(dataset, tmp_path):
+    output = tmp_path / "result.json"
+    list_items_before = ListItem.objects.count()
+
+    call_command(
+        "run_benchmarks", iterations=2, warmup=0, output=str(output), stdout=StringIO()
+    )
+
+    report = json.loads(output.read_text())
+    assert set(report["results"]) == {endpoint.name for endpoint in ENDPOINTS}
+    detail = report["results"]["lists.retrieve"]
+    assert detail["status"] == [200]
+    assert detail["queries"] > 0
+    assert detail["latency_ms"]["p50"] <= detail["latency_ms"]["max"]
+    assert report["meta"]["iterations"] == 2
+    assert ListItem.objects.count() == list_items_before
+
+    rows = compare(report, report)
+    assert rows and all(row["p50"] == 0 and row["queries"] == 0 for row in rows)
+
+
+@pytest.mark.django_db
+@pytest.mark.nplusone(budget=None)
+def test_compare_with_zero_baseline(dataset, tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({
+        "meta": {"commit": "abc"},
+        "results": {"lists.retrieve": {"queries": 0, "latency_ms": {"p50": 0, "p95": 0}}},
+    }))
+    out = StringIO()
+
+    call_command(
+        "run_benchmarks", iterations=1, warmup=0, only=["lists.retrieve"],
+        output=str(tmp_path / "result.json"), compare=str(baseline), stdout=out,
+    )
+
+    line = out.getvalue().splitlines()[-1]
+    assert line.startswith("lists.retrieve")
+    assert "p50      n/a  p95      n/a" in line
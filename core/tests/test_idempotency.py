@@ -0,0 +1,149 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import IdempotencyKey
+from gear_items.models import Item
+from gear_lists.models import GearList, ListItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def test_gear_list(test_user):
+    gear_list = GearList.objects.create(name="Weekend", owner=test_user)
+    item = Item.objects.create(name="Tent", weight=1000, owner=test_user)
+    ListItem.objects.create(gear_list=gear_list, item=item)
+    return gear_list
+
+
+def copy(client, gear_list, key, name="Copy"):
+    return client.post(
+        reverse("gear_lists:gear_list-copy", kwargs={"pk": gear_list.id}),
+        {"name": name},
+        format="json",
+        HTTP_IDEMPOTENCY_KEY=key,
+    )
+
+
+@pytest.mark.django_db
+class TestIdempotencyKey:
+
+    def test_retry_replays_response(self, authenticated_client, test_gear_list):
+        first = copy(authenticated_client, test_gear_list, "key-1")
+        retry = copy(authenticated_client, test_gear_list, "key-1")
+
+        assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+        assert retry.json() == first.json()
+        assert retry["Idempotent-Replayed"] == "true"
+        assert GearList.objects.filter(name="Copy").count() == 1
+
+    def test_replay_restores_location(self, authenticated_client, test_gear_list):
+        url = reverse("gear_lists:gear_list-copy", kwargs={"pk": test_gear_list.id})
+        data = {"name": "Copy", "background": True}
+
+        first = authenticated_client.post(url, data, format="json", HTTP_IDEMPOTENCY_KEY="key-1")
+        retry = authenticated_client.post(url, data, format="json", HTTP_IDEMPOTENCY_KEY="key-1")
+
+        assert first.status_code == retry.status_code == status.HTTP_202_ACCEPTED
+        assert retry["Location"] == first["Location"]
+        assert retry["Idempotent-Replayed"] == "true"
+
+    def test_new_key_runs_again(self, authenticated_client, test_gear_list):
+        copy(authenticated_client, test_gear_list, "key-1")
+        copy(authenticated_client, test_gear_list, "key-2")
+
+        assert GearList.objects.filter(name="Copy").count() == 2
+
+    def test_without_key(self, authenticated_client, test_gear_list):
+        copy(authenticated_client, test_gear_list, "")
+        copy(authenticated_client, test_gear_list, "")
+
+        assert GearList.objects.filter(name="Copy").count() == 2
+        assert not IdempotencyKey.objects.exists()
+
+    def test_key_reused_for_another_request(self, authenticated_client, test_gear_list):
+        copy(authenticated_client, test_gear_list, "key-1")
+
+        response = copy(authenticated_client, test_gear_list, "key-1", name="Other")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_request_in_progress(self, authenticated_client, test_user, test_gear_list):
+        first = copy(authenticated_client, test_gear_list, "key-1")
+        IdempotencyKey.objects.filter(key="key-1").update(status_code=None, response=None)
+
+        response = copy(authenticated_client, test_gear_list, "key-1")
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_expired_key_runs_again(self, authenticated_client, test_gear_list, settings):
+        copy(authenticated_client, test_gear_list, "key-1")
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL + 1)
+        )
+
+        response = copy(authenticated_client, test_gear_list, "key-1")
+
+        assert "Idempotent-Replayed" not in response
+        assert GearList.objects.filter(name="Copy").count() == 2
+
+    def test_errors_are_not_stored(self, authenticated_client, test_gear_list):
+        response = authenticated_client.post(
+            reverse("gear_lists:gear_list-copy", kwargs={"pk": 0}),
+            {"name": "Copy"},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="key-1",
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not IdempotencyKey.objects.exists()
+
+    def test_keys_are_per_user(self, authenticated_client, test_gear_list):
+        other = User.objects.create_user(username="other", password="otherpassword123")
+        other_client = APIClient()
+        other_client.force_authenticate(user=other)
+        item = Item.objects.create(name="Stove", weight=80, owner=other)
+        url = reverse("gear_items:item-duplicate", kwargs={"pk": item.id})
+
+        copy(authenticated_client, test_gear_list, "key-1")
+        response = other_client.post(url, HTTP_IDEMPOTENCY_KEY="key-1")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == "Stove (Copy)"
+
+    def test_clear_command(self, authenticated_client, test_gear_list, settings):
+        copy(authenticated_client, test_gear_list, "key-1")
+        copy(authenticated_client, test_gear_list, "key-2")
+        IdempotencyKey.objects.filter(key="key-1").update(
+            created_at=timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL + 1)
+        )
+
+        call_command("clear_idempotency_keys", stdout=StringIO())
+
+        assert list(IdempotencyKey.objects.values_list("key", flat=True)) == ["key-2"]
@@ -0,0 +1,314 @@
+import hashlib
+import os
+from io import BytesIO, StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.images import blob_name, collect_image, image_storage, variant_name
+from core.models import ImageBlob
+from gear_items.models import Item
+from jobs.models import SUCCEEDED, Job
+from jobs.worker import Worker
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.IMAGE_COLLECT_GRACE = 0
+    cache.clear()
+    return tmp_path
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+def make_item(owner, content=b"tent photo", filename="tent.JPG", **kwargs):
+    item = Item(name="Tent", weight=1000, owner=owner, **kwargs)
+    item.image.save(filename, ContentFile(content), save=False)
+    item.save()
+    return item
+
+
+def references(name):
+    return ImageBlob.objects.get(name=name).references
+
+
+def stored_files(root):
+    return sorted(
+        os.path.relpath(os.path.join(path, name), root)
+        for path, dirs, names in os.walk(root)
+        for name in names
+    )
+
+
+@pytest.mark.django_db
+class TestContentAddressedImages:
+
+    def test_name_is_content_hash(self, test_user):
+        item = make_item(test_user)
+
+        assert item.image.name == blob_name(hashlib.sha256(b"tent photo").hexdigest(), ".jpg")
+        with image_storage.open(item.image.name) as stored:
+            assert stored.read() == b"tent photo"
+
+    def test_identical_uploads_share_a_file(self, test_user, media_root):
+        first = make_item(test_user, filename="a.jpg")
+        second = make_item(test_user, filename="b.jpg")
+
+        assert first.image.name == second.image.name
+        assert references(first.image.name) == 2
+        assert stored_files(media_root) == [first.image.name]
+
+    def test_duplicate_shares_the_image(self, authenticated_client, test_user, media_root):
+        item = make_item(test_user)
+
+        response = authenticated_client.post(reverse("gear_items:item-duplicate", args=[item.id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        copy = Item.objects.get(pk=response.data["id"])
+        assert copy.image.name == item.image.name
+        assert references(item.image.name) == 2
+        assert stored_files(media_root) == [item.image.name]
+
+    def test_last_release_deletes_the_file(
+        self, test_user, media_root, django_capture_on_commit_callbacks
+    ):
+        item = make_item(test_user)
+        copy = Item.objects.create(name="Copy", weight=1, owner=test_user, image=item.image.name)
+        name = item.image.name
+
+        with django_capture_on_commit_callbacks(execute=True):
+            copy.delete()
+        assert references(name) == 1
+        assert stored_files(media_root) == [name]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            item = Item.objects.get(pk=item.pk)
+            item.image.save("new.png", ContentFile(b"new photo"))
+
+        assert not ImageBlob.objects.filter(name=name).exists()
+        assert stored_files(media_root) == [item.image.name]
+        assert references(item.image.name) == 1
+
+    def test_field_file_delete_keeps_shared_file(self, test_user, media_root):
+        item = make_item(test_user)
+        copy = Item.objects.create(name="Copy", weight=1, owner=test_user, image=item.image.name)
+
+        copy.image.delete()
+
+        assert not copy.image
+        assert stored_files(media_root) == [item.image.name]
+        assert references(item.image.name) == 1
+
+    def test_recently_saved_file_is_kept(
+        self, settings, test_user, media_root, django_capture_on_commit_callbacks
+    ):
+        settings.IMAGE_COLLECT_GRACE = 300
+        item = make_item(test_user)
+        name = item.image.name
+
+        with django_capture_on_commit_callbacks(execute=True):
+            item.delete()
+
+        assert references(name) == 0
+        assert stored_files(media_root) == [name]
+
+        settings.IMAGE_COLLECT_GRACE = 0
+        out = StringIO()
+        call_command("collect_images", stdout=out)
+
+        assert "Deleted 1 unreferenced images." in out.getvalue()
+        assert stored_files(media_root) == []
+        assert not ImageBlob.objects.exists()
+
+    def test_collect_corrects_low_count(self, test_user, media_root):
+        item = make_item(test_user)
+        ImageBlob.objects.filter(name=item.image.name).update(references=0)
+
+        assert collect_image(item.image.name) is False
+
+        assert references(item.image.name) == 1
+        assert stored_files(media_root) == [item.image.name]
+
+    def test_unchanged_save_keeps_count(self, test_user):
+        item = make_item(test_user)
+        item = Item.objects.get(pk=item.pk)
+        item.name = "Renamed"
+        item.save()
+        Item.objects.only("name").get(pk=item.pk).save()
+
+        assert references(item.image.name) == 1
+
+    def test_profile_pictures_share_item_images(self, test_user):
+        item = make_item(test_user)
+        test_user.profile_picture.save("me.jpg", ContentFile(b"tent photo"))
+
+        assert test_user.profile_picture.name == item.image.name
+        assert references(item.image.name) == 2
+
+    def test_blob_name(self):
+        assert blob_name("abcdef", ".png") == "images/ab/cd/abcdef.png"
+
+
+def png(width, height, color="red"):
+    output = BytesIO()
+    Image.new("RGB", (width, height), color).save(output, "PNG")
+    return output.getvalue()
+
+
+def run_jobs():
+    worker = Worker(name="test-worker")
+    while worker.run_next() is not None:
+        pass
+
+
+@pytest.mark.django_db
+class TestImageVariants:
+
+    def test_upload_renders_variants(self, test_user):
+        item = make_item(test_user, png(800, 400), "tent.png")
+
+        job = Job.objects.get(name="core.generate_image_variants")
+        assert job.arguments == {"name": item.image.name}
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.status == SUCCEEDED
+        sizes = {}
+        for variant in ("thumbnail", "card", "full"):
+            with image_storage.open(variant_name(item.image.name, variant)) as stored:
+                image = Image.open(stored)
+                assert image.format == "WEBP"
+                sizes[variant] = image.size
+        assert sizes == {"thumbnail": (160, 160), "card": (480, 240), "full": (800, 400)}
+
+    def test_shared_image_renders_once(self, test_user):
+        item = make_item(test_user, png(10, 10), "a.png")
+        Item.objects.create(name="Copy", weight=1, owner=test_user, image=item.image.name)
+
+        assert Job.objects.filter(name="core.generate_image_variants").count() == 1
+
+    def test_unreadable_image(self, test_user):
+        make_item(test_user, b"not an image", "broken.jpg")
+
+        run_jobs()
+
+        job = Job.objects.get(name="core.generate_image_variants")
+        assert job.status == SUCCEEDED
+        assert job.result == {"variants": []}
+        assert ImageBlob.objects.get().variants_rendered is False
+
+    def test_decompression_bomb(self, test_user, monkeypatch):
+        monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+        item = make_item(test_user, png(100, 100), "huge.png")
+
+        run_jobs()
+
+        assert Job.objects.get(name="core.generate_image_variants").status == SUCCEEDED
+        assert ImageBlob.objects.get().variants_rendered is False
+        assert not image_storage.exists(variant_name(item.image.name, "thumbnail"))
+
+    def test_unrendered_images_fall_back_to_original(self, authenticated_client, test_user):
+        item = make_item(test_user, b"not an image", "broken.jpg")
+        url = reverse("gear_items:item-detail", args=[item.id])
+        original = f"http://testserver/media/{item.image.name}"
+
+        response = authenticated_client.get(url)
+        assert response.data["image_variants"] == {
+            variant: original for variant in ("thumbnail", "card", "full")
+        }
+
+        run_jobs()
+
+        response = authenticated_client.get(url)
+        assert response.data["image_variants"]["card"] == original
+
+    def test_collect_deletes_variants(
+        self, test_user, media_root, django_capture_on_commit_callbacks
+    ):
+        item = make_item(test_user, png(10, 10), "a.png")
+        run_jobs()
+        assert len(stored_files(media_root)) == 4
+
+        with django_capture_on_commit_callbacks(execute=True):
+            item.delete()
+
+        assert stored_files(media_root) == []
+
+    def test_serializers_expose_variant_urls(self, authenticated_client, test_user):
+        item = make_item(test_user, png(10, 10), "a.png")
+        test_user.profile_picture = item.image.name
+        test_user.save()
+        run_jobs()
+
+        response = authenticated_client.get(reverse("gear_items:item-detail", args=[item.id]))
+
+        root = blob_name(hashlib.sha256(png(10, 10)).hexdigest())
+        assert response.data["image_variants"] == {
+            variant: f"http://testserver/media/variants/{variant}/{root}.webp"
+            for variant in ("thumbnail", "card", "full")
+        }
+
+        response = authenticated_client.get(reverse("gear_items:item-list"))
+        assert response.data["results"][0]["image_variants"]["card"] == (
+            f"http://testserver/media/variants/card/{root}.webp"
+        )
+
+        response = authenticated_client.get(reverse("users:user-me"))
+        assert response.data["profile_picture_variants"]["thumbnail"] == (
+            f"http://testserver/media/variants/thumbnail/{root}.webp"
+        )
+
+    def test_items_without_image(self, authenticated_client, test_user):
+        item = Item.objects.create(name="Stakes", weight=10, owner=test_user)
+
+        response = authenticated_client.get(reverse("gear_items:item-detail", args=[item.id]))
+
+        assert response.data["image_variants"] is None
+
+    def test_backfill_queues_missing_variants(self, test_user):
+        make_item(test_user, png(10, 10), "a.png")
+        run_jobs()
+        # As if stored before variants existed.
+        legacy = make_item(test_user, png(20, 20), "legacy.png")
+        Job.objects.all().delete()
+
+        out = StringIO()
+        call_command("backfill_image_variants", stdout=out)
+
+        assert "Queued 1 images" in out.getvalue()
+        assert Job.objects.get().arguments == {"name": legacy.image.name, "force": False}
+
+        Job.objects.all().delete()
+        ImageBlob.objects.filter(name=legacy.image.name).update(variants_rendered=None)
+        call_command("backfill_image_variants", stdout=out)
+        assert Job.objects.get().arguments == {"name": legacy.image.name, "force": False}
+        run_jobs()
+        assert ImageBlob.objects.get(name=legacy.image.name).variants_rendered is True
+
+        call_command("backfill_image_variants", "--force", stdout=out)
+        assert Job.objects.filter(arguments__force=True).count() == 2
@@ -0,0 +1,69 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from core.invalidation import INVALIDATION_CHANNEL, parse_keys
+from core.pubsub import broker
+from gear_items.models import Category, Item
+from gear_lists.models import GearList, ListItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def published(django_capture_on_commit_callbacks):
+    messages = []
+    unsubscribe = broker.subscribe(
+        INVALIDATION_CHANNEL, lambda message: messages.append(message["keys"])
+    )
+    yield messages
+    unsubscribe()
+
+
+def test_parse_keys():
+    assert parse_keys(["user:1", "list:2", "user:30"], "user") == [1, 30]
+
+
+@pytest.mark.django_db
+class TestChangeKeys:
+
+    def test_item_save(self, test_user, published, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            item = Item.objects.create(name="Tent", weight=1000, owner=test_user)
+
+        assert published == [[f"item:{item.id}", f"user:{test_user.id}"]]
+
+    def test_category_delete(self, test_user, published, django_capture_on_commit_callbacks):
+        category = Category.objects.create(name="Shelter", owner=test_user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            category.delete()
+
+        assert published == [[f"user:{test_user.id}"]]
+
+    def test_list_item_save(self, test_user, published, django_capture_on_commit_callbacks):
+        gear_list = GearList.objects.create(name="Weekend", owner=test_user)
+        item = Item.objects.create(name="Tent", weight=1000, owner=test_user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ListItem.objects.create(gear_list=gear_list, item=item)
+
+        assert [f"list:{gear_list.id}"] in published
+        assert [f"list:{gear_list.id}", f"user:{test_user.id}"] in published
+
+    def test_nothing_published_on_rollback(self, test_user, published,
+                                           django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            Item.objects.create(name="Tent", weight=1000, owner=test_user)
+
+        assert len(callbacks) == 1
+        assert published == []
@@ -0,0 +1,69 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from core.loadtest import LoadTest, parse_mix
+
+
+@pytest.fixture
+def dataset():
+    call_command(
+        "generate_benchmark_data",
+        users=2,
+        items_per_user=80,
+        categories_per_user=4,
+        lists_per_user=2,
+        min_list_items=5,
+        max_list_items=10,
+        public_ratio=1,
+        stdout=StringIO(),
+    )
+
+
+def test_parse_mix():
+    assert parse_mix("browse=3, reorder") == {"browse": 3.0, "reorder": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("browse=1,unknown=2")
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.nplusone(budget=None)
+class TestLoadTest:
+
+    def test_threads(self, dataset, tmp_path):
+        output = tmp_path / "load.json"
+
+        call_command(
+            "run_load_test",
+            concurrency=3,
+            requests=30,
+            duration=60,
+            output=str(output),
+            stdout=StringIO(),
+        )
+
+        report = json.loads(output.read_text())
+        assert report["totals"]["requests"] == 30
+        assert report["totals"]["throughput_rps"] > 0
+        assert set(report["scenarios"]) <= {
+            "browse", "shared", "toggle_packed", "reorder", "add_item"
+        }
+        browse = report["scenarios"]["browse"]
+        assert browse["status"] == {"200": browse["requests"]}
+        assert report["lock_waits"]["samples"] >= 0
+
+    def test_asyncio(self, dataset):
+        report = LoadTest(
+            mode="asyncio",
+            concurrency=2,
+            requests=10,
+            duration=60,
+            mix={"browse": 1, "shared": 1},
+            monitor_locks=False,
+        ).run()
+
+        assert report["totals"]["requests"] == 10
+        assert report["totals"]["errors"] == 0
+        assert report["totals"]["latency_ms"]["p50"] > 0
@@ -0,0 +1,129 @@
+import json
+import threading
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.metrics import REGISTRY, Counter, Histogram, Registry, render_text
+
+User = get_user_model()
+
+
+@pytest.fixture
+def metrics_dir(settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path)
+    settings.METRICS_TOKEN = "secret"
+    return tmp_path
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+def scrape():
+    return Client().get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+
+
+def test_histogram_exposition():
+    registry = Registry()
+    histogram = Histogram(
+        "latency_seconds", "Latency.", ["view"], buckets=(0.1, 1), registry=registry
+    )
+    histogram.observe(0.05, view="a")
+    histogram.observe(0.5, view="a")
+    histogram.observe(5, view="a")
+
+    snapshot = registry.snapshot()["metrics"]
+    merged = {
+        name: {**data, "samples": {tuple(key): value for key, value in data["samples"]}}
+        for name, data in snapshot.items()
+    }
+    text = render_text(merged)
+
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{view="a",le="0.1"} 1.0' in text
+    assert 'latency_seconds_bucket{view="a",le="1.0"} 2.0' in text
+    assert 'latency_seconds_bucket{view="a",le="+Inf"} 3.0' in text
+    assert 'latency_seconds_count{view="a"} 3.0' in text
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+
+    def test_reports_view_latency(self, metrics_dir, test_user):
+        client = APIClient()
+        client.force_authenticate(user=test_user)
+        client.get(reverse("gear_items:item-list"))
+
+        response = scrape()
+
+        assert response.status_code == 200
+        body = response.content.decode()
+        assert 'http_request_duration_seconds_count{view="ItemViewSet",action="list"}' in body
+        assert 'http_request_queries_bucket{view="ItemViewSet",action="list",le="1.0"}' in body
+        assert "gear_list_weight_recomputes_total" in body
+
+    def test_aggregates_worker_files(self, metrics_dir):
+        counter = Counter("aggregation_probe_total", "Probe.", registry=Registry())
+        counter.inc(3)
+        worker = {"pid": 999999999, "metrics": {counter.name: counter.dump()}}
+        (metrics_dir / "999999999.json").write_text(json.dumps(worker))
+        counter.inc(2)
+        REGISTRY.register(counter)
+        try:
+            body = scrape().content.decode()
+        finally:
+            REGISTRY.metrics.pop(counter.name)
+
+        assert "aggregation_probe_total 8.0" in body
+
+    def test_token_required_when_configured(self, metrics_dir):
+        assert Client().get(reverse("metrics")).status_code == 403
+        assert scrape().status_code == 200
+
+    def test_staff_only_without_token(self, metrics_dir, settings, test_user):
+        settings.METRICS_TOKEN = ""
+        client = Client()
+
+        assert client.get(reverse("metrics")).status_code == 403
+        client.force_login(test_user)
+        assert client.get(reverse("metrics")).status_code == 403
+
+        test_user.is_staff = True
+        test_user.save()
+        assert client.get(reverse("metrics")).status_code == 200
+
+    def test_open_connections_gauge(self, metrics_dir):
+        def open_and_close():
+            connection.ensure_connection()
+            connection.close()
+
+        before = scrape().content.decode()
+        thread = threading.Thread(target=open_and_close)
+        thread.start()
+        thread.join()
+        after = scrape().content.decode()
+
+        def sample(body, name):
+            for line in body.splitlines():
+                if line.startswith(f'{name}{{alias="default"}}'):
+                    return float(line.split()[-1])
+            return 0.0
+
+        assert sample(after, "db_connections_opened_total") == (
+            sample(before, "db_connections_opened_total") + 1
+        )
+        assert sample(after, "db_connections_closed_total") == (
+            sample(before, "db_connections_closed_total") + 1
+        )
+        assert sample(after, "db_connections_open") == sample(before, "db_connections_open")
@@ -0,0 +1,133 @@
+import json
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.middleware import PerformanceMiddleware, _profiler_lock
+from gear_items.models import Item
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    settings.REQUEST_PROFILING = True
+    settings.PROFILE_DIR = str(tmp_path)
+    return tmp_path
+
+
+def parse_server_timing(header):
+    timings = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        timings[name] = dict(param.split("=", 1) for param in params)
+    return timings
+
+
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+
+    def test_server_timing_header(self, authenticated_client, test_user):
+        Item.objects.create(name="Tent", weight=900, owner=test_user)
+
+        response = authenticated_client.get(reverse("gear_items:item-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        timings = parse_server_timing(response["Server-Timing"])
+        assert set(timings) == {"db", "serialize", "app", "total"}
+        assert timings["db"]["desc"] == '"2 queries"'
+        assert float(timings["serialize"]["dur"]) > 0
+
+    def test_structured_log_line(self, authenticated_client, test_user, caplog):
+        Item.objects.create(name="Tent", weight=900, owner=test_user)
+
+        with caplog.at_level(logging.INFO, logger="core.performance"):
+            authenticated_client.get(reverse("gear_items:item-list"))
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["view"] == "ItemViewSet"
+        assert record["action"] == "list"
+        assert record["status"] == status.HTTP_200_OK
+        assert record["queries"] == 2
+
+    def test_profile_dump_for_staff(self, authenticated_client, test_user, profile_dir):
+        test_user.is_staff = True
+        test_user.save()
+
+        response = authenticated_client.get(reverse("gear_items:item-list"), HTTP_X_PROFILE="1")
+
+        assert (profile_dir / response["X-Profile-Id"]).exists()
+
+    def test_profile_ignored_for_non_staff(self, authenticated_client, profile_dir):
+        response = authenticated_client.get(reverse("gear_items:item-list"), HTTP_X_PROFILE="1")
+
+        assert "X-Profile-Id" not in response
+        assert not list(profile_dir.iterdir())
+
+    def test_profiling_off_by_default(self, authenticated_client, test_user, profile_dir,
+                                      settings):
+        settings.REQUEST_PROFILING = False
+        test_user.is_staff = True
+        test_user.save()
+
+        response = authenticated_client.get(reverse("gear_items:item-list"), HTTP_X_PROFILE="1")
+
+        assert "X-Profile-Id" not in response
+        assert not list(profile_dir.iterdir())
+
+    def test_one_profiler_at_a_time(self, authenticated_client, test_user, profile_dir):
+        test_user.is_staff = True
+        test_user.save()
+
+        with _profiler_lock:
+            response = authenticated_client.get(
+                reverse("gear_items:item-list"), HTTP_X_PROFILE="1"
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Profile-Id" not in response
+
+    def test_disabled(self, authenticated_client, settings):
+        settings.PERFORMANCE_INSTRUMENTATION = False
+
+        response = authenticated_client.get(reverse("gear_items:item-list"))
+
+        assert "Server-Timing" not in response
+
+
+def test_async_requests_are_not_profiled(settings, profile_dir):
+    async def view(request):
+        return HttpResponse()
+
+    request = RequestFactory().get("/", HTTP_X_PROFILE="1")
+    request.user = User(is_staff=True)
+
+    response = async_to_sync(PerformanceMiddleware(view))(request)
+
+    assert "Server-Timing" in response
+    assert "X-Profile-Id" not in response
+    assert not list(profile_dir.iterdir())
@@ -0,0 +1,86 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.nplusone import detect_nplusone, format_findings
+from gear_items.models import Category, Item
+from gear_items.serializers import ItemSerializer
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def test_items(test_user):
+    items = []
+    for index in range(5):
+        category = Category.objects.create(name=f"Category {index}", owner=test_user)
+        items.append(
+            Item.objects.create(
+                name=f"Item {index}", weight=100, category=category, owner=test_user
+            )
+        )
+    return items
+
+
+@pytest.mark.django_db
+class TestNPlusOneDetector:
+
+    def test_reports_serializer_field_and_location(self, test_items):
+        with detect_nplusone() as tracker:
+            ItemSerializer(Item.objects.select_related("owner"), many=True).data
+
+        findings = tracker.repeated(3)
+        assert len(findings) == 1
+        assert findings[0]["count"] == 5
+        assert findings[0]["field"] == "ItemSerializer.category_name"
+        assert findings[0]["location"].startswith("gear_items/serializers.py:")
+        assert "ItemSerializer.category_name" in format_findings(findings)
+
+    def test_select_related_is_not_flagged(self, test_items):
+        with detect_nplusone() as tracker:
+            ItemSerializer(Item.objects.select_related("category", "owner"), many=True).data
+
+        assert tracker.repeated(1) == []
+
+    @pytest.mark.nplusone(budget=None)
+    def test_middleware_flags_repeated_queries(self, authenticated_client, test_items, settings,
+                                               monkeypatch):
+        settings.NPLUSONE_THRESHOLD = 3
+        settings.COMPILED_SERIALIZERS = False
+        settings.MIDDLEWARE = [*settings.MIDDLEWARE, "core.middleware.NPlusOneMiddleware"]
+        monkeypatch.setattr(
+            "gear_items.views.ItemViewSet.get_queryset",
+            lambda view: Item.objects.filter(owner=view.request.user),
+        )
+
+        response = authenticated_client.get(reverse("gear_items:item-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-NPlusOne-Queries"] == "1"
+
+    def test_middleware_passes_clean_requests(self, authenticated_client, test_items, settings):
+        settings.MIDDLEWARE = [*settings.MIDDLEWARE, "core.middleware.NPlusOneMiddleware"]
+
+        response = authenticated_client.get(reverse("gear_items:item-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-NPlusOne-Queries" not in response
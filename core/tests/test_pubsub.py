@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+
+from core.pubsub import Broker
+
+
+class TestBroker:
+
+    def test_publish_reaches_channel_subscribers(self):
+        broker = Broker()
+        received = []
+        broker.subscribe("a", received.append)
+        broker.subscribe("b", lambda message: received.append(("b", message)))
+
+        broker.publish("a", {"n": 1})
+
+        assert received == [{"n": 1}]
+
+    def test_unsubscribe(self):
+        broker = Broker()
+        received = []
+        unsubscribe = broker.subscribe("a", received.append)
+
+        unsubscribe()
+        broker.publish("a", {"n": 1})
+
+        assert received == []
+        assert broker._subscribers == {}
+
+    def test_failing_subscriber_does_not_stop_delivery(self):
+        broker = Broker()
+        received = []
+
+        def fail(message):
+            raise ValueError(message)
+
+        broker.subscribe("a", fail)
+        broker.subscribe("a", received.append)
+
+        broker.publish("a", {"n": 1})
+
+        assert received == [{"n": 1}]
+
+    def test_listen(self):
+        broker = Broker()
+
+        async def consume():
+            async with broker.listen("a") as subscription:
+                broker.publish("a", {"n": 1})
+                return await subscription.get(timeout=1)
+
+        assert async_to_sync(consume)() == {"n": 1}
+        assert broker._subscribers == {}
+
+    def test_listen_overflow(self):
+        broker = Broker()
+
+        async def consume():
+            async with broker.listen("a", maxsize=2) as subscription:
+                for n in range(3):
+                    broker.publish("a", {"n": n})
+                await asyncio.sleep(0)
+                return subscription.overflowed, subscription.queue.qsize()
+
+        assert async_to_sync(consume)() == (True, 2)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_postgres_backend(settings):
+    settings.PUBSUB_BACKEND = "postgres"
+    broker = Broker()
+
+    async def consume():
+        async with broker.listen("a") as subscription:
+            # Give the listener thread time to LISTEN before notifying.
+            for attempt in range(50):
+                await sync_to_async(broker.publish)("a", {"n": attempt})
+                try:
+                    return await subscription.get(timeout=0.1)
+                except asyncio.TimeoutError:
+                    continue
+
+    try:
+        assert "n" in async_to_sync(consume)()
+    finally:
+        broker.close()
+
+    assert broker._listener is None
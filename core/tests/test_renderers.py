@@ -0,0 +1,83 @@
+import json
+
+import cbor2
+import msgpack
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from gear_items.models import Category, Item
+from gear_lists.models import GearList, ListItem
+
+User = get_user_model()
+
+FORMATS = {
+    "application/msgpack": (msgpack.packb, lambda content: msgpack.unpackb(content, raw=False)),
+    "application/cbor": (cbor2.dumps, cbor2.loads),
+}
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def test_gear_list(test_user):
+    category = Category.objects.create(name="Shelter", owner=test_user)
+    gear_list = GearList.objects.create(name="Weekend", owner=test_user, weight_unit="oz")
+    item = Item.objects.create(name="Tent", weight="812.50", category=category, owner=test_user)
+    ListItem.objects.create(gear_list=gear_list, item=item, quantity=2)
+    gear_list.calculate_total_weight()
+    return gear_list
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("media_type", FORMATS)
+class TestBinaryFormats:
+
+    def test_detail_matches_json(self, authenticated_client, test_gear_list, media_type):
+        url = reverse("gear_lists:gear_list-detail", args=[test_gear_list.id])
+        _, loads = FORMATS[media_type]
+
+        expected = json.loads(authenticated_client.get(url).content)
+        response = authenticated_client.get(url, HTTP_ACCEPT=media_type)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == media_type
+        data = loads(response.content)
+        assert data == expected
+        assert data["share_code"] == str(test_gear_list.share_code)
+        assert data["total_weight"] == expected["total_weight"]
+
+    def test_create_item(self, authenticated_client, test_user, media_type):
+        dumps, loads = FORMATS[media_type]
+        body = dumps({"name": "Quilt", "weight": 566.9, "weight_unit": "g"})
+
+        response = authenticated_client.post(
+            reverse("gear_items:item-list"), body, content_type=media_type, HTTP_ACCEPT=media_type
+        )
+
+        assert response.status_code == 201
+        assert loads(response.content)["name"] == "Quilt"
+        assert float(Item.objects.get(owner=test_user, name="Quilt").weight) == 566.9
+
+    def test_malformed_body(self, authenticated_client, media_type):
+        response = authenticated_client.post(
+            reverse("gear_items:item-list"), b"\xc1\xff", content_type=media_type
+        )
+
+        assert response.status_code == 400
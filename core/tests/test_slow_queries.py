@@ -0,0 +1,117 @@
+import psycopg2
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import slow_queries
+from core.models import SlowQuery
+from core.sql import fingerprint_sql, normalize_sql
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+def test_normalize_sql():
+    assert normalize_sql(
+        "SELECT *  FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"
+    ) == "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?"
+    assert fingerprint_sql("SELECT 1 FROM t WHERE a = 1") == fingerprint_sql(
+        "SELECT 1 FROM t WHERE a = 2"
+    )
+
+
+@pytest.mark.django_db
+class TestSlowQueryLog:
+
+    def test_slow_query_is_queued_with_view(self, authenticated_client, settings, monkeypatch):
+        settings.SLOW_QUERY_THRESHOLD_MS = 0
+        captured = []
+        monkeypatch.setattr(
+            slow_queries, "submit_capture", lambda *args: captured.append(args)
+        )
+
+        authenticated_client.get(reverse("gear_items:item-search"), {"q": "tent"})
+
+        assert captured
+        alias, sql, params, duration_ms, view, action = captured[-1]
+        assert "LIKE" in sql.upper()
+        assert (view, action) == ("ItemViewSet", "search")
+
+    def test_queries_outside_requests_are_ignored(self, test_user, settings, monkeypatch):
+        settings.SLOW_QUERY_THRESHOLD_MS = 0
+        captured = []
+        monkeypatch.setattr(
+            slow_queries, "submit_capture", lambda *args: captured.append(args)
+        )
+
+        list(User.objects.all())
+
+        assert captured == []
+
+    def test_capture_records_plan_and_aggregates(self, test_user):
+        sql = 'SELECT "id" FROM "users_user" WHERE "email" = %s'
+
+        slow_queries.capture_slow_query("default", sql, ["a@example.com"], 300, "V", "list")
+        slow_queries.capture_slow_query("default", sql, ["b@example.com"], 500, "V", "list")
+
+        slow_query = SlowQuery.objects.get(fingerprint=fingerprint_sql(sql))
+        assert slow_query.calls == 2
+        assert slow_query.total_time == 800
+        assert slow_query.max_time == 500
+        assert "Execution Time" in slow_query.plan
+
+    def test_top_offenders_endpoint_is_staff_only(self, authenticated_client, test_user):
+        SlowQuery.objects.create(fingerprint="a", sql="SELECT 1", calls=1, total_time=10)
+        SlowQuery.objects.create(fingerprint="b", sql="SELECT 2", calls=4, total_time=900)
+        url = reverse("core:slow_query-list")
+
+        assert authenticated_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+        test_user.is_staff = True
+        test_user.save()
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["fingerprint"] for row in response.data["results"]] == ["b", "a"]
+        assert response.data["results"][0]["avg_time"] == 225
+
+
+@pytest.mark.django_db(transaction=True)
+def test_locking_select_is_explained_without_analyze(test_user):
+    sql = 'SELECT "id" FROM "users_user" WHERE "id" = %s FOR UPDATE SKIP LOCKED'
+
+    with transaction.atomic():
+        plan = slow_queries.explain("default", sql, [test_user.pk])
+
+        other = psycopg2.connect(**connection.get_connection_params())
+        try:
+            with other, other.cursor() as cursor:
+                cursor.execute(
+                    'SELECT "id" FROM "users_user" WHERE "id" = %s FOR UPDATE NOWAIT',
+                    [test_user.pk],
+                )
+                assert cursor.fetchall() == [(test_user.pk,)]
+        finally:
+            other.close()
+
+    assert "LockRows" in plan
+    assert "Execution Time" not in plan
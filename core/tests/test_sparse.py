@@ -0,0 +1,195 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.request import Request
+
+from core.sparse import FieldSelection
+from gear_items.models import Category, Item
+from gear_lists.models import GearList, ListItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def test_gear_list(test_user):
+    category = Category.objects.create(name="Shelter", color="#123456", owner=test_user)
+    gear_list = GearList.objects.create(name="Weekend", owner=test_user, weight_unit="oz")
+    for index, weight in enumerate(["100.00", "250.50", "40.25"]):
+        item = Item.objects.create(
+            name=f"Item {index}",
+            description="Long description",
+            weight=weight,
+            category=category if index % 2 else None,
+            is_consumable=index == 1,
+            owner=test_user
+        )
+        ListItem.objects.create(
+            gear_list=gear_list, item=item, quantity=index + 1, is_worn=index == 0, order=index
+        )
+    return gear_list
+
+
+@pytest.fixture(params=[True, False], ids=["compiled", "drf"])
+def compiled(request, settings):
+    settings.COMPILED_SERIALIZERS = request.param
+    return request.param
+
+
+def selection(query):
+    factory = APIRequestFactory()
+    return FieldSelection.from_request(Request(factory.get("/", query)))
+
+
+def results(response):
+    data = response.json()
+    return data["results"] if isinstance(data, dict) and "results" in data else data
+
+
+class TestFieldSelection:
+
+    def test_no_parameters(self):
+        assert selection({}) is None
+
+    def test_unsafe_methods_are_ignored(self):
+        request = Request(APIRequestFactory().post("/?fields=id"))
+        assert FieldSelection.from_request(request) is None
+
+    def test_fields(self):
+        fields = selection({"fields": "id,item_details.name"})
+
+        assert fields.includes("", "id")
+        assert not fields.includes("", "quantity")
+        assert fields.includes("", "item_details", nested=True)
+        assert fields.includes("item_details", "name")
+        assert not fields.includes("item_details", "weight")
+
+    def test_nested_name_keeps_whole_object(self):
+        fields = selection({"fields": "list_items"})
+
+        assert fields.includes("list_items", "item_details", nested=True)
+        assert fields.includes("list_items.item_details", "weight")
+
+    def test_expand(self):
+        fields = selection({"expand": "list_items"})
+
+        assert fields.includes("", "name")
+        assert fields.includes("", "list_items", nested=True)
+        assert not fields.includes("list_items", "item_details", nested=True)
+        assert selection({"expand": "list_items.item_details"}).includes(
+            "list_items", "item_details", nested=True
+        )
+
+
+@pytest.mark.django_db
+class TestSparseFieldsAPI:
+
+    def test_item_list_loads_requested_columns(self, authenticated_client, test_gear_list,
+                                               compiled):
+        url = reverse("gear_items:item-list")
+
+        with CaptureQueriesContext(connection) as captured:
+            response = authenticated_client.get(url, {"fields": "id,name,normalized_weight"})
+
+        assert response.status_code == 200
+        rows = results(response)
+        assert [list(row) for row in rows] == [["id", "name", "normalized_weight"]] * 3
+        assert rows[1]["normalized_weight"] == 250.5
+        sql = next(query["sql"] for query in captured if "gear_items_item" in query["sql"]
+                   and "COUNT" not in query["sql"])
+        assert '"description"' not in sql
+        assert "gear_items_category" not in sql
+
+    def test_item_list_category_fields(self, authenticated_client, test_gear_list, compiled):
+        url = reverse("gear_items:item-list")
+
+        response = authenticated_client.get(url, {"fields": "name,category_name"})
+
+        rows = results(response)
+        assert rows[0] == {"name": "Item 0", "category_name": None}
+        assert rows[1] == {"name": "Item 1", "category_name": "Shelter"}
+
+    def test_list_item_retrieve(self, authenticated_client, test_gear_list, compiled):
+        list_item = test_gear_list.list_items.get(order=1)
+        url = reverse("gear_lists:list_item-detail", args=[list_item.id])
+
+        with CaptureQueriesContext(connection) as captured:
+            response = authenticated_client.get(
+                url, {"fields": "quantity,total_weight,item_details.name"}
+            )
+
+        assert response.json() == {
+            "quantity": 2,
+            "total_weight": round(250.5 / 28.35 * 2, 2),
+            "item_details": {"name": "Item 1"},
+        }
+        assert len(captured) == 1
+        assert '"description"' not in captured[0]["sql"]
+
+    def test_empty_expand_collapses_nested(self, authenticated_client, test_gear_list):
+        url = reverse("gear_lists:list_item-list")
+
+        response = authenticated_client.get(url, {"expand": ""})
+
+        rows = results(response)
+        assert len(rows) == 3
+        assert all("item_details" not in row and "item" in row for row in rows)
+
+    def test_detail_selection(self, authenticated_client, test_gear_list, compiled):
+        url = reverse("gear_lists:gear_list-detail", args=[test_gear_list.id])
+        full = authenticated_client.get(url).json()
+
+        response = authenticated_client.get(
+            url, {"fields": "name,items_count,total_base_weight,list_items.quantity"}
+        )
+
+        assert response.json() == {
+            "name": "Weekend",
+            "items_count": 3,
+            "list_items": [{"quantity": 1}, {"quantity": 2}, {"quantity": 3}],
+            "total_base_weight": full["total_base_weight"],
+        }
+
+    def test_detail_without_items(self, authenticated_client, test_gear_list, settings):
+        settings.COMPILED_SERIALIZERS = True
+        url = reverse("gear_lists:gear_list-detail", args=[test_gear_list.id])
+
+        with CaptureQueriesContext(connection) as captured:
+            response = authenticated_client.get(url, {"fields": "id,name"})
+
+        assert response.json() == {"id": test_gear_list.id, "name": "Weekend"}
+        assert not any("gear_lists_listitem" in query["sql"] for query in captured)
+
+    def test_write_ignores_selection(self, authenticated_client, test_gear_list):
+        item = Item.objects.get(name="Item 0")
+        url = reverse("gear_items:item-detail", args=[item.id])
+
+        response = authenticated_client.patch(f"{url}?fields=id", {"name": "Renamed"})
+
+        assert response.status_code == 200
+        assert response.json()["name"] == "Renamed"
+        assert "description" in response.json()
+
+    def test_user_list(self, authenticated_client, test_user):
+        response = authenticated_client.get(reverse("users:user-list"), {"fields": "username"})
+
+        assert results(response) == [{"username": "testuser"}]
@@ -0,0 +1,133 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.tracing import collect_trace, span
+from gear_items.models import Item
+from gear_lists.models import GearList, ListItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def trace_dir(settings, tmp_path):
+    settings.REQUEST_TRACING = True
+    settings.TRACE_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def test_gear_list(test_user):
+    gear_list = GearList.objects.create(name="Test Gear List", owner=test_user, weight_unit="g")
+    for index in range(3):
+        item = Item.objects.create(name=f"Item {index}", weight=100, owner=test_user)
+        ListItem.objects.create(gear_list=gear_list, item=item, order=index)
+    return gear_list
+
+
+def test_span_outside_trace_is_noop():
+    with span("nothing"):
+        pass
+
+    with collect_trace() as trace:
+        with span("outer", "app", size=1):
+            with span("inner"):
+                pass
+
+    names = [event["name"] for event in trace.export()["traceEvents"]]
+    assert names == ["outer", "inner"]
+    outer = trace.events[1]
+    assert outer["ph"] == "X"
+    assert outer["args"] == {"size": 1}
+
+
+@pytest.mark.django_db
+class TestRequestTracing:
+
+    def test_trace_dump_for_staff(self, authenticated_client, test_user, test_gear_list,
+                                  trace_dir, settings):
+        settings.COMPILED_SERIALIZERS = False
+        test_user.is_staff = True
+        test_user.save()
+
+        response = authenticated_client.get(
+            reverse("gear_lists:gear_list-detail", args=[test_gear_list.id]), HTTP_X_TRACE="1"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        with open(trace_dir / response["X-Trace-Id"]) as fh:
+            events = json.load(fh)["traceEvents"]
+
+        names = {event["name"] for event in events}
+        assert f"GET /api/v1/gear-lists/lists/{test_gear_list.id}/" in names
+        assert "GearListDetailSerializer" in names
+        assert "ListItemSerializer[]" in names
+        assert "ItemSerializer" in names
+        assert "QuerySet[ListItem]" in names
+        assert "IsOwnerOrPublic.has_object_permission" in names
+        assert {event["cat"] for event in events} >= {"request", "db", "orm", "serializer"}
+
+        fields = {
+            event["name"]: event["args"]["field"]
+            for event in events
+            if event["cat"] == "serializer" and "args" in event
+        }
+        assert fields["ListItemSerializer[]"] == "list_items"
+        assert fields["ItemSerializer"] == "item_details"
+
+    def test_recompute_span(self, authenticated_client, test_user, test_gear_list, trace_dir):
+        test_user.is_staff = True
+        test_user.save()
+        item = Item.objects.create(name="Stove", weight=300, owner=test_user)
+
+        response = authenticated_client.post(
+            reverse("gear_lists:list_item-list"),
+            {"gear_list": test_gear_list.id, "item": item.id, "quantity": 1},
+            format="json",
+            HTTP_X_TRACE="1",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        with open(trace_dir / response["X-Trace-Id"]) as fh:
+            events = json.load(fh)["traceEvents"]
+        assert "GearList.recompute_total_weights" in {event["name"] for event in events}
+
+    def test_trace_ignored_for_non_staff(self, authenticated_client, trace_dir):
+        response = authenticated_client.get(reverse("gear_items:item-list"), HTTP_X_TRACE="1")
+
+        assert "X-Trace-Id" not in response
+        assert not list(trace_dir.iterdir())
+
+    def test_tracing_off_by_default(self, authenticated_client, test_user, trace_dir,
+                                    settings, monkeypatch):
+        settings.REQUEST_TRACING = False
+        test_user.is_staff = True
+        test_user.save()
+        monkeypatch.setattr("core.middleware.collect_trace", None)
+
+        response = authenticated_client.get(reverse("gear_items:item-list"), HTTP_X_TRACE="1")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Trace-Id" not in response
+        assert not list(trace_dir.iterdir())
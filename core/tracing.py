@@ -0,0 +1,198 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db.models.query import QuerySet
+from rest_framework import serializers
+
+from .sql import normalize_sql
+
+_trace = contextvars.ContextVar("core_trace", default=None)
+
+
+class Trace:
+    """
+    Spans recorded while one request is being handled.
+
+    Events use the Chrome trace event format ("X" complete events with
+    microsecond timestamps), so a dump opens directly in Perfetto or
+    ``chrome://tracing``. Nesting is derived by the viewer from the
+    timestamps of events on the same thread.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.started = time.perf_counter_ns()
+        self.lock = threading.Lock()
+
+    def add(self, name, category, start, end, args):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self.started) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.events.append(event)
+
+    def export(self, metadata=None):
+        return {
+            "traceEvents": sorted(self.events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": metadata or {},
+        }
+
+
+def current_trace():
+    return _trace.get()
+
+
+@contextmanager
+def collect_trace():
+    trace = Trace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def span(name, category="app", **args):
+    trace = _trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        trace.add(name, category, start, time.perf_counter_ns(), args)
+
+
+def traced(name, category="app"):
+    """
+    Decorator recording every call of the wrapped function as a span.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _trace.get() is None:
+                return func(*args, **kwargs)
+            with span(name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_permission(cls):
+    """
+    Class decorator recording permission checks as spans named after the class.
+    """
+    for method in ("has_permission", "has_object_permission"):
+        if method in cls.__dict__:
+            setattr(
+                cls,
+                method,
+                traced(f"{cls.__name__}.{method}", "permission")(cls.__dict__[method]),
+            )
+    return cls
+
+
+def trace_query(execute, sql, params, many, context):
+    trace = _trace.get()
+    if trace is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter_ns()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        trace.add(
+            sql.split(None, 1)[0].upper(), "db", start, time.perf_counter_ns(),
+            {"sql": normalize_sql(sql)},
+        )
+
+
+def _traced_fetch_all(fetch_all):
+    @wraps(fetch_all)
+    def _fetch_all(self):
+        if _trace.get() is None or self._result_cache is not None:
+            return fetch_all(self)
+        with span(f"QuerySet[{self.model.__name__}]", "orm"):
+            return fetch_all(self)
+
+    _fetch_all._core_traced = True
+    return _fetch_all
+
+
+def _serializer_name(serializer):
+    if isinstance(serializer, serializers.ListSerializer):
+        return f"{type(serializer.child).__name__}[]"
+    return type(serializer).__name__
+
+
+def _traced_to_representation(to_representation):
+    @wraps(to_representation)
+    def wrapper(self, instance):
+        if _trace.get() is None:
+            return to_representation(self, instance)
+
+        args = {"field": self.field_name} if self.field_name else {}
+        with span(_serializer_name(self), "serializer", **args):
+            return to_representation(self, instance)
+
+    wrapper._core_traced = True
+    return wrapper
+
+
+def _traced_method_field(to_representation):
+    @wraps(to_representation)
+    def wrapper(self, value):
+        if _trace.get() is None:
+            return to_representation(self, value)
+        with span(f"{type(self.parent).__name__}.{self.method_name}", "serializer"):
+            return to_representation(self, value)
+
+    wrapper._core_traced = True
+    return wrapper
+
+
+def install():
+    """
+    Hook span recording into queryset evaluation and serializer rendering.
+
+    Called once from ``CoreConfig.ready``; the hooks are no-ops outside of
+    ``collect_trace()``.
+    """
+    if not getattr(QuerySet._fetch_all, "_core_traced", False):
+        QuerySet._fetch_all = _traced_fetch_all(QuerySet._fetch_all)
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.to_representation, "_core_traced", False):
+            cls.to_representation = _traced_to_representation(cls.to_representation)
+
+    method_field = serializers.SerializerMethodField
+    if not getattr(method_field.to_representation, "_core_traced", False):
+        method_field.to_representation = _traced_method_field(method_field.to_representation)
+
+
+def write_trace(trace, name, metadata=None):
+    os.makedirs(settings.TRACE_DIR, exist_ok=True)
+    with open(os.path.join(settings.TRACE_DIR, name), "w") as fh:
+        json.dump(trace.export(metadata), fh)
+    return name
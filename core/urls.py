@@ -0,0 +1,13 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from .views import SlowQueryViewSet
+
+router = DefaultRouter()
+router.register(r'slow-queries', SlowQueryViewSet, basename='slow_query')
+
+app_name = 'core'
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
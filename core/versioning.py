@@ -0,0 +1,55 @@
+from django.utils.http import parse_etags
+
+from .exceptions import PreconditionFailedError
+from .models import StaleObjectError
+
+CONDITIONAL_METHODS = ("PUT", "PATCH", "DELETE")
+
+
+def version_etag(instance):
+    return f'"{instance.version}"'
+
+
+def check_if_match(request, instance):
+    """
+    Raise :class:`PreconditionFailedError` unless the request's ``If-Match``
+    header, when it has one, names the current version of ``instance``.
+    """
+    header = request.headers.get("If-Match")
+    if header is None:
+        return
+    etags = parse_etags(header)
+    if "*" not in etags and version_etag(instance) not in etags:
+        raise PreconditionFailedError()
+
+
+class VersionedViewMixin:
+    """
+    Optimistic concurrency for viewsets of :class:`core.models.VersionedModel`.
+
+    Detail responses carry the object's version as ``ETag``. PUT, PATCH and
+    DELETE honour ``If-Match`` and answer 412 when it names an older
+    version, or when the row changes between the check and the write.
+    """
+
+    etag_actions = ("retrieve", "update", "partial_update")
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.request.method in CONDITIONAL_METHODS:
+            check_if_match(self.request, instance)
+        if self.action in self.etag_actions:
+            self.versioned_instance = instance
+        return instance
+
+    def handle_exception(self, exc):
+        if isinstance(exc, StaleObjectError):
+            exc = PreconditionFailedError()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        instance = getattr(self, "versioned_instance", None)
+        if instance is not None and 200 <= response.status_code < 300:
+            response["ETag"] = version_etag(instance)
+        return response
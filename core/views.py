@@ -1,3 +1,39 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+from rest_framework import filters, permissions, viewsets
+
+from .metrics import REGISTRY, aggregate, render_text
+from .models import SlowQuery
+from .serializers import SlowQuerySerializer
+from .sparse import SparseFieldsViewMixin
+
+
+@require_GET
+def metrics(request):
+    # Scrapers authenticate with METRICS_TOKEN; without one configured, only
+    # signed-in staff can read the metrics.
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return HttpResponseForbidden()
+    elif not request.user.is_staff:
+        return HttpResponseForbidden()
+
+    REGISTRY.flush(force=True)
+    return HttpResponse(
+        render_text(aggregate()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+class SlowQueryViewSet(SparseFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = SlowQuery.objects.all()
+    serializer_class = SlowQuerySerializer
+    permission_classes = [permissions.IsAdminUser]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['sql', 'view', 'action']
+    ordering_fields = ['total_time', 'max_time', 'calls', 'updated_at']
+    ordering = ['-total_time']
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GearItemsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gear_items'
+
+    def ready(self):
+        import gear_items.signals
@@ -0,0 +1,48 @@
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+
+from core.asynchronous import apaginate, async_api_view, json_response
+from .filters import search_items
+from .models import Item
+from .serializers import ItemSerializer
+
+ITEM_FILTER_FIELDS = ['category', 'is_consumable', 'weight_unit']
+ITEM_ORDERING_FIELDS = ['name', 'weight', 'created_at', 'updated_at']
+
+
+def _item_queryset(user):
+    return Item.objects.filter(owner=user).select_related('category')
+
+
+def _apply_list_params(queryset, params):
+    for field in ITEM_FILTER_FIELDS:
+        value = params.get(field)
+        if value:
+            if field == 'is_consumable':
+                value = value.lower() == 'true'
+            elif field == 'category' and not value.isdigit():
+                raise ValidationError({field: [_("Select a valid choice.")]})
+            queryset = queryset.filter(**{field: value})
+
+    for term in params.get('search', '').replace(',', ' ').split():
+        queryset = queryset.filter(Q(name__icontains=term) | Q(description__icontains=term))
+
+    ordering = [
+        field for field in params.get('ordering', '').split(',')
+        if field.lstrip('-') in ITEM_ORDERING_FIELDS
+    ]
+    return queryset.order_by(*(ordering or ['name']))
+
+
+@async_api_view(['GET'])
+async def item_list(request):
+    queryset = _apply_list_params(_item_queryset(request.user), request.GET)
+    return await apaginate(request, queryset, ItemSerializer, {'request': request})
+
+
+@async_api_view(['GET'])
+async def item_search(request):
+    queryset = search_items(_item_queryset(request.user), request.GET)
+    items = [item async for item in queryset]
+    return json_response(ItemSerializer(items, many=True, context={'request': request}).data)
@@ -0,0 +1,65 @@
+from operator import itemgetter
+
+from core.compiled import CompiledSerializer
+from core.images import variant_urls
+from .models import normalize_weight
+from .serializers import CategorySerializer, ItemSerializer
+
+
+class CompiledItemSerializer(CompiledSerializer):
+    serializer_class = ItemSerializer
+
+    def computed_fields(self):
+        prefix = self.prefix
+        weight = prefix + "weight"
+        weight_unit = prefix + "weight_unit"
+        owner_unit = prefix + "owner__weight_unit"
+
+        user = getattr(self.request, "user", None)
+        target_unit = getattr(user, "weight_unit", None)
+        if target_unit:
+            def normalized_weight(row):
+                return normalize_weight(row[weight], row[weight_unit], target_unit)
+            weight_columns = (weight, weight_unit)
+        else:
+            def normalized_weight(row):
+                return normalize_weight(row[weight], row[weight_unit], row[owner_unit])
+            weight_columns = (weight, weight_unit, owner_unit)
+
+        image = prefix + "image"
+        request = self.request
+
+        def image_variants(row):
+            return variant_urls(row[image], request)
+
+        category = prefix + "category"
+        return {
+            "category_name": (
+                (category, prefix + "category__name"), itemgetter(prefix + "category__name")
+            ),
+            "category_color": (
+                (category, prefix + "category__color"), itemgetter(prefix + "category__color")
+            ),
+            "normalized_weight": (weight_columns, normalized_weight),
+            "image_variants": ((image,), image_variants),
+        }
+
+    def render(self, row):
+        data = super().render(row)
+        category = self.prefix + "category"
+        if category in row and row[category] is None:
+            # ItemSerializer skips its dotted category fields when there is
+            # no category and to_representation appends them afterwards, so
+            # they come last in the output.
+            for name in ("category_name", "category_color"):
+                if name in data:
+                    data[name] = data.pop(name)
+        return data
+
+
+class CompiledCategorySerializer(CompiledSerializer):
+    serializer_class = CategorySerializer
+
+    def computed_fields(self):
+        column = self.prefix + "item_count"
+        return {"item_count": ((column,), itemgetter(column))}
@@ -0,0 +1,24 @@
+from django.db.models import Q
+
+
+def search_items(queryset, params):
+    query = params.get('q', '')
+
+    if query:
+        queryset = queryset.filter(
+            Q(name__icontains=query) |
+            Q(description__icontains=query)
+        )
+
+    category_id = params.get('category_id')
+    if category_id:
+        queryset = queryset.filter(category_id=category_id)
+
+    is_consumable = params.get('is_consumable')
+    if is_consumable is not None:
+        is_consumable = is_consumable.lower() == 'true'
+        queryset = queryset.filter(is_consumable=is_consumable)
+
+    sort_by = params.get('sort_by', 'name')
+    sort_direction = '-' if params.get('desc') == 'true' else ''
+    return queryset.order_by(f'{sort_direction}{sort_by}')
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:07
+
+import core.images
+from django.db import migrations
+from django.db.models import Count, F
+
+
+def count_existing_images(apps, schema_editor):
+    Item = apps.get_model("gear_items", "Item")
+    ImageBlob = apps.get_model("core", "ImageBlob")
+    counts = (
+        Item.objects.exclude(image__isnull=True)
+        .exclude(image="")
+        .values_list("image")
+        .annotate(references=Count("pk"))
+        .order_by()
+    )
+    for name, references in counts:
+        ImageBlob.objects.get_or_create(name=name)
+        ImageBlob.objects.filter(name=name).update(references=F("references") + references)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_imageblob"),
+        ("gear_items", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="item",
+            name="image",
+            field=core.images.ContentAddressedImageField(
+                blank=True, null=True, upload_to="", verbose_name="image"
+            ),
+        ),
+        migrations.RunPython(count_existing_images, migrations.RunPython.noop),
+    ]
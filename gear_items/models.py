@@ -2,6 +2,19 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 
+from core.images import ContentAddressedImageField
+
+
+def normalize_weight(weight, weight_unit, target_unit):
+    weight = float(weight)
+    
+    if weight_unit == "g" and target_unit == "oz":
+        return weight / 28.35
+    elif weight_unit == "oz" and target_unit == "g":
+        return weight * 28.35
+    
+    return weight
+
 
 class Category(models.Model):
     name = models.CharField(_("name"), max_length=100)
@@ -50,7 +63,7 @@ class Item(models.Model):
     url = models.URLField(_("URL"), blank=True)
     price = models.DecimalField(_("price"), max_digits=10, decimal_places=2, null=True, blank=True)
     currency = models.CharField(_("currency"), max_length=3, default="USD")
-    image = models.ImageField(_("image"), upload_to="gear_images/", null=True, blank=True)
+    image = ContentAddressedImageField(_("image"), null=True, blank=True)
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -70,11 +83,4 @@ class Item(models.Model):
     
     def get_normalized_weight(self, target_unit=None):
         target_unit = target_unit or self.owner.weight_unit
-        weight = float(self.weight)
-        
-        if self.weight_unit == "g" and target_unit == "oz":
-            return weight / 28.35
-        elif self.weight_unit == "oz" and target_unit == "g":
-            return weight * 28.35
-        
-        return weight
+        return normalize_weight(self.weight, self.weight_unit, target_unit)
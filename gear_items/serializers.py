@@ -1,11 +1,14 @@
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from core.serializers import ImageVariantsField
+from core.sparse import SparseFieldsMixin
 from .models import Category, Item
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     item_count = serializers.SerializerMethodField()
+    column_dependencies = {'item_count': []}
     
     class Meta:
         model = Category
@@ -13,6 +16,9 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'owner', 'created_at', 'updated_at', 'item_count']
     
     def get_item_count(self, obj):
+        item_count = getattr(obj, 'item_count', None)
+        if item_count is not None:
+            return item_count
         return obj.items.count()
     
     def create(self, validated_data):
@@ -36,18 +42,20 @@ class CategorySerializer(serializers.ModelSerializer):
         return value
 
 
-class ItemSerializer(serializers.ModelSerializer):
+class ItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     category_name = serializers.StringRelatedField(source='category.name', read_only=True)
     category_color = serializers.CharField(source='category.color', read_only=True)
     normalized_weight = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
+    column_dependencies = {'normalized_weight': ['weight', 'weight_unit']}
     
     class Meta:
         model = Item
         fields = [
             'id', 'name', 'description', 'weight', 'weight_unit', 'normalized_weight',
             'category', 'category_name', 'category_color', 'url', 'price', 'currency',
-            'image', 'owner', 'is_consumable', 'created_at', 'updated_at'
+            'image', 'image_variants', 'owner', 'is_consumable', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'owner', 'category_name', 'category_color', 'normalized_weight', 
                            'created_at', 'updated_at']
@@ -79,11 +87,9 @@ class ItemSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         
-        if instance.category:
-            representation['category_name'] = instance.category.name
-            representation['category_color'] = instance.category.color
-        else:
-            representation['category_name'] = None
-            representation['category_color'] = None
+        for field_name, attr in (('category_name', 'name'), ('category_color', 'color')):
+            if field_name in self.fields:
+                category = instance.category
+                representation[field_name] = getattr(category, attr) if category else None
             
         return representation
\ No newline at end of file
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.invalidation import ITEM, USER, bus, change_key
+from .models import Category, Item
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def invalidate_item(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bus.publish(change_key(ITEM, instance.pk), change_key(USER, instance.owner_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bus.publish(change_key(USER, instance.owner_id))
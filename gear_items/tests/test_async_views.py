@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from gear_items.models import Category, Item
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def token_client(test_user):
+    token, _ = Token.objects.get_or_create(user=test_user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+@pytest.fixture
+def test_items(test_user):
+    category = Category.objects.create(name="Cooking", owner=test_user)
+    return [
+        Item.objects.create(
+            name=f"Item {index:02d}",
+            description="Titanium" if index % 2 else "Aluminium",
+            weight=10 * (index + 1),
+            category=category if index % 3 else None,
+            owner=test_user
+        )
+        for index in range(25)
+    ]
+
+
+@pytest.mark.django_db
+class TestAsyncItemViews:
+
+    def test_item_list_matches_sync_endpoint(self, token_client, test_items):
+        for params in ({}, {"page": 2}, {"ordering": "-weight", "search": "titanium"}):
+            sync_response = token_client.get(reverse("gear_items:item-list"), params)
+            response = token_client.get(reverse("gear_items:async-item-list"), params)
+
+            assert response.status_code == status.HTTP_200_OK
+            expected = json.loads(sync_response.content)
+            actual = json.loads(response.content)
+            assert actual["count"] == expected["count"]
+            assert actual["results"] == expected["results"]
+            assert (actual["next"] is None) == (expected["next"] is None)
+
+    def test_item_list_invalid_page(self, token_client, test_items):
+        response = token_client.get(reverse("gear_items:async-item-list"), {"page": 10})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_item_search_matches_sync_endpoint(self, token_client, test_items):
+        params = {"q": "titanium", "sort_by": "weight", "desc": "true"}
+        sync_response = token_client.get(reverse("gear_items:item-search"), params)
+        response = token_client.get(reverse("gear_items:async-item-search"), params)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content) == json.loads(sync_response.content)
+
+    def test_item_search_requires_authentication(self):
+        response = APIClient().get(reverse("gear_items:async-item-search"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,116 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from gear_items.compiled import CompiledCategorySerializer, CompiledItemSerializer
+from gear_items.models import Category, Item
+from gear_items.serializers import CategorySerializer, ItemSerializer
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="oz"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def test_items(test_user):
+    category = Category.objects.create(name="Shelter", color="#FF5733", owner=test_user)
+    Category.objects.create(name="Empty", owner=test_user)
+    return [
+        Item.objects.create(
+            name="Tent", description="Two person", weight="1234.56", weight_unit="g",
+            category=category, price="399.99", url="https://example.com/tent",
+            image="gear_images/tent.jpg", owner=test_user
+        ),
+        Item.objects.create(
+            name="Stakes", weight="3.10", weight_unit="oz", category=category, owner=test_user
+        ),
+        Item.objects.create(
+            name="Snacks", weight="450", is_consumable=True, owner=test_user
+        ),
+    ]
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestCompiledSerializers:
+
+    def test_item_parity(self, test_user, test_items):
+        request = RequestFactory().get("/")
+        request.user = test_user
+        context = {"request": request}
+        queryset = Item.objects.filter(owner=test_user)
+
+        expected = ItemSerializer(queryset, many=True, context=context).data
+        compiled = CompiledItemSerializer(context)
+
+        assert render(compiled.render_many(compiled.values(queryset))) == render(expected)
+
+    def test_item_parity_without_request(self, test_items):
+        queryset = Item.objects.all()
+
+        expected = ItemSerializer(queryset, many=True).data
+        compiled = CompiledItemSerializer()
+
+        assert render(compiled.render_many(compiled.values(queryset))) == render(expected)
+
+    def test_category_parity(self, test_user, test_items):
+        queryset = Category.objects.annotate(item_count=Count("items"))
+
+        expected = CategorySerializer(queryset, many=True).data
+        compiled = CompiledCategorySerializer()
+
+        assert render(compiled.render_many(compiled.values(queryset))) == render(expected)
+
+    @pytest.mark.parametrize(
+        "url_name, params",
+        [
+            ("gear_items:item-list", {}),
+            ("gear_items:item-list", {"ordering": "-weight", "is_consumable": "false"}),
+            ("gear_items:item-search", {"q": "t"}),
+            ("gear_items:item-no-category", {}),
+            ("gear_items:category-list", {}),
+        ],
+    )
+    def test_endpoint_bytes_match(self, authenticated_client, test_items, settings, url_name,
+                                  params):
+        url = reverse(url_name)
+
+        settings.COMPILED_SERIALIZERS = False
+        expected = authenticated_client.get(url, params)
+        settings.COMPILED_SERIALIZERS = True
+        response = authenticated_client.get(url, params)
+
+        assert response.status_code == expected.status_code == 200
+        assert response.content == expected.content
+
+    def test_category_items_bytes_match(self, authenticated_client, test_items, settings):
+        url = reverse("gear_items:category-items", args=[test_items[0].category_id])
+
+        settings.COMPILED_SERIALIZERS = False
+        expected = authenticated_client.get(url)
+        settings.COMPILED_SERIALIZERS = True
+        response = authenticated_client.get(url)
+
+        assert response.content == expected.content
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import CategoryViewSet, ItemViewSet
 
 router = DefaultRouter()
@@ -10,5 +11,8 @@ router.register(r'items', ItemViewSet, basename='item')
 app_name = 'gear_items'
 
 urlpatterns = [
+    path('async/items/', async_views.item_list, name='async-item-list'),
+    path('async/items/search/', async_views.item_search, name='async-item-search'),
+    
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GearListsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gear_lists'
+
+    def ready(self):
+        import gear_lists.signals
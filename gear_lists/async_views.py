@@ -0,0 +1,111 @@
+import asyncio
+import json
+import uuid
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.asynchronous import async_api_view, error_response, json_response
+from core.pubsub import broker
+from .events import list_channel
+from .models import GearList
+from .serializers import GearListDetailSerializer, GearListShareSerializer
+
+
+def _visible(user, share_code=None):
+    visible = Q(owner=user) | Q(is_public=True)
+    if share_code:
+        try:
+            visible |= Q(share_code=uuid.UUID(share_code))
+        except (ValueError, TypeError):
+            pass
+    return visible
+
+
+async def _render_detail(request, queryset):
+    try:
+        gear_list = await queryset.aget()
+    except GearList.DoesNotExist:
+        return error_response(_("Not found."), status.HTTP_404_NOT_FOUND)
+
+    serializer = GearListDetailSerializer(gear_list, context={'request': request})
+    return json_response(serializer.data)
+
+
+@async_api_view(['GET'])
+async def gear_list_detail(request, pk):
+    visible = _visible(request.user, request.GET.get('share_code'))
+    return await _render_detail(request, GearList.objects.with_list_items().filter(visible, pk=pk))
+
+
+@async_api_view(['POST'])
+async def shared_gear_list(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        raise ParseError()
+
+    serializer = GearListShareSerializer(data=data)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+    share_code = serializer.validated_data['share_code']
+    return await _render_detail(
+        request, GearList.objects.with_list_items().filter(share_code=share_code)
+    )
+
+
+def _sse_event(event_type, data):
+    payload = json.dumps(data, cls=JSONEncoder, separators=(',', ':'))
+    return f'event: {event_type}\ndata: {payload}\n\n'
+
+
+async def _list_events(channel):
+    async with broker.listen(channel, settings.SSE_QUEUE_SIZE) as subscription:
+        yield f'retry: {settings.SSE_RETRY_MS}\n\n'
+        while True:
+            try:
+                message = await subscription.get(timeout=settings.SSE_KEEPALIVE)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection.
+                yield ': keepalive\n\n'
+                continue
+
+            if subscription.overflowed:
+                # Events were dropped; the client reloads the list instead.
+                subscription.reset()
+                yield _sse_event('resync', {})
+            else:
+                yield _sse_event(message['type'], message)
+
+
+@async_api_view(['GET'])
+async def gear_list_events(request, pk):
+    """
+    Server-Sent Events stream of the changes made to a list: one event per
+    created, updated, deleted or reordered list item with the changed
+    fields and the list's new totals, and ``resync`` when the client fell
+    behind and should reload the list.
+    """
+    visible = _visible(request.user, request.GET.get('share_code'))
+    if not await GearList.objects.filter(visible, pk=pk).aexists():
+        return error_response(_("Not found."), status.HTTP_404_NOT_FOUND)
+
+    # Under WSGI the stream would hold a worker thread for its whole life.
+    if not isinstance(request, ASGIRequest):
+        return error_response(
+            _("Event streams require the ASGI application."), status.HTTP_501_NOT_IMPLEMENTED
+        )
+
+    response = StreamingHttpResponse(
+        _list_events(list_channel(pk)), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,193 @@
+from operator import itemgetter
+
+from core.compiled import CompiledSerializer
+from core.instrumentation import time_serialization
+from core.tracing import span
+from gear_items.compiled import CompiledItemSerializer
+from gear_items.models import normalize_weight
+from .models import ListItem
+from .serializers import (
+    GearListDetailSerializer,
+    GearListNormalizedSerializer,
+    GearListSerializer,
+    ListItemSerializer,
+    NormalizedCategorySerializer,
+    NormalizedItemSerializer,
+    NormalizedListItemSerializer,
+)
+
+
+class CompiledListItemSerializer(CompiledSerializer):
+    serializer_class = ListItemSerializer
+
+    def __init__(self, context=None, prefix="", path="", weight_unit=None):
+        # The list's unit is known when rendering a list's own items, which
+        # saves joining the gear list for every row.
+        self.weight_unit = weight_unit
+        super().__init__(context, prefix, path)
+
+    def nested_fields(self):
+        return {
+            "item_details": CompiledItemSerializer(
+                self.context, self.prefix + "item__", self.child_path("item_details")
+            )
+        }
+
+    def computed_fields(self):
+        weight = self.prefix + "item__weight"
+        weight_unit = self.prefix + "item__weight_unit"
+        quantity = self.prefix + "quantity"
+        list_unit = self.prefix + "gear_list__weight_unit"
+
+        target_unit = self.weight_unit
+        if target_unit:
+            def total_weight(row):
+                item_weight = normalize_weight(row[weight], row[weight_unit], target_unit)
+                return round(item_weight * row[quantity], 2)
+            columns = (weight, weight_unit, quantity)
+        else:
+            def total_weight(row):
+                item_weight = normalize_weight(row[weight], row[weight_unit], row[list_unit])
+                return round(item_weight * row[quantity], 2)
+            columns = (weight, weight_unit, quantity, list_unit)
+
+        return {"total_weight": (columns, total_weight)}
+
+
+class CompiledGearListSerializer(CompiledSerializer):
+    serializer_class = GearListSerializer
+
+    def computed_fields(self):
+        column = self.prefix + "items_count"
+        return {"items_count": ((column,), itemgetter(column))}
+
+
+class CompiledNormalizedListItemSerializer(CompiledListItemSerializer):
+    serializer_class = NormalizedListItemSerializer
+
+    def nested_fields(self):
+        return {}
+
+
+class CompiledNormalizedItemSerializer(CompiledItemSerializer):
+    serializer_class = NormalizedItemSerializer
+
+
+class CompiledNormalizedCategorySerializer(CompiledSerializer):
+    serializer_class = NormalizedCategorySerializer
+
+
+def _reference_map(compiled, rows):
+    # One entry per distinct related row, in order of first appearance.
+    key = compiled.prefix + "id"
+    references = {}
+    for row in rows:
+        pk = row[key]
+        if pk is not None and pk not in references:
+            references[pk] = compiled.render(row)
+    return {str(pk): data for pk, data in references.items()}
+
+
+TOTALS = ("total_worn_weight", "total_base_weight", "total_consumables_weight")
+TOTAL_COLUMNS = ("item__weight", "item__weight_unit", "quantity", "is_worn", "item__is_consumable")
+
+
+class CompiledGearListDetailSerializer:
+    """
+    Same output as ``GearListDetailSerializer`` for one list, with its items
+    loaded in a single ``.values()`` query and the weight totals computed
+    from those rows. Items are not queried at all when the field selection
+    leaves out both ``list_items`` and the totals.
+
+    With ``normalized`` the output matches ``GearListNormalizedSerializer``
+    instead: the item and category maps come from the same rows.
+    """
+
+    def __init__(self, context=None, normalized=False):
+        self.context = context or {}
+        self.normalized = normalized
+        self.serializer_class = (
+            GearListNormalizedSerializer if normalized else GearListDetailSerializer
+        )
+
+    def render(self, gear_list):
+        with time_serialization(), span(type(self).__name__, "serializer"):
+            return self._render(gear_list)
+
+    def _render(self, gear_list):
+        selection = self.context.get("field_selection")
+
+        def includes(name, nested=False):
+            return selection is None or selection.includes("", name, nested)
+
+        totals = [name for name in TOTALS if includes(name)]
+        columns = list(TOTAL_COLUMNS) if totals else []
+
+        def add_columns(compiled):
+            columns.extend(column for column in compiled.columns if column not in columns)
+            return compiled
+
+        list_items = None
+        if includes("list_items", nested=True):
+            list_item_class = (
+                CompiledNormalizedListItemSerializer
+                if self.normalized
+                else CompiledListItemSerializer
+            )
+            list_items = add_columns(
+                list_item_class(self.context, path="list_items", weight_unit=gear_list.weight_unit)
+            )
+
+        references = []
+        if self.normalized:
+            context = {**self.context, "field_selection": None}
+            if includes("items"):
+                references.append(
+                    ("items", add_columns(CompiledNormalizedItemSerializer(context, "item__")))
+                )
+            if includes("categories"):
+                references.append(
+                    (
+                        "categories",
+                        add_columns(
+                            CompiledNormalizedCategorySerializer(context, "item__category__")
+                        ),
+                    )
+                )
+
+        rows = None
+        if list_items is not None or totals or references:
+            rows = list(ListItem.objects.filter(gear_list=gear_list).values(*columns))
+
+        summary = CompiledGearListSerializer(self.context)
+        extra = {}
+        if "items_count" in summary.columns:
+            extra["items_count"] = len(rows) if rows is not None else gear_list.list_items.count()
+        data = summary.render(summary.instance_row(gear_list, **extra))
+        if list_items is not None:
+            data["list_items"] = list_items.render_many(rows)
+        if totals:
+            weights = self._totals(gear_list, rows)
+            data.update((name, weights[name]) for name in totals)
+        for name, compiled in references:
+            data[name] = _reference_map(compiled, rows)
+        return data
+
+    def _totals(self, gear_list, rows):
+        # Same accumulation order as the serializer's method fields, so the
+        # float results are identical.
+        unit = gear_list.weight_unit
+        worn = base = consumables = 0
+        for row in rows:
+            item_weight = normalize_weight(row["item__weight"], row["item__weight_unit"], unit)
+            if row["is_worn"]:
+                worn += item_weight * row["quantity"]
+            if not row["is_worn"] and not row["item__is_consumable"]:
+                base += item_weight * row["quantity"]
+            if row["item__is_consumable"]:
+                consumables += item_weight * row["quantity"]
+        return {
+            "total_worn_weight": round(worn, 2),
+            "total_base_weight": round(base, 2),
+            "total_consumables_weight": round(consumables, 2),
+        }
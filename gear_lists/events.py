@@ -0,0 +1,70 @@
+from django.db import transaction
+
+from core.pubsub import broker
+
+LIST_ITEM_CREATED = "list_item.created"
+LIST_ITEM_UPDATED = "list_item.updated"
+LIST_ITEM_DELETED = "list_item.deleted"
+LIST_ITEMS_REORDERED = "list_items.reordered"
+
+# Fields sent for a save without ``update_fields``.
+EVENT_FIELDS = ("item", "quantity", "is_worn", "is_packed", "notes", "order")
+
+
+def list_channel(gear_list_id):
+    return f"gear_list:{gear_list_id}"
+
+
+def list_totals(gear_list):
+    total_weight = gear_list.total_weight
+    return {
+        "total_weight": round(float(total_weight), 2) if total_weight is not None else None,
+        "weight_unit": gear_list.weight_unit,
+    }
+
+
+def publish_list_event(gear_list, event_type, **data):
+    """
+    Publish a change of ``gear_list`` to its event stream once the current
+    transaction commits. The totals are read then, after the list's weight
+    has been recomputed.
+    """
+    channel = list_channel(gear_list.pk)
+
+    def publish():
+        broker.publish(
+            channel,
+            {"type": event_type, **data, "totals": list_totals(gear_list)},
+        )
+
+    transaction.on_commit(publish)
+
+
+def publish_list_item_saved(list_item, created, update_fields=None):
+    names = EVENT_FIELDS if created or not update_fields else update_fields
+    fields = {}
+    for name in names:
+        field = list_item._meta.get_field(name)
+        if field.name in EVENT_FIELDS:
+            fields[field.name] = getattr(list_item, field.attname)
+
+    if created or fields:
+        publish_list_event(
+            list_item.gear_list,
+            LIST_ITEM_CREATED if created else LIST_ITEM_UPDATED,
+            list_item=list_item.pk,
+            version=list_item.version,
+            fields=fields,
+        )
+
+
+def publish_list_item_deleted(list_item):
+    publish_list_event(list_item.gear_list, LIST_ITEM_DELETED, list_item=list_item.pk)
+
+
+def publish_list_items_reordered(gear_list, list_items):
+    publish_list_event(
+        gear_list,
+        LIST_ITEMS_REORDERED,
+        order=[list_item.pk for list_item in sorted(list_items, key=lambda row: row.order)],
+    )
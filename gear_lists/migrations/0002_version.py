@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-19 05:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gear_lists", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gearlist",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name="version"),
+        ),
+        migrations.AddField(
+            model_name="listitem",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name="version"),
+        ),
+    ]
@@ -1,12 +1,66 @@
 import uuid
-from django.db import models
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 
+from core.invalidation import LIST, USER, bus, change_key
+from core.metrics import WEIGHT_RECOMPUTES
+from core.models import VersionedModel
+from core.tracing import traced
 from gear_items.models import Item
+from sync.models import LIST_ITEMS, LISTS, Change
 
+OZ_IN_GRAMS = Decimal("28.35")
+WEIGHT_PRECISION = Decimal("0.01")
 
-class GearList(models.Model):
+_dirty_lists = ContextVar("dirty_gear_lists", default=None)
+
+
+class GearListQuerySet(models.QuerySet):
+    
+    def with_list_items(self):
+        return self.prefetch_related(
+            models.Prefetch(
+                "list_items",
+                queryset=ListItem.objects.select_related("item__category"),
+            )
+        )
+    
+    def with_items_count(self):
+        return self.annotate(items_count=models.Count("list_items"))
+    
+    def with_computed_total_weight(self):
+        # Same conversion as ``normalize_weight``, in exact decimal arithmetic.
+        item_weight = models.Case(
+            models.When(
+                item__weight_unit=models.OuterRef("weight_unit"), then=models.F("item__weight")
+            ),
+            models.When(item__weight_unit="oz", then=models.F("item__weight") * OZ_IN_GRAMS),
+            default=models.F("item__weight") / OZ_IN_GRAMS,
+            output_field=models.DecimalField(),
+        )
+        totals = (
+            ListItem.objects.filter(gear_list=models.OuterRef("pk"))
+            .order_by()
+            .values("gear_list")
+            .annotate(total=models.Sum(item_weight * models.F("quantity")))
+            .values("total")
+        )
+        return self.order_by().annotate(
+            computed_total_weight=Coalesce(
+                models.Subquery(totals, output_field=models.DecimalField()),
+                models.Value(Decimal(0)),
+                output_field=models.DecimalField(),
+            )
+        )
+
+
+class GearList(VersionedModel):
     name = models.CharField(_("name"), max_length=255)
     description = models.TextField(_("description"), blank=True)
     owner = models.ForeignKey(
@@ -33,6 +87,10 @@ class GearList(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = GearListQuerySet.as_manager()
+    
+    derived_fields = ("total_weight",)
+    
     class Meta:
         verbose_name = _("gear list")
         verbose_name_plural = _("gear lists")
@@ -41,19 +99,46 @@ class GearList(models.Model):
     def __str__(self):
         return self.name
     
+    @traced("GearList.calculate_total_weight", "model")
     def calculate_total_weight(self):
-        total = 0
-        for list_item in self.list_items.all():
-            item_weight = list_item.item.get_normalized_weight(self.weight_unit)
-            item_quantity = list_item.quantity
-            total += item_weight * item_quantity
-        
-        self.total_weight = total
-        self.save(update_fields=["total_weight"])
-        return total
-
-
-class ListItem(models.Model):
+        recompute_total_weights([self])
+        return float(self.total_weight)
+    
+    def copy(self, owner, name, include_items=True):
+        """
+        Private copy of this list owned by ``owner``, with the list items
+        of ``owner``'s own gear when ``include_items`` is set.
+        """
+        with deferred_weight_recompute():
+            new_list = GearList.objects.create(
+                name=name,
+                description=self.description,
+                owner=owner,
+                is_public=False,
+                weight_unit=owner.weight_unit
+            )
+            
+            if include_items:
+                copies = ListItem.objects.bulk_create([
+                    ListItem(
+                        gear_list=new_list,
+                        item_id=list_item.item_id,
+                        quantity=list_item.quantity,
+                        is_worn=list_item.is_worn,
+                        is_packed=list_item.is_packed,
+                        notes=list_item.notes,
+                        order=list_item.order
+                    )
+                    for list_item in self.list_items.filter(item__owner=owner)
+                ])
+                Change.objects.record(owner.id, LIST_ITEMS, [list_item.id for list_item in copies])
+            
+            # The rows skip ListItem.save, so the total is computed once here.
+            mark_weight_dirty(new_list)
+        return new_list
+
+
+class ListItem(VersionedModel):
     gear_list = models.ForeignKey(
         GearList,
         on_delete=models.CASCADE,
@@ -80,5 +165,89 @@ class ListItem(models.Model):
         return f"{self.item.name} in {self.gear_list.name}"
     
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        self.gear_list.calculate_total_weight()
+        # Change events are published on commit, after the new total is set.
+        with deferred_weight_recompute():
+            super().save(*args, **kwargs)
+            mark_weight_dirty(self.gear_list)
+
+
+@contextmanager
+def deferred_weight_recompute():
+    """
+    Run the block in a transaction and recompute the total weight of every
+    list marked with :func:`mark_weight_dirty` inside it once, with one
+    query for all of them, right before the transaction commits. Nested
+    blocks join the outermost one.
+    """
+    if _dirty_lists.get() is not None:
+        yield
+        return
+
+    token = _dirty_lists.set({})
+    try:
+        with transaction.atomic(savepoint=False):
+            yield
+            dirty = _dirty_lists.get()
+            _dirty_lists.reset(token)
+            token = None
+            recompute_total_weights(
+                gear_list for gear_lists in dirty.values() for gear_list in gear_lists
+            )
+    finally:
+        if token is not None:
+            _dirty_lists.reset(token)
+
+
+def mark_weight_dirty(gear_list):
+    """
+    Recompute the total weight of ``gear_list`` when the current
+    :func:`deferred_weight_recompute` block ends, or now outside of one.
+    """
+    dirty = _dirty_lists.get()
+    if dirty is None:
+        recompute_total_weights([gear_list])
+        return
+    instances = dirty.setdefault(gear_list.pk, [])
+    if not any(instance is gear_list for instance in instances):
+        instances.append(gear_list)
+
+
+@traced("GearList.recompute_total_weights", "model")
+def recompute_total_weights(gear_lists):
+    """
+    Store the total weight of ``gear_lists`` and set it on the instances.
+
+    Totals are computed by the database in one query and only the lists
+    whose total changed are written, with a single ``UPDATE``; their change
+    is logged for sync and announced on the invalidation bus.
+    """
+    instances = defaultdict(list)
+    for gear_list in gear_lists:
+        instances[gear_list.pk].append(gear_list)
+    if not instances:
+        return
+
+    WEIGHT_RECOMPUTES.inc(len(instances))
+    rows = GearList.objects.filter(pk__in=instances).with_computed_total_weight().values_list(
+        "id", "owner_id", "total_weight", "computed_total_weight"
+    )
+    changed = defaultdict(list)
+    for pk, owner_id, stored, total in rows:
+        total = total.quantize(WEIGHT_PRECISION)
+        for gear_list in instances[pk]:
+            gear_list.total_weight = total
+        if stored != total:
+            changed[owner_id].append(instances[pk][0])
+
+    if not changed:
+        return
+    GearList.objects.bulk_update(
+        [gear_list for owner_lists in changed.values() for gear_list in owner_lists],
+        ["total_weight"],
+    )
+    keys = []
+    for owner_id, owner_lists in changed.items():
+        Change.objects.record(owner_id, LISTS, [gear_list.pk for gear_list in owner_lists])
+        keys.append(change_key(USER, owner_id))
+        keys.extend(change_key(LIST, gear_list.pk) for gear_list in owner_lists)
+    bus.publish(*keys)
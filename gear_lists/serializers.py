@@ -1,22 +1,26 @@
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from core.sparse import SparseFieldsMixin
 from gear_items.models import Item
-from gear_items.serializers import ItemSerializer
+from gear_items.serializers import CategorySerializer, ItemSerializer
 from .models import GearList, ListItem
 
 
-class ListItemSerializer(serializers.ModelSerializer):
+class ListItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     item_details = ItemSerializer(source='item', read_only=True)
     total_weight = serializers.SerializerMethodField()
+    column_dependencies = {
+        'total_weight': ['quantity', 'gear_list__weight_unit', 'item__weight', 'item__weight_unit']
+    }
     
     class Meta:
         model = ListItem
         fields = [
             'id', 'gear_list', 'item', 'item_details', 'quantity', 
-            'is_worn', 'is_packed', 'notes', 'order', 'total_weight'
+            'is_worn', 'is_packed', 'notes', 'order', 'total_weight', 'version'
         ]
-        read_only_fields = ['id', 'total_weight']
+        read_only_fields = ['id', 'total_weight', 'version']
     
     def get_total_weight(self, obj):
         target_unit = obj.gear_list.weight_unit
@@ -55,19 +59,23 @@ class ListItemSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class GearListSerializer(serializers.ModelSerializer):
+class GearListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     items_count = serializers.SerializerMethodField()
+    column_dependencies = {'items_count': []}
     
     class Meta:
         model = GearList
         fields = [
             'id', 'name', 'description', 'owner', 'is_public', 'share_code',
-            'total_weight', 'weight_unit', 'items_count', 'created_at', 'updated_at'
+            'total_weight', 'weight_unit', 'items_count', 'created_at', 'updated_at', 'version'
         ]
         read_only_fields = ['id', 'owner', 'share_code', 'total_weight', 'items_count', 
-                           'created_at', 'updated_at']
+                           'created_at', 'updated_at', 'version']
     
     def get_items_count(self, obj):
+        items_count = getattr(obj, 'items_count', None)
+        if items_count is not None:
+            return items_count
         return obj.list_items.count()
     
     def create(self, validated_data):
@@ -84,6 +92,12 @@ class GearListDetailSerializer(GearListSerializer):
     total_worn_weight = serializers.SerializerMethodField()
     total_base_weight = serializers.SerializerMethodField()
     total_consumables_weight = serializers.SerializerMethodField()
+    column_dependencies = {
+        'items_count': [],
+        'total_worn_weight': ['weight_unit'],
+        'total_base_weight': ['weight_unit'],
+        'total_consumables_weight': ['weight_unit'],
+    }
     
     class Meta(GearListSerializer.Meta):
         fields = GearListSerializer.Meta.fields + [
@@ -92,16 +106,17 @@ class GearListDetailSerializer(GearListSerializer):
     
     def get_total_worn_weight(self, obj):
         total = 0
-        for list_item in obj.list_items.filter(is_worn=True):
-            item_weight = list_item.item.get_normalized_weight(obj.weight_unit)
-            total += item_weight * list_item.quantity
+        for list_item in obj.list_items.all():
+            if list_item.is_worn:
+                item_weight = list_item.item.get_normalized_weight(obj.weight_unit)
+                total += item_weight * list_item.quantity
         return round(total, 2)
     
     def get_total_base_weight(self, obj):
         total = 0
-        for list_item in obj.list_items.filter(is_worn=False):
+        for list_item in obj.list_items.all():
             item = list_item.item
-            if not item.is_consumable:
+            if not list_item.is_worn and not item.is_consumable:
                 item_weight = item.get_normalized_weight(obj.weight_unit)
                 total += item_weight * list_item.quantity
         return round(total, 2)
@@ -116,9 +131,81 @@ class GearListDetailSerializer(GearListSerializer):
         return round(total, 2)
 
 
+class NormalizedItemSerializer(ItemSerializer):
+    category_name = None
+    category_color = None
+    
+    class Meta(ItemSerializer.Meta):
+        fields = [
+            field for field in ItemSerializer.Meta.fields
+            if field not in ('category_name', 'category_color')
+        ]
+
+
+class NormalizedCategorySerializer(CategorySerializer):
+    item_count = None
+    
+    class Meta(CategorySerializer.Meta):
+        fields = ['id', 'name', 'description', 'color']
+
+
+class NormalizedListItemSerializer(ListItemSerializer):
+    item_details = None
+    
+    class Meta(ListItemSerializer.Meta):
+        fields = [field for field in ListItemSerializer.Meta.fields if field != 'item_details']
+
+
+class GearListNormalizedSerializer(GearListDetailSerializer):
+    """
+    List detail with every item and category rendered once, in ``items`` and
+    ``categories`` maps keyed by id, and list items referencing them.
+    """
+    list_items = NormalizedListItemSerializer(many=True, read_only=True)
+    items = serializers.SerializerMethodField()
+    categories = serializers.SerializerMethodField()
+    column_dependencies = {
+        **GearListDetailSerializer.column_dependencies,
+        'items': [],
+        'categories': [],
+    }
+    
+    class Meta(GearListDetailSerializer.Meta):
+        fields = GearListDetailSerializer.Meta.fields + ['items', 'categories']
+    
+    def _reference_context(self):
+        # The maps are rendered by their own root serializers, which must
+        # not apply the list's field selection.
+        return {**self.context, 'field_selection': None}
+    
+    def get_items(self, obj):
+        items = {}
+        for list_item in obj.list_items.all():
+            items.setdefault(list_item.item_id, list_item.item)
+        data = NormalizedItemSerializer(
+            list(items.values()), many=True, context=self._reference_context()
+        ).data
+        return {str(item_id): item for item_id, item in zip(items, data)}
+    
+    def get_categories(self, obj):
+        categories = {}
+        for list_item in obj.list_items.all():
+            category = list_item.item.category
+            if category is not None:
+                categories.setdefault(category.id, category)
+        data = NormalizedCategorySerializer(
+            list(categories.values()), many=True, context=self._reference_context()
+        ).data
+        return {str(category_id): category for category_id, category in zip(categories, data)}
+
+
 class GearListCopySerializer(serializers.Serializer):
     name = serializers.CharField(max_length=255, required=True)
     include_items = serializers.BooleanField(default=True)
+    background = serializers.BooleanField(
+        default=False,
+        help_text=_("Copy in a background job and answer 202 with the job.")
+    )
     
     def validate_name(self, value):
         if not value.strip():
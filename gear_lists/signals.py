@@ -0,0 +1,63 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.invalidation import LIST, USER, bus, change_key
+from gear_items.models import Item
+from jobs.registry import enqueue
+from .events import publish_list_item_deleted, publish_list_item_saved
+from .models import GearList, ListItem
+
+
+@receiver(post_save, sender=ListItem)
+def list_item_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    publish_list_item_saved(instance, created, update_fields)
+
+
+@receiver(post_delete, sender=ListItem)
+def list_item_deleted(sender, instance, origin=None, **kwargs):
+    # Nobody follows the items of a list that is being deleted.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is GearList:
+        return
+    publish_list_item_deleted(instance)
+
+
+@receiver(post_save, sender=GearList)
+@receiver(post_delete, sender=GearList)
+def invalidate_gear_list(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bus.publish(change_key(LIST, instance.pk), change_key(USER, instance.owner_id))
+
+
+@receiver(post_save, sender=ListItem)
+@receiver(post_delete, sender=ListItem)
+def invalidate_list_item(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bus.publish(change_key(LIST, instance.gear_list_id))
+
+
+@receiver(post_save, sender=Item)
+def recompute_item_lists(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and not {"weight", "weight_unit"} & set(update_fields):
+        return
+    # Lists holding a popular item can be many; their totals follow shortly.
+    if ListItem.objects.filter(item=instance).exists():
+        enqueue("gear_lists.recompute_weights", item=instance.pk)
+
+
+@receiver(pre_delete, sender=Item)
+def recompute_deleted_item_lists(sender, instance, origin=None, **kwargs):
+    # Lists deleted along with their owner need no new totals.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is not Item:
+        return
+    gear_lists = sorted(set(
+        ListItem.objects.filter(item=instance).values_list("gear_list_id", flat=True)
+    ))
+    if gear_lists:
+        enqueue("gear_lists.recompute_weights", gear_lists=gear_lists)
@@ -0,0 +1,35 @@
+from django.db import transaction
+
+from jobs.registry import task
+from .models import GearList, recompute_total_weights
+
+RECOMPUTE_BATCH_SIZE = 500
+
+
+@task("gear_lists.copy")
+def copy_gear_list(job, gear_list, name, include_items=True):
+    original = GearList.objects.get(pk=gear_list)
+    new_list = original.copy(job.user, name, include_items)
+    return {"gear_list": new_list.pk}
+
+
+@task("gear_lists.recompute_weights")
+def recompute_weights(job, gear_lists=None, item=None):
+    """
+    Recompute the stored total weight of the lists in ``gear_lists``, or of
+    those holding ``item``, a batch at a time.
+    """
+    queryset = GearList.objects.order_by("pk")
+    if gear_lists is not None:
+        queryset = queryset.filter(pk__in=gear_lists)
+    if item is not None:
+        queryset = queryset.filter(list_items__item=item)
+    ids = list(queryset.values_list("pk", flat=True).distinct())
+
+    for start in range(0, len(ids), RECOMPUTE_BATCH_SIZE):
+        batch = ids[start:start + RECOMPUTE_BATCH_SIZE]
+        with transaction.atomic():
+            recompute_total_weights(GearList.objects.filter(pk__in=batch).only("pk", "owner_id"))
+        done = start + len(batch)
+        job.report_progress(done, len(ids), f"{done} of {len(ids)} lists")
+    return {"gear_lists": len(ids)}
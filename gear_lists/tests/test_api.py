@@ -146,6 +146,22 @@ class TestGearListAPI:
         assert len(response.data["list_items"]) == 1
         assert response.data["list_items"][0]["item"] == test_list_item.item.id
     
+    def test_retrieve_normalized_gear_list(self, authenticated_client, test_gear_list,
+                                           test_list_item, test_category):
+        url = reverse("gear_lists:gear_list-detail", kwargs={"pk": test_gear_list.id})
+        
+        response = authenticated_client.get(url, {"normalized": "true"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        list_item = response.data["list_items"][0]
+        assert "item_details" not in list_item
+        item = response.data["items"][str(list_item["item"])]
+        assert item["name"] == "Test Item"
+        assert "category_name" not in item
+        category = response.data["categories"][str(item["category"])]
+        assert category["name"] == test_category.name
+        assert category["color"] == test_category.color
+    
     def test_update_gear_list(self, authenticated_client, test_gear_list):
         url = reverse("gear_lists:gear_list-detail", kwargs={"pk": test_gear_list.id})
         data = {
@@ -302,4 +318,25 @@ class TestListItemAPI:
         test_list_item.refresh_from_db()
         second_list_item.refresh_from_db()
         assert test_list_item.order == 1
-        assert second_list_item.order == 0
\ No newline at end of file
+        assert second_list_item.order == 0
+    
+    def test_reorder_accepts_string_ids(self, authenticated_client, test_list_item):
+        url = reverse("gear_lists:list_item-reorder")
+        
+        response = authenticated_client.post(
+            url, {"items_order": [str(test_list_item.id)]}, format="json"
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        test_list_item.refresh_from_db()
+        assert test_list_item.order == 0
+    
+    def test_reorder_rejects_non_integer_ids(self, authenticated_client, test_list_item):
+        url = reverse("gear_lists:list_item-reorder")
+        
+        response = authenticated_client.post(
+            url, {"items_order": [test_list_item.id, "abc"]}, format="json"
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["detail"] == "Invalid data format. Expected a list of item IDs."
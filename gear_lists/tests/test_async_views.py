@@ -0,0 +1,233 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.pubsub import broker
+from gear_items.models import Category, Item
+from gear_lists.events import list_channel
+from gear_lists.models import GearList, ListItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def another_user():
+    return User.objects.create_user(
+        username="anotheruser",
+        email="another@example.com",
+        password="anotherpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def token_client(test_user):
+    token, _ = Token.objects.get_or_create(user=test_user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+@pytest.fixture
+def test_gear_list(test_user):
+    category = Category.objects.create(name="Shelter", owner=test_user)
+    gear_list = GearList.objects.create(name="Test Gear List", owner=test_user, weight_unit="g")
+    for index, weight in enumerate([100, 250, 40]):
+        item = Item.objects.create(
+            name=f"Item {index}",
+            weight=weight,
+            weight_unit="oz" if index == 2 else "g",
+            category=category if index else None,
+            is_consumable=index == 1,
+            owner=test_user
+        )
+        ListItem.objects.create(
+            gear_list=gear_list, item=item, quantity=index + 1, is_worn=index == 0, order=index
+        )
+    return gear_list
+
+
+@pytest.fixture
+def private_gear_list(another_user):
+    return GearList.objects.create(name="Private Gear List", owner=another_user)
+
+
+@pytest.mark.django_db
+class TestAsyncGearListViews:
+
+    def test_detail_matches_sync_endpoint(self, token_client, test_gear_list):
+        sync_response = token_client.get(
+            reverse("gear_lists:gear_list-detail", kwargs={"pk": test_gear_list.id})
+        )
+        response = token_client.get(
+            reverse("gear_lists:async-gear-list-detail", kwargs={"pk": test_gear_list.id})
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content) == json.loads(sync_response.content)
+
+    def test_detail_hides_private_lists(self, token_client, private_gear_list):
+        response = token_client.get(
+            reverse("gear_lists:async-gear-list-detail", kwargs={"pk": private_gear_list.id})
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_detail_with_share_code(self, token_client, private_gear_list):
+        response = token_client.get(
+            reverse("gear_lists:async-gear-list-detail", kwargs={"pk": private_gear_list.id}),
+            {"share_code": str(private_gear_list.share_code)}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content)["name"] == private_gear_list.name
+
+    def test_detail_requires_authentication(self, test_gear_list):
+        response = APIClient().get(
+            reverse("gear_lists:async-gear-list-detail", kwargs={"pk": test_gear_list.id})
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_shared_list(self, token_client, private_gear_list):
+        response = token_client.post(
+            reverse("gear_lists:async-gear-list-shared"),
+            {"share_code": str(private_gear_list.share_code)},
+            format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content)["name"] == private_gear_list.name
+
+    def test_shared_list_invalid_code(self, token_client):
+        response = token_client.post(
+            reverse("gear_lists:async-gear-list-shared"),
+            {"share_code": "not-a-uuid"},
+            format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.fixture
+def list_events(test_gear_list):
+    received = []
+    unsubscribe = broker.subscribe(list_channel(test_gear_list.id), received.append)
+    yield received
+    unsubscribe()
+
+
+@pytest.mark.django_db
+class TestGearListEvents:
+
+    def test_update_publishes_fields_and_totals(self, test_gear_list, list_events,
+                                                django_capture_on_commit_callbacks):
+        list_item = test_gear_list.list_items.get(order=0)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            list_item.quantity = 3
+            list_item.save(update_fields=["quantity"])
+
+        assert list_events == [{
+            "type": "list_item.updated",
+            "list_item": list_item.id,
+            "version": 2,
+            "fields": {"quantity": 3},
+            "totals": {"total_weight": 4202.0, "weight_unit": "g"},
+        }]
+
+    def test_create_and_delete(self, test_user, test_gear_list, list_events,
+                               django_capture_on_commit_callbacks):
+        item = Item.objects.create(name="Stove", weight=80, owner=test_user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            list_item = ListItem.objects.create(gear_list=test_gear_list, item=item, order=3)
+        list_item_id = list_item.id
+        with django_capture_on_commit_callbacks(execute=True):
+            list_item.delete()
+
+        created, deleted = list_events
+        assert created["type"] == "list_item.created"
+        assert created["fields"] == {
+            "item": item.id, "quantity": 1, "is_worn": False, "is_packed": False,
+            "notes": "", "order": 3,
+        }
+        assert deleted == {
+            "type": "list_item.deleted",
+            "list_item": list_item_id,
+            "totals": {"total_weight": created["totals"]["total_weight"], "weight_unit": "g"},
+        }
+
+    def test_deleting_the_list_publishes_nothing(self, test_gear_list, list_events,
+                                                 django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            test_gear_list.delete()
+
+        assert list_events == []
+
+    def test_reorder(self, token_client, test_gear_list, list_events,
+                     django_capture_on_commit_callbacks):
+        ids = list(test_gear_list.list_items.values_list("id", flat=True))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            token_client.post(
+                reverse("gear_lists:list_item-reorder"),
+                {"items_order": ids[::-1]},
+                format="json"
+            )
+
+        assert list_events[-1]["type"] == "list_items.reordered"
+        assert list_events[-1]["order"] == ids[::-1]
+
+    def test_stream(self, test_user, test_gear_list):
+        token, _ = Token.objects.get_or_create(user=test_user)
+        url = reverse("gear_lists:async-gear-list-events", kwargs={"pk": test_gear_list.id})
+
+        async def stream():
+            response = await AsyncClient().get(url, headers={"Authorization": f"Token {token.key}"})
+            chunks = aiter(response.streaming_content)
+            first = await anext(chunks)
+            broker.publish(list_channel(test_gear_list.id), {"type": "list_item.updated"})
+            event = await anext(chunks)
+            await response.streaming_content.aclose()
+            return response, first, event
+
+        response, first, event = async_to_sync(stream)()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/event-stream"
+        assert response["Cache-Control"] == "no-cache"
+        assert first == b"retry: 3000\n\n"
+        assert event == b'event: list_item.updated\ndata: {"type":"list_item.updated"}\n\n'
+        assert list_channel(test_gear_list.id) not in broker._subscribers
+
+    def test_stream_hides_private_lists(self, token_client, private_gear_list):
+        response = token_client.get(
+            reverse("gear_lists:async-gear-list-events", kwargs={"pk": private_gear_list.id})
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_stream_requires_asgi(self, token_client, test_gear_list):
+        response = token_client.get(
+            reverse("gear_lists:async-gear-list-events", kwargs={"pk": test_gear_list.id})
+        )
+
+        assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
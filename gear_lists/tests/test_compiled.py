@@ -0,0 +1,147 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from gear_items.models import Category, Item
+from gear_lists.compiled import CompiledGearListDetailSerializer, CompiledListItemSerializer
+from gear_lists.models import GearList, ListItem
+from gear_lists.serializers import (
+    GearListDetailSerializer,
+    GearListNormalizedSerializer,
+    ListItemSerializer,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def test_gear_list(test_user):
+    category = Category.objects.create(name="Shelter", owner=test_user)
+    gear_list = GearList.objects.create(
+        name="Test Gear List", owner=test_user, weight_unit="oz", is_public=True
+    )
+    for index, weight in enumerate(["100.00", "250.50", "40.25", "1.10"]):
+        item = Item.objects.create(
+            name=f"Item {index}",
+            weight=weight,
+            weight_unit="oz" if index == 2 else "g",
+            category=category if index % 2 else None,
+            is_consumable=index == 1,
+            owner=test_user
+        )
+        ListItem.objects.create(
+            gear_list=gear_list, item=item, quantity=index + 1, is_worn=index == 0,
+            notes="Check seams" if index == 3 else "", order=index
+        )
+    return gear_list
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.fixture
+def context(test_user):
+    request = RequestFactory().get("/")
+    request.user = test_user
+    return {"request": request}
+
+
+@pytest.mark.django_db
+class TestCompiledSerializers:
+
+    def test_list_item_parity(self, test_gear_list, context):
+        queryset = ListItem.objects.all()
+
+        expected = ListItemSerializer(queryset, many=True, context=context).data
+        compiled = CompiledListItemSerializer(context)
+
+        assert render(compiled.render_many(compiled.values(queryset))) == render(expected)
+
+    def test_detail_parity(self, test_gear_list, context):
+        expected = GearListDetailSerializer(test_gear_list, context=context).data
+
+        data = CompiledGearListDetailSerializer(context).render(test_gear_list)
+
+        assert render(data) == render(expected)
+
+    def test_empty_detail_parity(self, test_user, context):
+        gear_list = GearList.objects.create(name="Empty", owner=test_user)
+
+        expected = GearListDetailSerializer(gear_list, context=context).data
+
+        assert render(CompiledGearListDetailSerializer(context).render(gear_list)) == render(
+            expected
+        )
+
+    @pytest.mark.parametrize("url_name", ["gear_list-list", "gear_list-detail", "gear_list-items"])
+    def test_endpoint_bytes_match(self, authenticated_client, test_gear_list, settings, url_name):
+        args = [] if url_name == "gear_list-list" else [test_gear_list.id]
+        url = reverse(f"gear_lists:{url_name}", args=args)
+
+        settings.COMPILED_SERIALIZERS = False
+        expected = authenticated_client.get(url)
+        settings.COMPILED_SERIALIZERS = True
+        response = authenticated_client.get(url)
+
+        assert response.status_code == expected.status_code == 200
+        assert response.content == expected.content
+
+    def test_shared_bytes_match(self, authenticated_client, test_gear_list, settings):
+        url = reverse("gear_lists:gear_list-shared")
+        data = {"share_code": str(test_gear_list.share_code)}
+
+        settings.COMPILED_SERIALIZERS = False
+        expected = authenticated_client.post(url, data, format="json")
+        settings.COMPILED_SERIALIZERS = True
+        response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == expected.status_code == 200
+        assert response.content == expected.content
+
+    def test_detail_query_count(self, authenticated_client, test_gear_list,
+                                django_assert_num_queries):
+        url = reverse("gear_lists:gear_list-detail", args=[test_gear_list.id])
+
+        # The list, its owner for the permission check and one query for all items.
+        with django_assert_num_queries(3):
+            authenticated_client.get(url)
+
+    def test_normalized_detail_parity(self, test_gear_list, context):
+        gear_list = GearList.objects.with_list_items().get(pk=test_gear_list.pk)
+        expected = GearListNormalizedSerializer(gear_list, context=context).data
+
+        data = CompiledGearListDetailSerializer(context, normalized=True).render(test_gear_list)
+
+        assert render(data) == render(expected)
+
+    def test_normalized_bytes_match(self, authenticated_client, test_gear_list, settings):
+        url = reverse("gear_lists:gear_list-detail", args=[test_gear_list.id])
+
+        settings.COMPILED_SERIALIZERS = False
+        expected = authenticated_client.get(url, {"normalized": "true"})
+        settings.COMPILED_SERIALIZERS = True
+        response = authenticated_client.get(url, {"normalized": "true"})
+
+        assert response.status_code == expected.status_code == 200
+        assert response.content == expected.content
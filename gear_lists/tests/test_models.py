@@ -0,0 +1,128 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from gear_items.models import Item
+from gear_lists.models import (
+    GearList,
+    ListItem,
+    deferred_weight_recompute,
+    mark_weight_dirty,
+    recompute_total_weights,
+)
+from sync.models import LISTS, Change
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def gear_lists(test_user):
+    grams = GearList.objects.create(name="Grams", owner=test_user, weight_unit="g")
+    ounces = GearList.objects.create(name="Ounces", owner=test_user, weight_unit="oz")
+    for index, (weight, unit) in enumerate([(100, "g"), (10, "oz"), (250.5, "g")]):
+        item = Item.objects.create(
+            name=f"Item {index}", weight=weight, weight_unit=unit, owner=test_user
+        )
+        ListItem.objects.bulk_create([
+            ListItem(gear_list=grams, item=item, quantity=index + 1),
+            ListItem(gear_list=ounces, item=item, quantity=2),
+        ])
+    return grams, ounces
+
+
+def recompute_queries(captured):
+    return [query for query in captured if "computed_total_weight" in query["sql"]]
+
+
+@pytest.mark.django_db
+class TestWeightRecompute:
+
+    def test_totals_for_several_lists_in_one_query(self, gear_lists):
+        grams, ounces = gear_lists
+
+        with CaptureQueriesContext(connection) as captured:
+            recompute_total_weights([grams, ounces])
+
+        assert len(recompute_queries(captured)) == 1
+        assert grams.total_weight == Decimal("1418.50")
+        assert ounces.total_weight == Decimal("44.73")
+        grams.refresh_from_db()
+        assert grams.total_weight == Decimal("1418.50")
+        assert set(Change.objects.filter(kind=LISTS).values_list("object_id", flat=True)) == {
+            grams.id, ounces.id
+        }
+
+    def test_unchanged_totals_are_not_written(self, gear_lists):
+        grams, ounces = gear_lists
+        recompute_total_weights([grams, ounces])
+
+        with CaptureQueriesContext(connection) as captured:
+            recompute_total_weights([grams, ounces])
+
+        assert len(captured) == 1
+
+    def test_empty_list(self, test_user):
+        gear_list = GearList.objects.create(name="Empty", owner=test_user)
+
+        assert gear_list.calculate_total_weight() == 0
+        assert gear_list.total_weight == Decimal("0.00")
+
+    def test_deferred_block_recomputes_each_list_once(self, test_user, gear_lists):
+        grams, ounces = gear_lists
+        item = Item.objects.create(name="Stove", weight=80, owner=test_user)
+
+        with CaptureQueriesContext(connection) as captured:
+            with deferred_weight_recompute():
+                ListItem.objects.create(gear_list=grams, item=item)
+                ListItem.objects.create(gear_list=ounces, item=item)
+                mark_weight_dirty(grams)
+                assert grams.total_weight is None
+
+        assert len(recompute_queries(captured)) == 1
+        assert grams.total_weight == Decimal("1498.50")
+        assert ounces.total_weight == Decimal("47.55")
+
+    def test_deferred_block_skips_recompute_on_error(self, gear_lists):
+        grams, ounces = gear_lists
+
+        # Like ``Model.save``, an error marks the enclosing transaction for
+        # rollback, so the test opens a savepoint of its own.
+        with pytest.raises(ValueError), transaction.atomic():
+            with deferred_weight_recompute():
+                mark_weight_dirty(grams)
+                raise ValueError
+
+        assert grams.total_weight is None
+        mark_weight_dirty(ounces)
+        assert ounces.total_weight == Decimal("44.73")
+
+    def test_copy_recomputes_once(self, test_user, gear_lists):
+        grams, ounces = gear_lists
+        client = APIClient()
+        client.force_authenticate(user=test_user)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post(
+                reverse("gear_lists:gear_list-copy", kwargs={"pk": grams.id}),
+                {"name": "Copy"},
+                format="json"
+            )
+
+        assert response.status_code == 201
+        assert len(recompute_queries(captured)) == 1
+        assert response.data["total_weight"] == "1418.50"
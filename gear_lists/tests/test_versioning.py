@@ -0,0 +1,171 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import StaleObjectError
+from gear_items.models import Item
+from gear_lists.models import GearList, ListItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def test_gear_list(test_user):
+    return GearList.objects.create(name="Weekend", owner=test_user, weight_unit="g")
+
+
+@pytest.fixture
+def test_list_item(test_user, test_gear_list):
+    item = Item.objects.create(name="Tent", weight=1000, owner=test_user)
+    return ListItem.objects.create(gear_list=test_gear_list, item=item)
+
+
+def detail_url(gear_list):
+    return reverse("gear_lists:gear_list-detail", kwargs={"pk": gear_list.id})
+
+
+@pytest.mark.django_db
+class TestVersionedModel:
+
+    def test_save_bumps_version(self, test_list_item):
+        test_list_item.quantity = 2
+        test_list_item.save()
+
+        assert test_list_item.version == 2
+        test_list_item.refresh_from_db()
+        assert test_list_item.version == 2
+
+    def test_reorder_bumps_version(self, authenticated_client, test_list_item):
+        response = authenticated_client.post(
+            reverse("gear_lists:list_item-reorder"),
+            {"items_order": [test_list_item.id]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        test_list_item.quantity = 2
+        with pytest.raises(StaleObjectError), transaction.atomic():
+            test_list_item.save()
+        test_list_item.refresh_from_db()
+        assert test_list_item.version == 2
+
+    def test_stale_save(self, test_list_item):
+        other = ListItem.objects.get(pk=test_list_item.pk)
+        other.save(update_fields=["is_packed"])
+
+        test_list_item.quantity = 5
+        with pytest.raises(StaleObjectError), transaction.atomic():
+            test_list_item.save()
+
+        assert test_list_item.version == 1
+        test_list_item.refresh_from_db()
+        assert test_list_item.quantity == 1
+
+    def test_stale_delete(self, test_list_item):
+        ListItem.objects.get(pk=test_list_item.pk).save()
+
+        with pytest.raises(StaleObjectError), transaction.atomic():
+            test_list_item.delete()
+
+        assert ListItem.objects.filter(pk=test_list_item.pk).exists()
+
+    def test_save_keeps_recomputed_total(self, test_gear_list, test_list_item):
+        stale = GearList.objects.get(pk=test_gear_list.pk)
+        stale.total_weight = None
+        test_gear_list.calculate_total_weight()
+
+        stale.name = "Renamed"
+        stale.save()
+
+        stale.refresh_from_db()
+        assert stale.name == "Renamed"
+        assert stale.total_weight == Decimal("1000.00")
+
+
+@pytest.mark.django_db
+class TestIfMatch:
+
+    def test_retrieve_has_etag(self, authenticated_client, test_gear_list):
+        response = authenticated_client.get(detail_url(test_gear_list))
+
+        assert response["ETag"] == '"1"'
+        assert response.data["version"] == 1
+
+    def test_matching_update(self, authenticated_client, test_gear_list):
+        response = authenticated_client.patch(
+            detail_url(test_gear_list), {"name": "Renamed"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] == '"2"'
+        assert response.data["version"] == 2
+
+    def test_stale_update(self, authenticated_client, test_gear_list):
+        test_gear_list.save()
+
+        response = authenticated_client.patch(
+            detail_url(test_gear_list), {"name": "Renamed"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        test_gear_list.refresh_from_db()
+        assert test_gear_list.name == "Weekend"
+
+    def test_stale_delete(self, authenticated_client, test_gear_list):
+        test_gear_list.save()
+
+        response = authenticated_client.delete(detail_url(test_gear_list), HTTP_IF_MATCH='"1"')
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert GearList.objects.filter(pk=test_gear_list.pk).exists()
+
+    def test_wildcard_and_missing_header(self, authenticated_client, test_gear_list):
+        url = detail_url(test_gear_list)
+
+        response = authenticated_client.patch(url, {"name": "A"}, format="json", HTTP_IF_MATCH="*")
+        assert response.status_code == status.HTTP_200_OK
+
+        response = authenticated_client.patch(url, {"name": "B"}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] == '"3"'
+
+    def test_row_changed_after_the_check(self, authenticated_client, test_gear_list,
+                                         monkeypatch):
+        # Another writer commits between the If-Match check and the UPDATE.
+        from gear_lists.views import GearListViewSet
+        get_object = GearListViewSet.get_object
+
+        def racing_get_object(view):
+            instance = get_object(view)
+            GearList.objects.get(pk=instance.pk).save()
+            return instance
+
+        monkeypatch.setattr(GearListViewSet, "get_object", racing_get_object)
+
+        response = authenticated_client.patch(
+            detail_url(test_gear_list), {"name": "Renamed"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import GearListViewSet, ListItemViewSet
 
 router = DefaultRouter()
@@ -10,5 +11,17 @@ router.register(r'list-items', ListItemViewSet, basename='list_item')
 app_name = 'gear_lists'
 
 urlpatterns = [
+    path(
+        'async/lists/<int:pk>/',
+        async_views.gear_list_detail,
+        name='async-gear-list-detail'
+    ),
+    path(
+        'async/lists/<int:pk>/events/',
+        async_views.gear_list_events,
+        name='async-gear-list-events'
+    ),
+    path('async/lists/shared/', async_views.shared_gear_list, name='async-gear-list-shared'),
+    
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,63 +1,100 @@
 import uuid
-from django.db.models import Q
+from django.conf import settings
+from django.db.models import F, Q
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext_lazy as _
 from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 
+from core.compiled import CompiledListMixin
 from core.exceptions import ResourceConflictError
+from core.idempotency import idempotent
 from core.permissions import IsOwner, IsOwnerOrPublic
-from .models import GearList, ListItem
+from core.sparse import SparseFieldsViewMixin
+from core.versioning import VersionedViewMixin
+from jobs.registry import enqueue
+from jobs.serializers import JobSerializer
+from sync.models import LIST_ITEMS, Change
+from .compiled import CompiledGearListDetailSerializer, CompiledGearListSerializer
+from .events import publish_list_items_reordered
+from .models import GearList, ListItem, deferred_weight_recompute, mark_weight_dirty
 from .serializers import (
     GearListCopySerializer,
     GearListDetailSerializer,
+    GearListNormalizedSerializer,
     GearListSerializer,
     GearListShareSerializer,
     ListItemSerializer,
 )
 
 
-class GearListViewSet(viewsets.ModelViewSet):
+class GearListViewSet(VersionedViewMixin, CompiledListMixin, viewsets.ModelViewSet):
     serializer_class = GearListSerializer
+    compiled_serializer_class = CompiledGearListSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrPublic]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'created_at', 'updated_at', 'total_weight']
     ordering = ['-updated_at']
+    required_columns = ['owner', 'is_public', 'weight_unit', 'version']
     
     def get_queryset(self):
         user = self.request.user
+        queryset = GearList.objects.all()
+        
+        if self.action in ['retrieve', 'items'] and not settings.COMPILED_SERIALIZERS:
+            queryset = queryset.with_list_items()
+        elif self.action == 'list':
+            queryset = queryset.with_items_count()
         
         share_code = self.request.query_params.get('share_code')
         if self.action == 'retrieve' and share_code:
             try:
                 uuid_obj = uuid.UUID(share_code)
-                return GearList.objects.filter(
+                return queryset.filter(
                     Q(owner=user) | Q(is_public=True) | Q(share_code=uuid_obj)
                 )
             except (ValueError, TypeError):
                 pass
         
-        return GearList.objects.filter(
+        return queryset.filter(
             Q(owner=user) | Q(is_public=True)
         )
     
     def get_serializer_class(self):
         if self.action in ['retrieve', 'items']:
+            if self.is_normalized():
+                return GearListNormalizedSerializer
             return GearListDetailSerializer
-        return GearListSerializer
+        return self.serializer_class
+    
+    def is_normalized(self):
+        return self.request.query_params.get('normalized', '').lower() in ('1', 'true')
+    
+    def get_detail_data(self, gear_list):
+        context = self.get_serializer_context()
+        normalized = self.is_normalized()
+        if settings.COMPILED_SERIALIZERS:
+            return CompiledGearListDetailSerializer(context, normalized).render(gear_list)
+        if normalized:
+            return GearListNormalizedSerializer(gear_list, context=context).data
+        return GearListDetailSerializer(gear_list, context=context).data
     
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
     
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_detail_data(self.get_object()))
+    
     @action(detail=True, methods=['get', 'post'])
+    @idempotent
     def items(self, request, pk=None):
         gear_list = self.get_object()
         
         if request.method == 'GET':
-            serializer = self.get_serializer(gear_list)
-            return Response(serializer.data)
+            return Response(self.get_detail_data(gear_list))
         
         item_data = request.data.copy()
         item_data['gear_list'] = gear_list.id
@@ -65,39 +102,32 @@ class GearListViewSet(viewsets.ModelViewSet):
         serializer = ListItemSerializer(data=item_data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
-            gear_list.calculate_total_weight()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=True, methods=['post'], serializer_class=GearListCopySerializer)
+    @idempotent
     def copy(self, request, pk=None):
         original = self.get_object()
         serializer = self.get_serializer(data=request.data)
         
         if serializer.is_valid():
-            new_list = GearList.objects.create(
-                name=serializer.validated_data['name'],
-                description=original.description,
-                owner=request.user,
-                is_public=False,
-                weight_unit=request.user.weight_unit
-            )
-            
-            if serializer.validated_data.get('include_items', True):
-                for list_item in original.list_items.all():
-                    if list_item.item.owner == request.user:
-                        ListItem.objects.create(
-                            gear_list=new_list,
-                            item=list_item.item,
-                            quantity=list_item.quantity,
-                            is_worn=list_item.is_worn,
-                            is_packed=list_item.is_packed,
-                            notes=list_item.notes,
-                            order=list_item.order
-                        )
-            
-            new_list.calculate_total_weight()
+            data = serializer.validated_data
+            if data['background']:
+                job = enqueue(
+                    'gear_lists.copy',
+                    user=request.user,
+                    gear_list=original.pk,
+                    name=data['name'],
+                    include_items=data['include_items']
+                )
+                return Response(
+                    JobSerializer(job).data,
+                    status=status.HTTP_202_ACCEPTED,
+                    headers={'Location': reverse('jobs:job-detail', args=[job.pk], request=request)}
+                )
             
+            new_list = original.copy(request.user, data['name'], data['include_items'])
             return Response(
                 GearListSerializer(new_list, context={'request': request}).data,
                 status=status.HTTP_201_CREATED
@@ -110,19 +140,28 @@ class GearListViewSet(viewsets.ModelViewSet):
         
         if serializer.is_valid():
             share_code = serializer.validated_data['share_code']
-            gear_list = get_object_or_404(GearList, share_code=share_code)
+            queryset = GearList.objects.all()
+            if not settings.COMPILED_SERIALIZERS:
+                queryset = queryset.with_list_items()
+            gear_list = get_object_or_404(queryset, share_code=share_code)
             
-            detail_serializer = GearListDetailSerializer(gear_list, context={'request': request})
-            return Response(detail_serializer.data)
+            return Response(self.get_detail_data(gear_list))
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ListItemViewSet(viewsets.ModelViewSet):
+class ListItemViewSet(VersionedViewMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = ListItemSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
+    required_columns = ['version']
     
     def get_queryset(self):
-        return ListItem.objects.filter(gear_list__owner=self.request.user)
+        return ListItem.objects.filter(
+            gear_list__owner=self.request.user
+        ).select_related('gear_list', 'item__category')
+    
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
     
     def perform_create(self, serializer):
         gear_list = serializer.validated_data.get('gear_list')
@@ -131,21 +170,12 @@ class ListItemViewSet(viewsets.ModelViewSet):
         if ListItem.objects.filter(gear_list=gear_list, item=item).exists():
             raise ResourceConflictError(_("This item is already in the list."))
         
-        list_item = serializer.save()
-        
-        list_item.gear_list.calculate_total_weight()
-    
-    def perform_update(self, serializer):
-
-        list_item = serializer.save()
-        
-        list_item.gear_list.calculate_total_weight()
+        serializer.save()
     
     def perform_destroy(self, instance):
-        gear_list = instance.gear_list
-        instance.delete()
-        
-        gear_list.calculate_total_weight()
+        with deferred_weight_recompute():
+            instance.delete()
+            mark_weight_dirty(instance.gear_list)
     
     @action(detail=False, methods=['post'])
     def reorder(self, request):
@@ -162,6 +192,14 @@ class ListItemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        try:
+            items_order = [int(item_id) for item_id in items_order]
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": _("Invalid data format. Expected a list of item IDs.")},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         try:
             first_item = ListItem.objects.get(id=items_order[0])
             gear_list = first_item.gear_list
@@ -172,13 +210,19 @@ class ListItemViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
             
-            for index, item_id in enumerate(items_order):
-                try:
-                    list_item = ListItem.objects.get(id=item_id, gear_list=gear_list)
-                    list_item.order = index
-                    list_item.save(update_fields=['order'])
-                except ListItem.DoesNotExist:
-                    pass
+            positions = {item_id: index for index, item_id in enumerate(items_order)}
+            list_items = list(
+                ListItem.objects.filter(gear_list=gear_list, id__in=items_order)
+            )
+            for list_item in list_items:
+                list_item.order = positions[list_item.id]
+                # Bump the version as save() does, so stale writes are refused.
+                list_item.version = F('version') + 1
+            ListItem.objects.bulk_update(list_items, ['order', 'version'])
+            Change.objects.record(
+                gear_list.owner_id, LIST_ITEMS, [list_item.id for list_item in list_items]
+            )
+            publish_list_items_reordered(gear_list, list_items)
             
             return Response({"detail": _("Items reordered successfully.")})
             
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "jobs"
+    verbose_name = "Jobs"
+
+    def ready(self):
+        # Tasks are registered by the ``tasks`` module of each app.
+        autodiscover_modules("tasks")
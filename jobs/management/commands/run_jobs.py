@@ -0,0 +1,76 @@
+import logging
+import os
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.pubsub import broker
+from jobs.worker import Worker
+
+logger = logging.getLogger("jobs")
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs until stopped with SIGINT or SIGTERM."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of worker processes to fork.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for more.",
+        )
+
+    def handle(self, *args, **options):
+        processes = max(options["processes"], 1)
+        if processes == 1:
+            self.work(options["once"])
+            return
+
+        # Children must not share the parent's database connection.
+        connections.close_all()
+        children = []
+        for _ in range(processes):
+            pid = os.fork()
+            if pid == 0:
+                status = 0
+                try:
+                    self.work(options["once"])
+                except Exception:
+                    logger.exception("Worker process %d crashed", os.getpid())
+                    status = 1
+                finally:
+                    os._exit(status)
+            children.append(pid)
+
+        def forward(signum, frame):
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        signal.signal(signal.SIGINT, forward)
+        signal.signal(signal.SIGTERM, forward)
+        for pid in children:
+            os.waitpid(pid, 0)
+        self.stdout.write(self.style.SUCCESS(f"Stopped {processes} workers."))
+
+    def work(self, once):
+        worker = Worker()
+
+        def stop(signum, frame):
+            worker.stop()
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            worker.work(once=once)
+        finally:
+            broker.close()
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.utils.encoders import JSONEncoder
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+STATUS_CHOICES = [
+    (QUEUED, "Queued"),
+    (RUNNING, "Running"),
+    (SUCCEEDED, "Succeeded"),
+    (FAILED, "Failed"),
+]
+
+
+class Job(models.Model):
+    """
+    A unit of background work, run by ``manage.py run_jobs`` workers.
+
+    Workers claim queued jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``, so
+    any number of them can share the table. A failed job is queued again
+    after an exponential delay until ``max_attempts`` is reached.
+    """
+
+    name = models.CharField(_("task"), max_length=100)
+    arguments = models.JSONField(_("arguments"), default=dict, encoder=JSONEncoder)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    status = models.CharField(_("status"), max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField(_("run at"), default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(_("attempts"), default=0)
+    max_attempts = models.PositiveSmallIntegerField(_("max attempts"), default=3)
+    progress = models.FloatField(_("progress"), default=0)
+    progress_message = models.CharField(_("progress message"), max_length=255, blank=True)
+    result = models.JSONField(_("result"), null=True, blank=True, encoder=JSONEncoder)
+    error = models.TextField(_("error"), blank=True)
+    worker = models.CharField(_("worker"), max_length=100, blank=True)
+    heartbeat_at = models.DateTimeField(_("heartbeat at"), null=True, blank=True)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+    started_at = models.DateTimeField(_("started at"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("finished at"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("job")
+        verbose_name_plural = _("jobs")
+        ordering = ["-id"]
+        indexes = [
+            models.Index(
+                fields=["run_at", "id"],
+                condition=models.Q(status=QUEUED),
+                name="jobs_job_queued",
+            ),
+            models.Index(
+                fields=["heartbeat_at"],
+                condition=models.Q(status=RUNNING),
+                name="jobs_job_running",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (SUCCEEDED, FAILED)
+
+    def report_progress(self, done, total=None, message=""):
+        """
+        Record how far the task got: ``done`` out of ``total`` steps, or a
+        fraction between 0 and 1 without ``total``. Also serves as the
+        heartbeat that keeps the job from being handed to another worker.
+        """
+        progress = done / total if total else done
+        self.progress = round(min(max(progress, 0), 1), 4)
+        self.progress_message = message[:255]
+        self.heartbeat_at = timezone.now()
+        Job.objects.filter(pk=self.pk).update(
+            progress=self.progress,
+            progress_message=self.progress_message,
+            heartbeat_at=self.heartbeat_at,
+        )
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.pubsub import broker
+from .models import Job
+
+JOBS_CHANNEL = "jobs"
+
+tasks = {}
+
+
+class Task:
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+
+    def __call__(self, job, **arguments):
+        return self.func(job, **arguments)
+
+
+def task(name=None, max_attempts=None):
+    """
+    Register a function as a background task.
+
+    The function is called with the running :class:`~jobs.models.Job`
+    followed by the keyword arguments given to ``enqueue``, which must be
+    JSON serializable; whatever it returns is stored as the job's result.
+    """
+
+    def register(func):
+        registered = Task(
+            func,
+            name or f"{func.__module__}.{func.__name__}",
+            max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        )
+        tasks[registered.name] = registered
+        return registered
+
+    return register
+
+
+def enqueue(name, /, user=None, delay=0, **arguments):
+    """
+    Queue the task ``name`` to run in a worker at least ``delay`` seconds
+    from now, on behalf of ``user``, and wake the workers once the current
+    transaction commits.
+    """
+    registered = tasks[name]
+    job = Job.objects.create(
+        name=name,
+        arguments=arguments,
+        user=user,
+        max_attempts=registered.max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+    transaction.on_commit(lambda: broker.publish(JOBS_CHANNEL, {"job": job.pk}))
+    return job
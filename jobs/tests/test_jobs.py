@@ -0,0 +1,314 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from gear_items.models import Item
+from gear_lists.models import GearList, ListItem
+from jobs.models import FAILED, QUEUED, RUNNING, SUCCEEDED, Job
+from jobs.registry import enqueue, task
+from jobs.worker import Worker
+
+User = get_user_model()
+
+calls = []
+
+
+@task("tests.flaky")
+def flaky(job, failures=0):
+    calls.append(job.attempts)
+    job.report_progress(1, 2, "halfway")
+    if job.attempts <= failures:
+        raise RuntimeError("boom")
+    return {"attempts": job.attempts}
+
+
+@task("tests.slow")
+def slow(job, seconds=0):
+    time.sleep(seconds)
+
+
+@task("tests.taken_over")
+def taken_over(job, fail=False):
+    # As if requeue_stale had given the job to another worker meanwhile.
+    Job.objects.filter(pk=job.pk).update(status=RUNNING, worker="other-worker")
+    if fail:
+        raise RuntimeError("boom")
+    return {"done": True}
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def worker():
+    return Worker(name="test-worker")
+
+
+def make_due(job):
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+
+
+@pytest.mark.django_db
+class TestWorker:
+
+    def test_runs_job(self, worker, test_user):
+        job = enqueue("tests.flaky", user=test_user)
+
+        assert worker.run_next().pk == job.pk
+
+        job.refresh_from_db()
+        assert job.status == SUCCEEDED
+        assert job.result == {"attempts": 1}
+        assert job.progress == 1
+        assert job.progress_message == "halfway"
+        assert job.worker == "test-worker"
+        assert job.finished_at is not None
+        assert worker.run_next() is None
+
+    def test_retries_with_backoff(self, worker, settings):
+        settings.JOBS_RETRY_DELAY = 10
+        job = enqueue("tests.flaky", failures=2)
+
+        before = timezone.now()
+        worker.run_next()
+        job.refresh_from_db()
+        assert job.status == QUEUED
+        assert job.error == "RuntimeError: boom"
+        assert timedelta(seconds=10) <= job.run_at - before < timedelta(seconds=11)
+        assert worker.run_next() is None
+
+        make_due(job)
+        before = timezone.now()
+        worker.run_next()
+        job.refresh_from_db()
+        assert timedelta(seconds=20) <= job.run_at - before < timedelta(seconds=21)
+
+        make_due(job)
+        worker.run_next()
+        job.refresh_from_db()
+        assert job.status == SUCCEEDED
+        assert job.error == ""
+        assert calls == [1, 2, 3]
+
+    def test_fails_after_max_attempts(self, worker, settings):
+        settings.JOBS_RETRY_DELAY = 0
+        job = enqueue("tests.flaky", failures=5)
+
+        for _ in range(3):
+            make_due(job)
+            worker.run_next()
+
+        job.refresh_from_db()
+        assert job.status == FAILED
+        assert job.attempts == job.max_attempts == 3
+        assert worker.run_next() is None
+
+    def test_unknown_task_fails(self, worker):
+        job = Job.objects.create(name="tests.missing")
+
+        worker.run_next()
+
+        job.refresh_from_db()
+        assert job.status == FAILED
+        assert job.error == "Unknown task 'tests.missing'."
+
+    def test_claims_due_jobs_in_order(self, worker):
+        later = enqueue("tests.flaky", delay=60)
+        first = enqueue("tests.flaky")
+        second = enqueue("tests.flaky")
+
+        assert worker.claim().pk == first.pk
+        assert worker.claim().pk == second.pk
+        assert worker.claim() is None
+        assert Job.objects.get(pk=later.pk).status == QUEUED
+
+    def test_requeues_stale_jobs(self, worker, settings):
+        settings.JOBS_STALE_AFTER = 60
+        stale, exhausted, alive = [enqueue("tests.flaky") for _ in range(3)]
+        for _ in range(3):
+            worker.claim()
+        Job.objects.filter(pk=exhausted.pk).update(attempts=3)
+        Job.objects.filter(pk__in=[stale.pk, exhausted.pk]).update(
+            heartbeat_at=timezone.now() - timedelta(seconds=61)
+        )
+
+        assert worker.requeue_stale() == 1
+
+        assert Job.objects.get(pk=stale.pk).status == QUEUED
+        assert Job.objects.get(pk=exhausted.pk).status == FAILED
+        assert Job.objects.get(pk=alive.pk).status == RUNNING
+
+    def test_taken_over_job_is_not_overwritten(self, worker):
+        finished = enqueue("tests.taken_over")
+        retried = enqueue("tests.taken_over", fail=True)
+
+        worker.run_next()
+        worker.run_next()
+
+        for job in (finished, retried):
+            job.refresh_from_db()
+            assert job.status == RUNNING
+            assert job.worker == "other-worker"
+            assert job.result is None
+            assert job.error == ""
+
+    def test_report_progress(self):
+        job = enqueue("tests.flaky")
+
+        job.report_progress(3, 4, "three down")
+
+        job.refresh_from_db()
+        assert job.progress == 0.75
+        assert job.progress_message == "three down"
+        assert job.heartbeat_at is not None
+
+
+@pytest.mark.django_db
+class TestJobViewSet:
+
+    def test_retrieve_own_job(self, authenticated_client, test_user):
+        job = enqueue("tests.flaky", user=test_user)
+
+        response = authenticated_client.get(reverse("jobs:job-detail", args=[job.pk]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == QUEUED
+        assert response.data["name"] == "tests.flaky"
+        assert response.data["progress"] == 0
+
+    def test_other_users_jobs_are_hidden(self, authenticated_client):
+        other = User.objects.create_user(username="other", email="o@example.com", password="pw")
+        job = enqueue("tests.flaky", user=other)
+
+        response = authenticated_client.get(reverse("jobs:job-detail", args=[job.pk]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = authenticated_client.get(reverse("jobs:job-list"))
+        assert response.data["count"] == 0
+
+    def test_requires_authentication(self):
+        response = APIClient().get(reverse("jobs:job-list"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestGearListTasks:
+
+    def test_background_copy(self, authenticated_client, test_user, worker):
+        gear_list = GearList.objects.create(name="Weekend", owner=test_user)
+        item = Item.objects.create(name="Tent", weight=1000, owner=test_user)
+        ListItem.objects.create(gear_list=gear_list, item=item, quantity=2)
+
+        response = authenticated_client.post(
+            reverse("gear_lists:gear_list-copy", kwargs={"pk": gear_list.id}),
+            {"name": "Copy", "background": True},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response["Location"].endswith(reverse("jobs:job-detail", args=[response.data["id"]]))
+        assert not GearList.objects.filter(name="Copy").exists()
+
+        worker.run_next()
+
+        job = Job.objects.get(pk=response.data["id"])
+        assert job.status == SUCCEEDED
+        copied = GearList.objects.get(pk=job.result["gear_list"])
+        assert copied.name == "Copy"
+        assert copied.owner == test_user
+        assert copied.total_weight == Decimal("2000.00")
+
+    def test_item_weight_change_recomputes_lists(self, test_user, worker):
+        item = Item.objects.create(name="Tent", weight=1000, owner=test_user)
+        gear_lists = [GearList.objects.create(name=f"List {i}", owner=test_user) for i in range(2)]
+        for gear_list in gear_lists:
+            ListItem.objects.create(gear_list=gear_list, item=item)
+
+        item.weight = 1200
+        item.save()
+        item.save(update_fields=["name"])
+
+        job = Job.objects.get(name="gear_lists.recompute_weights")
+        assert job.arguments == {"item": item.pk}
+        worker.run_next()
+
+        job.refresh_from_db()
+        assert job.status == SUCCEEDED
+        assert job.result == {"gear_lists": 2}
+        assert job.progress_message == "2 of 2 lists"
+        for gear_list in gear_lists:
+            gear_list.refresh_from_db()
+            assert gear_list.total_weight == Decimal("1200.00")
+
+    def test_item_delete_recomputes_lists(self, test_user, worker):
+        tent = Item.objects.create(name="Tent", weight=1000, owner=test_user)
+        stove = Item.objects.create(name="Stove", weight=300, owner=test_user)
+        gear_list = GearList.objects.create(name="Weekend", owner=test_user)
+        ListItem.objects.create(gear_list=gear_list, item=tent)
+        ListItem.objects.create(gear_list=gear_list, item=stove)
+
+        tent.delete()
+        worker.run_next()
+
+        gear_list.refresh_from_db()
+        assert gear_list.total_weight == Decimal("300.00")
+
+    def test_account_deletion_enqueues_nothing(self, test_user):
+        item = Item.objects.create(name="Tent", weight=1000, owner=test_user)
+        gear_list = GearList.objects.create(name="Weekend", owner=test_user)
+        ListItem.objects.create(gear_list=gear_list, item=item)
+
+        test_user.delete()
+
+        assert not Job.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_jobs_once():
+    jobs = [enqueue("tests.flaky") for _ in range(3)]
+
+    call_command("run_jobs", "--once", stdout=StringIO())
+
+    assert set(Job.objects.filter(pk__in=[job.pk for job in jobs]).values_list(
+        "status", flat=True
+    )) == {SUCCEEDED}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_heartbeat_while_running(settings):
+    settings.JOBS_HEARTBEAT_INTERVAL = 0.05
+    job = enqueue("tests.slow", seconds=0.5)
+
+    Worker(name="test-worker").run_next()
+
+    job.refresh_from_db()
+    assert job.status == SUCCEEDED
+    assert job.heartbeat_at - job.started_at >= timedelta(seconds=0.05)
@@ -0,0 +1,18 @@
+from rest_framework import permissions, viewsets
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Status, progress and result of the background jobs started by the user.
+    Endpoints that queue a job answer ``202 Accepted`` with a ``Location``
+    pointing here.
+    """
+    
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return Job.objects.filter(user=self.request.user)
@@ -0,0 +1,172 @@
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.pubsub import broker
+from .models import FAILED, QUEUED, RUNNING, SUCCEEDED, Job
+from .registry import JOBS_CHANNEL, tasks
+
+logger = logging.getLogger("jobs")
+
+
+def retry_delay(attempts):
+    """Seconds to wait before running a job again after its n-th failure."""
+    return settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def failure_message(exc):
+    return f"{type(exc).__name__}: {exc}"[:255]
+
+
+class Worker:
+    """
+    Runs queued jobs one at a time.
+
+    Workers claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any
+    number of them, in any number of processes, can share the queue without
+    running a job twice. While a job runs, a thread renews its heartbeat every
+    ``JOBS_HEARTBEAT_INTERVAL`` seconds; a job without one for
+    ``JOBS_STALE_AFTER`` seconds is assumed lost with its worker and queued
+    again. Results are only written while the job is still this worker's, so
+    a job taken over in the meantime is not overwritten.
+    """
+
+    def __init__(self, name=None):
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self._wakeup = threading.Event()
+
+    def claim(self):
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(status=QUEUED, run_at__lte=now)
+                .order_by("run_at", "id")
+                .first()
+            )
+            if job is None:
+                return None
+            job.status = RUNNING
+            job.attempts += 1
+            job.worker = self.name
+            job.started_at = job.heartbeat_at = now
+            job.save(update_fields=["status", "attempts", "worker", "started_at", "heartbeat_at"])
+        return job
+
+    def requeue_stale(self):
+        now = timezone.now()
+        stale = Job.objects.filter(
+            status=RUNNING, heartbeat_at__lt=now - timedelta(seconds=settings.JOBS_STALE_AFTER)
+        )
+        exhausted = Q(attempts__gte=F("max_attempts"))
+        stale.filter(exhausted).update(
+            status=FAILED, error="The worker running this job stopped responding.", finished_at=now
+        )
+        return stale.exclude(exhausted).update(status=QUEUED, worker="", run_at=now)
+
+    def run(self, job):
+        task = tasks.get(job.name)
+        if task is None:
+            self.finish(job, FAILED, error=f"Unknown task {job.name!r}.")
+            return job
+
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=self.beat, args=(job, stop_heartbeat), name=f"heartbeat-{job.pk}", daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = task(job, **job.arguments)
+        except Exception as exc:
+            # The traceback goes to the log only; the job, which its owner
+            # can read through the API, keeps a one-line summary.
+            logger.exception("Job %s failed on attempt %d", job, job.attempts)
+            error = failure_message(exc)
+            if job.attempts < job.max_attempts:
+                self.update(
+                    job,
+                    status=QUEUED,
+                    error=error,
+                    run_at=timezone.now() + timedelta(seconds=retry_delay(job.attempts)),
+                )
+            else:
+                self.finish(job, FAILED, error=error)
+        else:
+            self.finish(job, SUCCEEDED, result=result)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+        return job
+
+    def beat(self, job, stop):
+        """Renew the heartbeat of ``job`` until ``stop`` is set."""
+        try:
+            while not stop.wait(settings.JOBS_HEARTBEAT_INTERVAL):
+                Job.objects.filter(pk=job.pk, status=RUNNING, worker=self.name).update(
+                    heartbeat_at=timezone.now()
+                )
+        except Exception:
+            logger.exception("Heartbeat of job %s failed", job)
+        finally:
+            connection.close()
+
+    def update(self, job, **fields):
+        """
+        Write ``fields`` to ``job`` if it is still running on this worker;
+        returns whether it was.
+        """
+        updated = Job.objects.filter(pk=job.pk, status=RUNNING, worker=self.name).update(**fields)
+        if not updated:
+            logger.warning("Job %s was taken over by another worker; dropping its outcome", job)
+            return False
+        for name, value in fields.items():
+            setattr(job, name, value)
+        return True
+
+    def finish(self, job, status, result=None, error=""):
+        fields = {"status": status, "result": result, "error": error}
+        if status == SUCCEEDED:
+            fields["progress"] = 1
+        return self.update(job, finished_at=timezone.now(), **fields)
+
+    def run_next(self):
+        """Run the next due job, if any, and return it."""
+        self.requeue_stale()
+        job = self.claim()
+        if job is not None:
+            self.run(job)
+        return job
+
+    def work(self, once=False):
+        """
+        Run jobs until :meth:`stop` is called, sleeping while the queue is
+        empty; with ``once``, return as soon as it is.
+        """
+        unsubscribe = broker.subscribe(JOBS_CHANNEL, lambda message: self._wakeup.set())
+        logger.info("Worker %s started", self.name)
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                self._wakeup.clear()
+                if self.run_next() is not None:
+                    continue
+                if once:
+                    break
+                self._wakeup.wait(settings.JOBS_POLL_INTERVAL)
+        finally:
+            unsubscribe()
+            close_old_connections()
+            logger.info("Worker %s stopped", self.name)
+
+    def stop(self):
+        """Stop once the running job, if any, has finished."""
+        self.stopping.set()
+        self._wakeup.set()
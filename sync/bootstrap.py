@@ -0,0 +1,84 @@
+import hashlib
+import json
+
+from django.db.models import Count, F, Q, Sum
+from rest_framework.utils.encoders import JSONEncoder
+
+from gear_items.models import Item, normalize_weight
+from gear_lists.models import ListItem
+from users.serializers import UserSerializer
+from .models import Change
+
+# Bumped whenever the bootstrap payload changes shape, so cached copies are
+# not revalidated against a new format.
+BOOTSTRAP_VERSION = 1
+
+
+def bootstrap_etag(user):
+    """
+    Fingerprint of everything the bootstrap payload is built from: the
+    user's profile and the latest entry of their change log. One indexed
+    query, so a warm start answered with 304 costs next to nothing.
+    """
+    latest = Change.objects.latest_cursor(user)
+    profile = json.dumps(UserSerializer(user).data, cls=JSONEncoder, sort_keys=True)
+    digest = hashlib.sha1(f"{BOOTSTRAP_VERSION}:{latest}:{profile}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def inventory_summary(user):
+    unit = user.weight_unit
+    summary = {
+        "count": 0,
+        "consumable_count": 0,
+        "uncategorized_count": 0,
+        "total_weight": 0,
+        "weight_unit": unit,
+    }
+    rows = (
+        Item.objects.filter(owner=user)
+        .order_by()
+        .values("weight_unit", "is_consumable")
+        .annotate(
+            count=Count("id"),
+            uncategorized=Count("id", filter=Q(category__isnull=True)),
+            weight=Sum("weight"),
+        )
+    )
+    for row in rows:
+        summary["count"] += row["count"]
+        summary["uncategorized_count"] += row["uncategorized"]
+        if row["is_consumable"]:
+            summary["consumable_count"] += row["count"]
+        summary["total_weight"] += normalize_weight(row["weight"], row["weight_unit"], unit)
+    summary["total_weight"] = round(summary["total_weight"], 2)
+    return summary
+
+
+def list_weight_totals(user):
+    """
+    Worn, base and consumable weight of every list of ``user``, in each
+    list's own unit, from one grouped query over their list items.
+    """
+    rows = (
+        ListItem.objects.filter(gear_list__owner=user)
+        .order_by()
+        .values(
+            "gear_list", "gear_list__weight_unit", "item__weight_unit", "is_worn",
+            "item__is_consumable",
+        )
+        .annotate(weight=Sum(F("item__weight") * F("quantity")))
+    )
+    totals = {}
+    for row in rows:
+        weights = totals.setdefault(row["gear_list"], {"worn": 0, "base": 0, "consumables": 0})
+        weight = normalize_weight(
+            row["weight"], row["item__weight_unit"], row["gear_list__weight_unit"]
+        )
+        if row["is_worn"]:
+            weights["worn"] += weight
+        if row["item__is_consumable"]:
+            weights["consumables"] += weight
+        elif not row["is_worn"]:
+            weights["base"] += weight
+    return totals
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sync.models import Change
+
+
+class Command(BaseCommand):
+    help = "Delete superseded change log entries and tombstones past their retention."
+
+    def handle(self, *args, **options):
+        compacted = Change.objects.compact()
+        pruned = Change.objects.prune(
+            timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION)
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {compacted} superseded entries and {pruned} expired tombstones."
+        ))
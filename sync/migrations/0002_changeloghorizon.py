@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sync", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLogHorizon",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("cursor", models.BigIntegerField(default=0, verbose_name="cursor")),
+            ],
+            options={
+                "verbose_name": "change log horizon",
+                "verbose_name_plural": "change log horizon",
+            },
+        ),
+    ]
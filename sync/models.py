@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.db import connections, models
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+CATEGORIES = "categories"
+ITEMS = "items"
+LISTS = "lists"
+LIST_ITEMS = "list_items"
+
+KIND_CHOICES = [
+    (CATEGORIES, "Categories"),
+    (ITEMS, "Items"),
+    (LISTS, "Lists"),
+    (LIST_ITEMS, "List items"),
+]
+
+
+# First half of the advisory lock keys guarding change logs, the user id
+# being the second; spells "SYNC".
+CHANGE_LOG_LOCK = 0x53594E43
+
+
+def change_log_lock(user_id):
+    return (CHANGE_LOG_LOCK << 32) | (user_id & 0xFFFFFFFF)
+
+
+class ChangeManager(models.Manager):
+
+    def record(self, user_id, kind, object_ids, deleted=False):
+        """
+        Log writes to the ``kind`` rows ``object_ids`` of the user.
+
+        The statement inserting the entries first takes a transaction-level
+        advisory lock on the user's log, so another transaction logging for
+        the same user waits until this one ends before drawing ids. The ids
+        of one user's entries are thus committed in order, and a client
+        that has read up to a cursor never misses a lower id committed late.
+        """
+        object_ids = list(object_ids)
+        if not object_ids:
+            return
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.model._meta.db_table} "
+                "(user_id, kind, object_id, deleted, created_at) "
+                "SELECT %s, %s, unnest(%s::bigint[]), %s, %s FROM pg_advisory_xact_lock(%s)",
+                [user_id, kind, object_ids, deleted, timezone.now(), change_log_lock(user_id)],
+            )
+
+    def latest_cursor(self, user):
+        return self.filter(user=user).order_by("-id").values_list("id", flat=True).first() or 0
+
+    def compact(self):
+        """Delete entries superseded by a later entry for the same row."""
+        newer = self.filter(
+            user=OuterRef("user"),
+            kind=OuterRef("kind"),
+            object_id=OuterRef("object_id"),
+            id__gt=OuterRef("id"),
+        )
+        return self.filter(Exists(newer)).delete()[0]
+
+    def prune(self, before):
+        """
+        Delete the tombstones logged before ``before`` and raise the
+        :class:`ChangeLogHorizon` past them.
+        """
+        tombstones = self.filter(deleted=True, created_at__lt=before)
+        horizon = tombstones.order_by("-id").values_list("id", flat=True).first()
+        if horizon is None:
+            return 0
+        ChangeLogHorizon.objects.get_or_create(pk=1)
+        ChangeLogHorizon.objects.filter(pk=1, cursor__lt=horizon).update(cursor=horizon)
+        return tombstones.filter(id__lte=horizon).delete()[0]
+
+
+class Change(models.Model):
+    """
+    One write to a synced row, logged in the same transaction as the write.
+
+    The id is the sync cursor: a client that has seen every change up to
+    ``n`` asks for ``since=n``. Entries must be written with
+    ``Change.objects.record`` so that the ids of a user's entries commit in
+    order. Deletions are kept as tombstones until pruned.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="sync_changes",
+    )
+    kind = models.CharField(_("kind"), max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField(_("object id"))
+    deleted = models.BooleanField(_("deleted"), default=False)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+
+    objects = ChangeManager()
+
+    class Meta:
+        verbose_name = _("change")
+        verbose_name_plural = _("changes")
+        ordering = ["id"]
+        indexes = [models.Index(fields=["user", "id"], name="sync_change_user_cursor")]
+
+    def __str__(self):
+        action = "deleted" if self.deleted else "changed"
+        return f"{self.kind} {self.object_id} {action}"
+
+
+class ChangeLogHorizon(models.Model):
+    """
+    The highest change id removed by pruning, in a single row. A delta from
+    an older cursor could miss deletions, so such clients get a snapshot.
+    """
+
+    cursor = models.BigIntegerField(_("cursor"), default=0)
+
+    class Meta:
+        verbose_name = _("change log horizon")
+        verbose_name_plural = _("change log horizon")
+
+    def __str__(self):
+        return str(self.cursor)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=1).values_list("cursor", flat=True).first() or 0
@@ -0,0 +1,52 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from gear_items.models import Category, Item
+from gear_lists.models import GearList, ListItem
+from .models import CATEGORIES, ITEMS, LIST_ITEMS, LISTS, Change
+
+KINDS = {
+    Category: CATEGORIES,
+    Item: ITEMS,
+    GearList: LISTS,
+    ListItem: LIST_ITEMS,
+}
+
+
+def _owner_id(instance):
+    if isinstance(instance, ListItem):
+        return instance.gear_list.owner_id
+    return instance.owner_id
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Item)
+@receiver(post_save, sender=GearList)
+@receiver(post_save, sender=ListItem)
+def record_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    Change.objects.record(_owner_id(instance), KINDS[sender], [instance.pk])
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Item)
+@receiver(post_delete, sender=GearList)
+@receiver(post_delete, sender=ListItem)
+def record_delete(sender, instance, origin=None, **kwargs):
+    # List items removed by deleting their list or item get no tombstone of
+    # their own: clients drop them along with the deleted parent. Deleting
+    # the user removes the whole change log.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model not in KINDS or (sender is ListItem and origin_model is not ListItem):
+        return
+    Change.objects.record(_owner_id(instance), KINDS[sender], [instance.pk], deleted=True)
+
+
+@receiver(pre_delete, sender=Category)
+def record_uncategorized_items(sender, instance, **kwargs):
+    # ``on_delete=SET_NULL`` updates the items without saving them.
+    Change.objects.record(
+        instance.owner_id, ITEMS, instance.items.values_list("id", flat=True)
+    )
@@ -0,0 +1,103 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from gear_items.models import Category, Item
+from gear_lists.models import GearList, ListItem
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def test_gear_list(test_user):
+    category = Category.objects.create(name="Shelter", owner=test_user)
+    gear_list = GearList.objects.create(name="Weekend", owner=test_user, weight_unit="g")
+    tent = Item.objects.create(name="Tent", weight=900, category=category, owner=test_user)
+    jacket = Item.objects.create(name="Jacket", weight=10, weight_unit="oz", owner=test_user)
+    food = Item.objects.create(name="Food", weight=500, is_consumable=True, owner=test_user)
+    ListItem.objects.create(gear_list=gear_list, item=tent)
+    ListItem.objects.create(gear_list=gear_list, item=jacket, is_worn=True)
+    ListItem.objects.create(gear_list=gear_list, item=food, quantity=2)
+    return gear_list
+
+
+@pytest.mark.django_db
+class TestBootstrap:
+
+    def test_payload(self, authenticated_client, test_gear_list):
+        response = authenticated_client.get(reverse("sync:bootstrap"))
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["user"]["username"] == "testuser"
+        assert data["categories"][0]["item_count"] == 1
+        assert data["inventory"] == {
+            "count": 3,
+            "consumable_count": 1,
+            "uncategorized_count": 2,
+            "total_weight": round(900 + 10 * 28.35 + 500, 2),
+            "weight_unit": "g",
+        }
+        summary = data["lists"][0]
+        assert summary["items_count"] == 3
+        detail = authenticated_client.get(
+            reverse("gear_lists:gear_list-detail", args=[test_gear_list.id])
+        ).json()
+        for name in ("total_worn_weight", "total_base_weight", "total_consumables_weight"):
+            assert summary[name] == detail[name]
+
+    def test_revalidation(self, authenticated_client, test_gear_list,
+                          django_assert_num_queries):
+        url = reverse("sync:bootstrap")
+        etag = authenticated_client.get(url)["ETag"]
+
+        with django_assert_num_queries(1):
+            response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    def test_changes_invalidate_etag(self, authenticated_client, test_user, test_gear_list):
+        url = reverse("sync:bootstrap")
+        etag = authenticated_client.get(url)["ETag"]
+
+        Item.objects.create(name="Stove", weight=80, owner=test_user)
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+        test_user.weight_unit = "oz"
+        test_user.save()
+        assert authenticated_client.get(url)["ETag"] != response["ETag"]
+
+    def test_query_count_is_fixed(self, authenticated_client, test_user, test_gear_list,
+                                  django_assert_num_queries):
+        for index in range(5):
+            gear_list = GearList.objects.create(name=f"List {index}", owner=test_user)
+            ListItem.objects.create(
+                gear_list=gear_list, item=Item.objects.create(name=f"I{index}", weight=1,
+                                                              owner=test_user)
+            )
+
+        # ETag, categories, inventory, list summaries and list totals.
+        with django_assert_num_queries(5):
+            authenticated_client.get(reverse("sync:bootstrap"))
@@ -0,0 +1,246 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from gear_items.models import Category, Item
+from gear_lists.models import GearList, ListItem
+from sync.models import ITEMS, Change, ChangeLogHorizon
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def authenticated_client(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    return client
+
+
+@pytest.fixture
+def test_gear_list(test_user):
+    category = Category.objects.create(name="Shelter", owner=test_user)
+    gear_list = GearList.objects.create(name="Weekend", owner=test_user)
+    for index in range(3):
+        item = Item.objects.create(
+            name=f"Item {index}", weight=100 * (index + 1), category=category, owner=test_user
+        )
+        ListItem.objects.create(gear_list=gear_list, item=item, order=index)
+    return gear_list
+
+
+def sync(client, since=None):
+    params = {} if since is None else {"since": since}
+    response = client.get(reverse("sync:sync"), params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def ids(rows):
+    return sorted(row["id"] for row in rows)
+
+
+@pytest.mark.django_db
+class TestSync:
+
+    def test_snapshot(self, authenticated_client, test_gear_list):
+        data = sync(authenticated_client)
+
+        assert data["cursor"] == Change.objects.latest("id").id
+        assert len(data["changed"]["categories"]) == 1
+        assert len(data["changed"]["items"]) == 3
+        assert data["changed"]["lists"][0]["items_count"] == 3
+        assert "item_details" not in data["changed"]["list_items"][0]
+        assert data["deleted"] == {"categories": [], "items": [], "lists": [], "list_items": []}
+
+    def test_delta_only_returns_changes(self, authenticated_client, test_gear_list):
+        cursor = sync(authenticated_client)["cursor"]
+        item = Item.objects.get(name="Item 1")
+        item.name = "Renamed"
+        item.save()
+
+        data = sync(authenticated_client, cursor)
+
+        assert [row["name"] for row in data["changed"]["items"]] == ["Renamed"]
+        assert data["changed"]["categories"] == data["changed"]["list_items"] == []
+        assert data["cursor"] > cursor
+        assert sync(authenticated_client, data["cursor"])["changed"]["items"] == []
+
+    def test_tombstones(self, authenticated_client, test_gear_list):
+        cursor = sync(authenticated_client)["cursor"]
+        list_item = test_gear_list.list_items.first()
+        list_item_id = list_item.id
+        list_item.delete()
+        category = Category.objects.get()
+        category_id = category.id
+        category.delete()
+
+        data = sync(authenticated_client, cursor)
+
+        assert data["deleted"]["list_items"] == [list_item_id]
+        assert data["deleted"]["categories"] == [category_id]
+        # Deleting the category cleared it on every item.
+        assert len(data["changed"]["items"]) == 3
+        assert all(row["category"] is None for row in data["changed"]["items"])
+
+    def test_cascaded_list_items_have_no_tombstones(self, authenticated_client, test_gear_list):
+        cursor = sync(authenticated_client)["cursor"]
+        gear_list_id = test_gear_list.id
+        test_gear_list.delete()
+
+        data = sync(authenticated_client, cursor)
+
+        assert data["deleted"]["lists"] == [gear_list_id]
+        assert data["deleted"]["list_items"] == []
+
+    def test_reorder_is_logged(self, authenticated_client, test_gear_list):
+        cursor = sync(authenticated_client)["cursor"]
+        order = list(test_gear_list.list_items.values_list("id", flat=True))[::-1]
+
+        authenticated_client.post(
+            reverse("gear_lists:list_item-reorder"), {"items_order": order}, format="json"
+        )
+
+        data = sync(authenticated_client, cursor)
+        assert ids(data["changed"]["list_items"]) == sorted(order)
+
+    def test_paging(self, authenticated_client, test_gear_list, settings):
+        settings.SYNC_PAGE_SIZE = 2
+        cursor = sync(authenticated_client)["cursor"]
+        for item in Item.objects.all():
+            item.save()
+
+        first = sync(authenticated_client, cursor)
+        second = sync(authenticated_client, first["cursor"])
+
+        assert first["has_more"] and not second["has_more"]
+        assert len(first["changed"]["items"]) == 2
+        assert len(second["changed"]["items"]) == 1
+
+    def test_other_users_changes_are_hidden(self, authenticated_client, test_gear_list):
+        cursor = sync(authenticated_client)["cursor"]
+        other = User.objects.create_user(username="other", email="o@example.com", password="x")
+        Item.objects.create(name="Other", weight=1, owner=other)
+
+        assert sync(authenticated_client, cursor)["changed"]["items"] == []
+
+    def test_invalid_cursor(self, authenticated_client):
+        response = authenticated_client.get(reverse("sync:sync"), {"since": "abc"})
+
+        assert response.status_code == 400
+
+    def test_delta_query_count(self, authenticated_client, test_gear_list,
+                               django_assert_max_num_queries):
+        cursor = Change.objects.earliest("id").id - 1
+
+        # The horizon, the change log page and one query per changed resource.
+        with django_assert_max_num_queries(6):
+            sync(authenticated_client, cursor)
+
+
+@pytest.mark.django_db
+class TestChangeLogPruning:
+
+    def test_compact_keeps_latest_entry(self, test_gear_list):
+        item = Item.objects.filter(owner=test_gear_list.owner).first()
+        item.name = "Renamed"
+        item.save()
+        item.save()
+        latest = Change.objects.filter(kind=ITEMS, object_id=item.pk).latest("id").id
+
+        out = StringIO()
+        call_command("compact_sync_changes", stdout=out)
+
+        assert "superseded entries and 0 expired tombstones." in out.getvalue()
+        assert list(
+            Change.objects.filter(kind=ITEMS, object_id=item.pk).values_list("id", flat=True)
+        ) == [latest]
+
+    def test_pruned_cursor_gets_a_reset_snapshot(self, authenticated_client, test_gear_list,
+                                                 settings):
+        cursor = sync(authenticated_client)["cursor"]
+        Item.objects.filter(owner=test_gear_list.owner).first().delete()
+        tombstone = Change.objects.get(deleted=True)
+        Change.objects.filter(pk=tombstone.pk).update(
+            created_at=timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION + 1)
+        )
+
+        call_command("compact_sync_changes", stdout=StringIO())
+
+        assert not Change.objects.filter(deleted=True).exists()
+        assert ChangeLogHorizon.current() == tombstone.id
+        data = sync(authenticated_client, cursor)
+        assert data["reset"] is True
+        assert data["cursor"] == tombstone.id
+        assert len(data["changed"]["items"]) == 2
+
+        data = sync(authenticated_client, data["cursor"])
+        assert data["reset"] is False
+
+    def test_recent_tombstones_are_kept(self, test_gear_list):
+        Item.objects.filter(owner=test_gear_list.owner).first().delete()
+
+        assert Change.objects.prune(timezone.now() - timedelta(days=1)) == 0
+        assert Change.objects.filter(deleted=True).exists()
+        assert ChangeLogHorizon.current() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cursor_waits_for_slower_transaction(test_user):
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    cursor = sync(client)["cursor"]
+    first_logged = threading.Event()
+    release = threading.Event()
+
+    def slow_write():
+        try:
+            with transaction.atomic():
+                Item.objects.create(name="Slow", weight=1, owner=test_user)
+                first_logged.set()
+                release.wait(5)
+        finally:
+            connection.close()
+
+    def fast_write():
+        try:
+            Item.objects.create(name="Fast", weight=1, owner=test_user)
+        finally:
+            connection.close()
+
+    slow = threading.Thread(target=slow_write)
+    slow.start()
+    assert first_logged.wait(5)
+    fast = threading.Thread(target=fast_write)
+    fast.start()
+    # The fast write waits for the slow transaction's lock on the log instead
+    # of committing a higher id first, which would move the cursor past it.
+    fast.join(0.5)
+    assert fast.is_alive()
+    data = sync(client, cursor)
+    assert data["changed"]["items"] == []
+    assert data["cursor"] == cursor
+
+    release.set()
+    slow.join(5)
+    fast.join(5)
+
+    data = sync(client, cursor)
+    assert sorted(row["name"] for row in data["changed"]["items"]) == ["Fast", "Slow"]
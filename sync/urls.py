@@ -0,0 +1,10 @@
+from django.urls import path
+
+from .views import BootstrapView, SyncView
+
+app_name = 'sync'
+
+urlpatterns = [
+    path('', SyncView.as_view(), name='sync'),
+    path('bootstrap/', BootstrapView.as_view(), name='bootstrap'),
+]
@@ -0,0 +1,182 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.utils.http import parse_etags
+from django.utils.translation import gettext_lazy as _
+from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from gear_items.compiled import CompiledCategorySerializer, CompiledItemSerializer
+from gear_items.models import Category, Item
+from gear_lists.compiled import CompiledGearListSerializer, CompiledNormalizedListItemSerializer
+from gear_lists.models import GearList, ListItem
+from users.serializers import UserSerializer
+from .bootstrap import bootstrap_etag, inventory_summary, list_weight_totals
+from .models import CATEGORIES, ITEMS, LIST_ITEMS, LISTS, Change, ChangeLogHorizon
+
+
+def _categories(user):
+    return Category.objects.filter(owner=user).annotate(item_count=Count("items"))
+
+
+def _items(user):
+    return Item.objects.filter(owner=user).select_related("category")
+
+
+def _lists(user):
+    return GearList.objects.filter(owner=user).with_items_count()
+
+
+def _list_items(user):
+    return ListItem.objects.filter(gear_list__owner=user).select_related("gear_list", "item")
+
+
+RESOURCES = [
+    (CATEGORIES, _categories, CompiledCategorySerializer),
+    (ITEMS, _items, CompiledItemSerializer),
+    (LISTS, _lists, CompiledGearListSerializer),
+    (LIST_ITEMS, _list_items, CompiledNormalizedListItemSerializer),
+]
+
+
+def render_rows(compiled_class, queryset, context):
+    if settings.COMPILED_SERIALIZERS:
+        compiled = compiled_class(context)
+        return compiled.render_many(compiled.values(queryset))
+    return compiled_class.serializer_class(queryset, many=True, context=context).data
+
+
+class SyncView(APIView):
+    """
+    Delta sync for offline-first clients.
+
+    Without ``since`` the response is a full snapshot of the user's
+    categories, items, lists and list items. With ``since=<cursor>`` it only
+    holds the rows changed after that cursor and the ids deleted since, read
+    from the change log through its ``(user, id)`` index. Rows of a deleted
+    list or item are not listed separately. Pass the returned ``cursor`` to
+    the next call and keep calling while ``has_more`` is true. A cursor from
+    before the last pruning of the log gets a snapshot with ``reset`` set,
+    telling the client to replace what it has.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        since = request.query_params.get("since")
+        horizon = ChangeLogHorizon.current()
+        if since is None:
+            return Response(self.snapshot(request, horizon))
+
+        try:
+            since = int(since)
+        except ValueError:
+            since = -1
+        if since < 0:
+            raise ValidationError({"since": [_("A valid cursor is required.")]})
+        if since < horizon:
+            return Response(self.snapshot(request, horizon, reset=True))
+        return Response(self.delta(request, since))
+
+    def render(self, compiled_class, queryset):
+        return render_rows(compiled_class, queryset, {"request": self.request, "view": self})
+
+    def snapshot(self, request, horizon, reset=False):
+        # Read the cursor first: changes committed while the snapshot is
+        # assembled are sent again by the next delta. A change of the user
+        # still in flight holds the lock of their log, so its id is above
+        # every committed one and is not skipped either. The cursor is never
+        # below the horizon, or the next delta would be a reset again.
+        cursor = max(Change.objects.latest_cursor(request.user), horizon)
+        return {
+            "cursor": cursor,
+            "has_more": False,
+            "reset": reset,
+            "changed": {
+                kind: self.render(compiled_class, queryset(request.user))
+                for kind, queryset, compiled_class in RESOURCES
+            },
+            "deleted": {kind: [] for kind, queryset, compiled_class in RESOURCES},
+        }
+
+    def delta(self, request, since):
+        limit = settings.SYNC_PAGE_SIZE
+        entries = list(
+            Change.objects.filter(user=request.user, id__gt=since)
+            .order_by("id")
+            .values_list("id", "kind", "object_id", "deleted")[: limit + 1]
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        # Only the latest entry of every row counts.
+        latest = {kind: {} for kind, queryset, compiled_class in RESOURCES}
+        for entry_id, kind, object_id, is_deleted in entries:
+            latest[kind][object_id] = is_deleted
+
+        changed = {}
+        deleted = {}
+        for kind, queryset, compiled_class in RESOURCES:
+            ids = [pk for pk, is_deleted in latest[kind].items() if not is_deleted]
+            rows = []
+            if ids:
+                rows = self.render(compiled_class, queryset(request.user).filter(id__in=ids))
+            found = {row["id"] for row in rows}
+            changed[kind] = rows
+            # A row missing here was deleted after this page's last entry.
+            deleted[kind] = [
+                pk for pk, is_deleted in latest[kind].items() if is_deleted or pk not in found
+            ]
+
+        return {
+            "cursor": entries[-1][0] if entries else since,
+            "has_more": has_more,
+            "reset": False,
+            "changed": changed,
+            "deleted": deleted,
+        }
+
+
+class BootstrapView(APIView):
+    """
+    Everything a client needs on start in one response: the profile,
+    categories with item counts, an inventory summary and list summaries
+    with their weight totals, from a fixed number of queries whatever the
+    size of the account. Responses carry an ``ETag``; a client sending it
+    back in ``If-None-Match`` gets a 304 while nothing has changed.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        if getattr(user, "is_access_token_snapshot", False):
+            user = get_user_model().objects.get(pk=user.pk)
+
+        etag = bootstrap_etag(user)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(self.payload(user))
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def payload(self, user):
+        context = {"request": self.request, "view": self}
+        totals = list_weight_totals(user)
+
+        list_summaries = render_rows(CompiledGearListSerializer, _lists(user), context)
+        for summary in list_summaries:
+            weights = totals.get(summary["id"], {})
+            for name in ("worn", "base", "consumables"):
+                summary[f"total_{name}_weight"] = round(weights.get(name, 0), 2)
+
+        return {
+            "user": UserSerializer(user, context=context).data,
+            "categories": render_rows(CompiledCategorySerializer, _categories(user), context),
+            "inventory": inventory_summary(user),
+            "lists": list_summaries,
+        }
@@ -0,0 +1,218 @@
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, permissions
+from rest_framework.authentication import (
+    BaseAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+
+from core.invalidation import USER, bus, parse_keys
+from core.metrics import record_cache_lookup
+from .tokens import decode_access_token, user_from_access_payload
+
+TOKEN_CACHE_PREFIX = "auth:token:"
+# Cache backends whose entries live inside one process.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+User = get_user_model()
+
+# Token keys cached by this process, by user id, so that a change announced
+# on the invalidation bus by another worker can be evicted here too.
+_cached_keys = defaultdict(set)
+_cached_keys_lock = threading.Lock()
+
+
+def token_cache_key(key):
+    return f"{TOKEN_CACHE_PREFIX}{key}"
+
+
+def token_cache_enabled():
+    """
+    Whether token snapshots may be cached. A revoked token must stop working
+    in every worker, so this needs a cache shared by all of them or the
+    ``postgres`` broker carrying evictions to the process-local ones.
+    """
+    if settings.PUBSUB_BACKEND == "postgres":
+        return True
+    return settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES
+
+
+def _remember_cached_token(user_id, key):
+    bus.start()
+    with _cached_keys_lock:
+        _cached_keys[user_id].add(key)
+
+
+def evict_cached_tokens(keys):
+    with _cached_keys_lock:
+        token_keys = [
+            key for user_id in parse_keys(keys, USER) for key in _cached_keys.pop(user_id, ())
+        ]
+    if token_keys:
+        cache.delete_many([token_cache_key(key) for key in token_keys])
+
+
+bus.connect(evict_cached_tokens)
+
+
+def invalidate_cached_token(key):
+    cache.delete(token_cache_key(key))
+
+
+def invalidate_user_tokens(user):
+    keys = Token.objects.filter(user=user).values_list("key", flat=True)
+    cache.delete_many([token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches the resolved (user, token) pair.
+
+    The snapshot lives for ``AUTH_TOKEN_CACHE_TIMEOUT`` seconds and is dropped
+    explicitly whenever the token is deleted or the user is saved, in other
+    worker processes through the invalidation bus. Without a way to reach
+    the other workers (see :func:`token_cache_enabled`) nothing is cached.
+    """
+
+    def authenticate_credentials(self, key):
+        if not token_cache_enabled():
+            return super().authenticate_credentials(key)
+
+        cache_key = token_cache_key(key)
+        cached = cache.get(cache_key)
+        record_cache_lookup("auth_token", cached is not None)
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        cache.set(cache_key, (user, token), settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        _remember_cached_token(user.pk, key)
+        return (user, token)
+
+    async def aauthenticate_credentials(self, key):
+        enabled = token_cache_enabled()
+        cache_key = token_cache_key(key)
+        if enabled:
+            cached = await cache.aget(cache_key)
+            record_cache_lookup("auth_token", cached is not None)
+            if cached is not None:
+                return cached
+
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related("user").aget(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        if not enabled:
+            return (token.user, token)
+        await cache.aset(cache_key, (token.user, token), settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        _remember_cached_token(token.user_id, key)
+        return (token.user, token)
+
+
+class SignedAccessTokenAuthentication(BaseAuthentication):
+    """
+    Stateless authentication with short-lived signed access tokens.
+
+    Clients send ``Authorization: Bearer <access>``. The token is verified by
+    its HMAC signature alone, so safe requests make no query and see an
+    unsaved ``request.user`` snapshot carrying only the id, weight unit and
+    staff flags.
+    Unsafe requests load the full user, since writes may depend on it.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        if not settings.ACCESS_TOKEN_ENABLED:
+            return None
+
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_("Invalid access token header."))
+
+        try:
+            payload = decode_access_token(auth[1].decode())
+        except signing.SignatureExpired:
+            raise exceptions.AuthenticationFailed(_("Access token expired."))
+        except (signing.BadSignature, UnicodeError):
+            raise exceptions.AuthenticationFailed(_("Invalid access token."))
+
+        if request.method in permissions.SAFE_METHODS:
+            return (user_from_access_payload(payload), payload)
+
+        try:
+            user = User.objects.get(pk=payload["uid"], is_active=True)
+        except User.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (user, payload)
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+async def aauthenticate(request):
+    """
+    Resolve the user for a plain Django async view.
+
+    Mirrors the configured DRF backends for read requests: ``Token`` keys go
+    through the cached token lookup, ``Bearer`` access tokens are verified by
+    signature, and anything else falls back to the session user. Returns
+    ``None`` for anonymous requests.
+    """
+    auth = get_authorization_header(request).split()
+
+    if auth:
+        keyword = auth[0].lower()
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_("Invalid authorization header."))
+
+        try:
+            credentials = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_("Invalid authorization header."))
+
+        if keyword == CachedTokenAuthentication.keyword.lower().encode():
+            user, _token = await CachedTokenAuthentication().aauthenticate_credentials(
+                credentials
+            )
+            return user
+
+        if (
+            keyword == SignedAccessTokenAuthentication.keyword.lower().encode()
+            and settings.ACCESS_TOKEN_ENABLED
+        ):
+            try:
+                payload = decode_access_token(credentials)
+            except signing.SignatureExpired:
+                raise exceptions.AuthenticationFailed(_("Access token expired."))
+            except signing.BadSignature:
+                raise exceptions.AuthenticationFailed(_("Invalid access token."))
+            return user_from_access_payload(payload)
+
+    if request.method in permissions.SAFE_METHODS and hasattr(request, "auser"):
+        user = await request.auser()
+        if user.is_authenticated:
+            return user
+
+    return None
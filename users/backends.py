@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import check_password, hash_password
+
+User = get_user_model()
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate by email with a single lookup and off-thread hashing.
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None:
+            email = kwargs.get(User.USERNAME_FIELD, kwargs.get("username"))
+        if email is None or password is None:
+            return None
+
+        try:
+            user = User._default_manager.get(email=email)
+        except User.DoesNotExist:
+            # Hash once anyway so unknown emails take as long as wrong passwords.
+            hash_password(password)
+            return None
+
+        if check_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+
+from core.exceptions import ServiceBusyError
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+
+
+def _get_pool():
+    global _executor, _slots
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                thread_name_prefix="password-hashing",
+            )
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_MAX_PENDING)
+    return _executor, _slots
+
+
+def run_hashing(func, *args):
+    """
+    Run a password hashing call on the dedicated bounded pool.
+
+    At most ``PASSWORD_HASHING_MAX_PENDING`` calls may be queued or running at
+    once; callers that cannot get a slot within
+    ``PASSWORD_HASHING_QUEUE_TIMEOUT`` seconds get ``ServiceBusyError``
+    instead of piling up behind a login storm.
+    """
+    executor, slots = _get_pool()
+
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT):
+        raise ServiceBusyError(_("Too many sign-in attempts in progress. Please retry."))
+
+    try:
+        return executor.submit(func, *args).result()
+    finally:
+        slots.release()
+
+
+def hash_password(raw_password):
+    return run_hashing(hashers.make_password, raw_password)
+
+
+def set_password(user, raw_password):
+    user.password = hash_password(raw_password)
+    user._password = raw_password
+
+
+def check_password(user, raw_password):
+    """
+    Verify ``raw_password`` off the request thread, upgrading the stored hash.
+
+    When the hash was made with another hasher or cost than the current
+    ``PASSWORD_HASHERS`` settings, it is rehashed and saved here, so cost
+    changes roll out as users sign in.
+    """
+    is_correct, must_update = run_hashing(
+        hashers.verify_password, raw_password, user.password
+    )
+
+    if is_correct and must_update:
+        set_password(user, raw_password)
+        user.save(update_fields=["password"])
+
+    return is_correct
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:07
+
+import core.images
+from django.db import migrations
+from django.db.models import Count, F
+
+
+def count_existing_images(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    ImageBlob = apps.get_model("core", "ImageBlob")
+    counts = (
+        User.objects.exclude(profile_picture__isnull=True)
+        .exclude(profile_picture="")
+        .values_list("profile_picture")
+        .annotate(references=Count("pk"))
+        .order_by()
+    )
+    for name, references in counts:
+        ImageBlob.objects.get_or_create(name=name)
+        ImageBlob.objects.filter(name=name).update(references=F("references") + references)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_imageblob"),
+        ("users", "0002_refreshtoken"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="profile_picture",
+            field=core.images.ContentAddressedImageField(blank=True, null=True, upload_to=""),
+        ),
+        migrations.RunPython(count_existing_images, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,15 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from core.images import ContentAddressedImageField
+
 
 class User(AbstractUser):
     email = models.EmailField(_("email address"), unique=True)
-    profile_picture = models.ImageField(
-        upload_to="profile_pictures/", null=True, blank=True
-    )
+    profile_picture = ContentAddressedImageField(null=True, blank=True)
     bio = models.TextField(max_length=500, blank=True)
     weight_unit = models.CharField(
         max_length=2,
@@ -25,4 +27,28 @@ class User(AbstractUser):
         ordering = ["username"]
     
     def __str__(self):
-        return self.username
\ No newline at end of file
+        return self.username
+
+
+class RefreshToken(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="refresh_tokens"
+    )
+    key_hash = models.CharField(_("key hash"), max_length=64, unique=True)
+    expires_at = models.DateTimeField(_("expires at"))
+    revoked_at = models.DateTimeField(_("revoked at"), null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _("refresh token")
+        verbose_name_plural = _("refresh tokens")
+        ordering = ["-created_at"]
+    
+    def __str__(self):
+        return f"Refresh token for {self.user}"
+    
+    @property
+    def is_active(self):
+        return self.revoked_at is None and self.expires_at > timezone.now()
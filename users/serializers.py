@@ -2,17 +2,22 @@ from django.contrib.auth import authenticate, get_user_model
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from core.serializers import ImageVariantsField
+from core.sparse import SparseFieldsMixin
+from .hashing import check_password, set_password
+
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    profile_picture_variants = ImageVariantsField(source='profile_picture')
     
     class Meta:
         model = User
         fields = [
             'id', 'username', 'email', 'first_name', 'last_name', 
-            'bio', 'profile_picture', 'weight_unit', 'is_public_profile',
-            'date_joined'
+            'bio', 'profile_picture', 'profile_picture_variants', 'weight_unit',
+            'is_public_profile', 'date_joined'
         ]
         read_only_fields = ['id', 'email', 'date_joined']
         extra_kwargs = {
@@ -20,11 +25,14 @@ class UserSerializer(serializers.ModelSerializer):
         }
 
 
-class UserPublicSerializer(serializers.ModelSerializer):
+class UserPublicSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    profile_picture_variants = ImageVariantsField(source='profile_picture')
 
     class Meta:
         model = User
-        fields = ['id', 'username', 'bio', 'profile_picture', 'date_joined']
+        fields = [
+            'id', 'username', 'bio', 'profile_picture', 'profile_picture_variants', 'date_joined'
+        ]
         read_only_fields = fields
 
 
@@ -55,12 +63,14 @@ class RegisterSerializer(serializers.ModelSerializer):
         return attrs
     
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password'],
+        # Same as create_user, with the password hashed on the bounded pool.
+        user = User(
+            username=User.normalize_username(validated_data['username']),
+            email=User.objects.normalize_email(validated_data['email']),
             weight_unit=validated_data.get('weight_unit', 'g')
         )
+        set_password(user, validated_data['password'])
+        user.save()
         return user
 
 
@@ -75,19 +85,14 @@ class LoginSerializer(serializers.Serializer):
         password = attrs.get('password')
         
         if email and password:
-            try:
-                user = User.objects.get(email=email)
-            except User.DoesNotExist:
-                raise serializers.ValidationError({'email': _("User with this email doesn't exist.")})
-                
             user = authenticate(
                 request=self.context.get('request'),
-                username=user.username,
+                email=email,
                 password=password
             )
             
             if not user:
-                raise serializers.ValidationError({'password': _("Invalid password.")})
+                raise serializers.ValidationError({'password': _("Invalid email or password.")})
         else:
             raise serializers.ValidationError(_("Both email and password are required."))
             
@@ -121,6 +126,10 @@ class ChangePasswordSerializer(serializers.Serializer):
     
     def validate_old_password(self, value):
         user = self.context['request'].user
-        if not user.check_password(value):
+        if not check_password(user, value):
             raise serializers.ValidationError(_("Incorrect old password."))
-        return value
\ No newline at end of file
+        return value
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    refresh = serializers.CharField(write_only=True, required=True)
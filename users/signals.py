@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from core.invalidation import USER, bus, change_key
+from .authentication import invalidate_user_tokens
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_auth_snapshot(sender, instance, created, raw=False, **kwargs):
+    if not created:
+        invalidate_user_tokens(instance)
+    if not raw:
+        bus.publish(change_key(USER, instance.pk))
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    bus.publish(change_key(USER, instance.pk))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    bus.publish(change_key(USER, instance.user_id))
@@ -0,0 +1,169 @@
+import json
+import time
+
+import psycopg2
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.invalidation import INVALIDATION_CHANNEL, bus
+from core.pubsub import NOTIFY_CHANNEL, broker
+from users.authentication import token_cache_key
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def postgres_bus(settings):
+    settings.PUBSUB_BACKEND = "postgres"
+    yield
+    bus.stop()
+    broker.close()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.fixture
+def test_user_token(test_user):
+    token, _ = Token.objects.get_or_create(user=test_user)
+    return token
+
+
+@pytest.fixture
+def token_client(test_user_token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {test_user_token.key}")
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("postgres_bus")
+class TestCachedTokenAuthentication:
+
+    def test_snapshot_is_cached(self, token_client, test_user_token):
+        url = reverse("users:user-me")
+
+        response = token_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert cache.get(token_cache_key(test_user_token.key)) is not None
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = token_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not any("authtoken_token" in q["sql"] for q in ctx.captured_queries)
+
+    def test_snapshot_evicted_by_another_worker(self, token_client, test_user, test_user_token):
+        token_client.get(reverse("users:user-me"))
+        assert cache.get(token_cache_key(test_user_token.key)) is not None
+
+        # What the bus listener delivers when another worker saves the user.
+        bus.dispatch({"keys": [f"user:{test_user.id}"]})
+
+        assert cache.get(token_cache_key(test_user_token.key)) is None
+
+    def test_logout_invalidates_snapshot(self, token_client, test_user_token):
+        token_client.get(reverse("users:user-me"))
+
+        response = token_client.post(reverse("users:logout"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert cache.get(token_cache_key(test_user_token.key)) is None
+
+        response = token_client.get(reverse("users:user-me"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_change_password_invalidates_snapshot(self, token_client, test_user_token):
+        token_client.get(reverse("users:user-me"))
+
+        response = token_client.post(
+            reverse("users:user-change-password"),
+            {
+                "old_password": "testpassword123",
+                "new_password": "newpassword123",
+                "new_password_confirm": "newpassword123"
+            },
+            format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert cache.get(token_cache_key(test_user_token.key)) is None
+
+        response = token_client.get(reverse("users:user-me"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_user_update_refreshes_snapshot(self, token_client, test_user):
+        token_client.get(reverse("users:user-me"))
+
+        test_user.weight_unit = "oz"
+        test_user.save()
+
+        response = token_client.get(reverse("users:user-me"))
+        assert response.data["weight_unit"] == "oz"
+
+
+def revoke_in_another_process(token):
+    """Delete ``token`` the way another worker does, on its own connection."""
+    other = psycopg2.connect(**connection.get_connection_params())
+    try:
+        with other, other.cursor() as cursor:
+            cursor.execute("DELETE FROM authtoken_token WHERE key = %s", [token.key])
+            if settings.PUBSUB_BACKEND == "postgres":
+                payload = {
+                    "channel": INVALIDATION_CHANNEL,
+                    "message": {"keys": [f"user:{token.user_id}"]},
+                }
+                cursor.execute("SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, json.dumps(payload)])
+    finally:
+        other.close()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTokenRevokedElsewhere:
+
+    def test_local_broker_does_not_cache(self, settings, token_client, test_user_token):
+        settings.PUBSUB_BACKEND = "local"
+        url = reverse("users:user-me")
+
+        assert token_client.get(url).status_code == status.HTTP_200_OK
+        assert cache.get(token_cache_key(test_user_token.key)) is None
+
+        revoke_in_another_process(test_user_token)
+
+        assert token_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_postgres_broker_evicts(self, postgres_bus, token_client, test_user_token):
+        url = reverse("users:user-me")
+        assert token_client.get(url).status_code == status.HTTP_200_OK
+        assert cache.get(token_cache_key(test_user_token.key)) is not None
+
+        # Repeated until the listener thread, started by the cache, LISTENs.
+        for _ in range(50):
+            revoke_in_another_process(test_user_token)
+            time.sleep(0.1)
+            if cache.get(token_cache_key(test_user_token.key)) is None:
+                break
+
+        assert token_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
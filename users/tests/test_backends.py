@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.contrib.auth import authenticate, get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from users import hashing
+
+User = get_user_model()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="g"
+    )
+
+
+@pytest.mark.django_db
+class TestEmailBackend:
+
+    def test_authenticate_by_email(self, test_user, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            user = authenticate(email=test_user.email, password="testpassword123")
+
+        assert user == test_user
+
+    def test_wrong_password_and_unknown_email(self, test_user):
+        assert authenticate(email=test_user.email, password="wrongpassword") is None
+        assert authenticate(email="missing@example.com", password="testpassword123") is None
+
+    def test_login_uses_email(self, test_user):
+        response = APIClient().post(
+            reverse("users:login"),
+            {"email": "missing@example.com", "password": "testpassword123"},
+            format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "password" in response.data
+
+    def test_hash_is_upgraded_when_cost_changes(self, test_user, settings):
+        settings.PASSWORD_HASH_ITERATIONS = 1000
+
+        assert authenticate(email=test_user.email, password="testpassword123") == test_user
+
+        test_user.refresh_from_db()
+        assert test_user.password.startswith("pbkdf2_sha256$1000$")
+        assert test_user.check_password("testpassword123")
+
+    def test_busy_pool_rejects_login(self, test_user, settings, monkeypatch):
+        settings.PASSWORD_HASHING_QUEUE_TIMEOUT = 0.01
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(hashing, "_get_pool", lambda: (executor, threading.Semaphore(0)))
+
+        response = APIClient().post(
+            reverse("users:login"),
+            {"email": test_user.email, "password": "testpassword123"},
+            format="json"
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        executor.shutdown()
+
+    def test_busy_pool_rejects_registration(self, settings, monkeypatch):
+        settings.PASSWORD_HASHING_QUEUE_TIMEOUT = 0.01
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(hashing, "_get_pool", lambda: (executor, threading.Semaphore(0)))
+
+        response = APIClient().post(
+            reverse("users:register"),
+            {
+                "username": "newuser",
+                "email": "new@example.com",
+                "password": "newpassword123",
+                "password_confirm": "newpassword123",
+            },
+            format="json"
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert not User.objects.filter(username="newuser").exists()
+        executor.shutdown()
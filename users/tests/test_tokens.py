@@ -0,0 +1,121 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from users.tokens import issue_access_token, issue_refresh_token
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def access_tokens_enabled(settings):
+    settings.ACCESS_TOKEN_ENABLED = True
+    settings.ACCESS_TOKEN_LIFETIME = 300
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def test_user():
+    return User.objects.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="testpassword123",
+        weight_unit="oz"
+    )
+
+
+@pytest.mark.django_db
+class TestSignedAccessTokens:
+
+    def test_register_issues_token_pair(self, api_client):
+        response = api_client.post(
+            reverse("users:register"),
+            {
+                "username": "newuser",
+                "email": "new@example.com",
+                "password": "newpassword123",
+                "password_confirm": "newpassword123",
+            },
+            format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert "access" in response.data
+        assert "refresh" in response.data
+
+    def test_safe_request_authenticates_without_queries(self, api_client, test_user):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_access_token(test_user)}")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("users:user-me"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["email"] == test_user.email
+        # Only the profile lookup done by ``me`` itself.
+        assert len(ctx.captured_queries) == 1
+
+    def test_tampered_token_is_rejected(self, api_client, test_user):
+        token = issue_access_token(test_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token[:-1]}x")
+
+        response = api_client.get(reverse("users:user-me"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_expired_token_is_rejected(self, api_client, test_user, settings):
+        token = issue_access_token(test_user)
+        settings.ACCESS_TOKEN_LIFETIME = -1
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = api_client.get(reverse("users:user-me"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_refresh_rotates_token(self, api_client, test_user):
+        refresh = issue_refresh_token(test_user)
+        url = reverse("users:token-refresh")
+
+        response = api_client.post(url, {"refresh": refresh}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["refresh"] != refresh
+
+        response = api_client.post(url, {"refresh": refresh}, format="json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_revokes_refresh_tokens(self, api_client, test_user):
+        refresh = issue_refresh_token(test_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_access_token(test_user)}")
+
+        response = api_client.post(reverse("users:logout"))
+        assert response.status_code == status.HTTP_200_OK
+
+        response = api_client.post(
+            reverse("users:token-refresh"), {"refresh": refresh}, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_staff_flags_survive_safe_requests(self, api_client, test_user):
+        other = User.objects.create_user(username="other", email="o@example.com", password="pw")
+        test_user.is_staff = True
+        test_user.save()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_access_token(test_user)}")
+
+        response = api_client.get(reverse("users:user-list"))
+        assert response.status_code == status.HTTP_200_OK
+        assert {user["id"] for user in response.data["results"]} == {test_user.id, other.id}
+
+        response = api_client.get(reverse("core:slow_query-list"))
+        assert response.status_code == status.HTTP_200_OK
+
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_access_token(other)}")
+        response = api_client.get(reverse("core:slow_query-list"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
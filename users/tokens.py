@@ -0,0 +1,104 @@
+import hashlib
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+
+from .models import RefreshToken
+
+ACCESS_TOKEN_SALT = "users.tokens.access"
+
+User = get_user_model()
+
+
+def issue_access_token(user):
+    payload = {"uid": user.pk, "wu": user.weight_unit}
+    # Staff flags travel in the token so that permission checks and the
+    # staff-only diagnostics work on the snapshot user of safe requests.
+    if user.is_staff:
+        payload["st"] = True
+    if user.is_superuser:
+        payload["su"] = True
+    return signing.dumps(payload, salt=ACCESS_TOKEN_SALT)
+
+
+def decode_access_token(token):
+    """
+    Return the payload of a signed access token.
+
+    Raises ``signing.BadSignature`` (or its ``SignatureExpired`` subclass)
+    when the token was tampered with or is older than ``ACCESS_TOKEN_LIFETIME``.
+    """
+    return signing.loads(
+        token, salt=ACCESS_TOKEN_SALT, max_age=settings.ACCESS_TOKEN_LIFETIME
+    )
+
+
+def user_from_access_payload(payload):
+    user = User(
+        pk=payload["uid"],
+        weight_unit=payload["wu"],
+        is_staff=payload.get("st", False),
+        is_superuser=payload.get("su", False),
+    )
+    user._state.adding = False
+    user._state.db = "default"
+    user.is_access_token_snapshot = True
+    return user
+
+
+def _hash_refresh_key(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def issue_refresh_token(user):
+    key = secrets.token_urlsafe(32)
+    RefreshToken.objects.create(
+        user=user,
+        key_hash=_hash_refresh_key(key),
+        expires_at=timezone.now() + timedelta(seconds=settings.REFRESH_TOKEN_LIFETIME),
+    )
+    return key
+
+
+def issue_token_pair(user):
+    return {
+        "access": issue_access_token(user),
+        "refresh": issue_refresh_token(user),
+    }
+
+
+def rotate_refresh_token(key):
+    """
+    Exchange a refresh token for a new access/refresh pair.
+
+    The presented refresh token is revoked in the same transaction, so each
+    refresh token can be used once. Returns ``None`` when the token is unknown,
+    revoked, expired or belongs to an inactive user.
+    """
+    with transaction.atomic():
+        try:
+            refresh = (
+                RefreshToken.objects.select_for_update()
+                .select_related("user")
+                .get(key_hash=_hash_refresh_key(key))
+            )
+        except RefreshToken.DoesNotExist:
+            return None
+
+        if not refresh.is_active or not refresh.user.is_active:
+            return None
+
+        refresh.revoked_at = timezone.now()
+        refresh.save(update_fields=["revoked_at"])
+        return refresh.user, issue_token_pair(refresh.user)
+
+
+def revoke_refresh_tokens(user):
+    RefreshToken.objects.filter(user=user, revoked_at__isnull=True).update(
+        revoked_at=timezone.now()
+    )
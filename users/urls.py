@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import LoginView, LogoutView, RegisterView, UserViewSet
+from .views import LoginView, LogoutView, RegisterView, TokenRefreshView, UserViewSet
 
 router = DefaultRouter()
 router.register(r'', UserViewSet)
@@ -12,6 +12,7 @@ urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
     path('logout/', LogoutView.as_view(), name='logout'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
     
     path('', include(router.urls)),
 ]
\ No newline at end of file
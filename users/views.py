@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model, login, logout
 from django.utils.translation import gettext_lazy as _
 from rest_framework import generics, permissions, status, viewsets
@@ -7,10 +8,15 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from core.permissions import IsOwnerOrReadOnly
+from core.sparse import SparseFieldsViewMixin
+from .authentication import invalidate_cached_token, invalidate_user_tokens
+from .hashing import set_password
+from .tokens import issue_token_pair, revoke_refresh_tokens, rotate_refresh_token
 from .serializers import (
     ChangePasswordSerializer,
     LoginSerializer,
     RegisterSerializer,
+    TokenRefreshSerializer,
     UserPublicSerializer,
     UserSerializer,
 )
@@ -30,13 +36,14 @@ class RegisterView(generics.CreateAPIView):
         
         token, created = Token.objects.get_or_create(user=user)
         
-        return Response(
-            {
-                'user': UserSerializer(user, context=self.get_serializer_context()).data,
-                'token': token.key
-            },
-            status=status.HTTP_201_CREATED
-        )
+        data = {
+            'user': UserSerializer(user, context=self.get_serializer_context()).data,
+            'token': token.key
+        }
+        if settings.ACCESS_TOKEN_ENABLED:
+            data.update(issue_token_pair(user))
+        
+        return Response(data, status=status.HTTP_201_CREATED)
 
 
 class LoginView(generics.GenericAPIView):
@@ -52,12 +59,40 @@ class LoginView(generics.GenericAPIView):
         
         login(request, user)
         
-        return Response(
-            {
-                'user': UserSerializer(user, context=self.get_serializer_context()).data,
-                'token': token.key
-            }
-        )
+        data = {
+            'user': UserSerializer(user, context=self.get_serializer_context()).data,
+            'token': token.key
+        }
+        if settings.ACCESS_TOKEN_ENABLED:
+            data.update(issue_token_pair(user))
+        
+        return Response(data)
+
+
+class TokenRefreshView(generics.GenericAPIView):
+    serializer_class = TokenRefreshSerializer
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    
+    def post(self, request, *args, **kwargs):
+        if not settings.ACCESS_TOKEN_ENABLED:
+            return Response(
+                {"detail": _("Access tokens are disabled.")},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        rotated = rotate_refresh_token(serializer.validated_data['refresh'])
+        if rotated is None:
+            return Response(
+                {"detail": _("Invalid or expired refresh token.")},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        user, tokens = rotated
+        return Response(tokens)
 
 
 class LogoutView(APIView):
@@ -65,16 +100,19 @@ class LogoutView(APIView):
     
     def post(self, request, *args, **kwargs):
         try:
-            request.user.auth_token.delete()
+            token = request.user.auth_token
+            invalidate_cached_token(token.key)
+            token.delete()
         except (AttributeError, Token.DoesNotExist):
             pass
         
+        revoke_refresh_tokens(request.user)
         logout(request)
         
         return Response({"detail": _("Successfully logged out.")}, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
@@ -88,6 +126,9 @@ class UserViewSet(viewsets.ModelViewSet):
         return User.objects.filter(is_public_profile=True) | User.objects.filter(id=user.id)
     
     def get_serializer_class(self):
+        if self.action == 'change_password':
+            return ChangePasswordSerializer
+        
         user_id = self.kwargs.get('pk')
         
         if user_id and int(user_id) != self.request.user.id and not self.request.user.is_staff:
@@ -106,7 +147,11 @@ class UserViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def me(self, request):
-        serializer = self.get_serializer(request.user)
+        user = request.user
+        if getattr(user, 'is_access_token_snapshot', False):
+            user = User.objects.get(pk=user.pk)
+        
+        serializer = self.get_serializer(user)
         return Response(serializer.data)
     
     @action(
@@ -119,10 +164,12 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        request.user.set_password(serializer.validated_data['new_password'])
+        set_password(request.user, serializer.validated_data['new_password'])
         request.user.save()
         
+        invalidate_user_tokens(request.user)
         Token.objects.filter(user=request.user).delete()
+        revoke_refresh_tokens(request.user)
         token, created = Token.objects.get_or_create(user=request.user)
         
         return Response(